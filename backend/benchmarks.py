@@ -0,0 +1,475 @@
+"""Performance benchmarks for the WanderWise AI backend
+
+Run from the backend directory, e.g.:
+    python benchmarks.py chat-handles --requests 5000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Callable, Dict, List
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def print_buckets(name: str, samples: List[float], bucket: int) -> None:
+    print(f"\n{name}")
+    for start in range(0, len(samples), bucket):
+        stats = summarize(samples[start:start + bucket])
+        print(f"  requests {start:>6}-{start + len(samples[start:start + bucket]) - 1:<6} "
+              f"p50={stats['p50_ms']:>9}ms p95={stats['p95_ms']:>9}ms max={stats['max_ms']:>9}ms")
+
+
+def bench_chat_handles(args) -> None:
+    """Latency per request across thousands of requests using per-request chat handles"""
+    import os
+    from dotenv import load_dotenv
+    from pathlib import Path
+    from llm_client import ChatFactory
+
+    load_dotenv(Path(__file__).parent / '.env')
+    factory = ChatFactory(
+        label="bench",
+        api_key=os.environ.get('EMERGENT_LLM_KEY'),
+        system_message="You are a benchmark assistant. Reply with OK.",
+        provider="openai",
+        model="gpt-4o-mini"
+    )
+
+    samples = []
+    if args.live:
+        from emergentintegrations.llm.chat import UserMessage
+
+        async def run():
+            for i in range(args.requests):
+                started = time.perf_counter()
+                await factory.acquire().send_message(UserMessage(text=f"Reply with OK ({i})"))
+                samples.append(time.perf_counter() - started)
+
+        asyncio.run(run())
+    else:
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            factory.acquire()
+            samples.append(time.perf_counter() - started)
+
+    mode = "live LLM round trips" if args.live else "handle acquisition only (use --live for LLM round trips)"
+    print_buckets(f"chat-handles: {mode}", samples, args.bucket)
+
+
+def bench_json_extract(args) -> None:
+    """Legacy greedy-regex extraction vs json_extract on long, prose-wrapped model output"""
+    import json
+    import re
+    from json_extract import extract_json
+
+    days = {f"day_{i}": {"morning": f"Walk {{old town}} {i}", "afternoon": "Museum", "evening": "Dinner"} for i in range(1, 31)}
+    document = json.dumps({"daily_itinerary": days, "local_tips": ["Carry cash"] * 20}, indent=2)
+    inputs = {
+        "clean": document,
+        "fenced+prose": f"Here you go!\n```json\n{document}\n```\nTell me if you want {{changes}}.",
+        "long prose": ("Some context about the trip. " * 2000) + document + (" More notes {x}." * 500),
+    }
+
+    def legacy(text):
+        match = re.search(r'\{.*\}', text, re.DOTALL)
+        try:
+            return json.loads(match.group()) if match else None
+        except ValueError:
+            return None
+
+    for name, text in inputs.items():
+        for label, fn in (("legacy", legacy), ("extract_json", lambda t: extract_json(t, "object"))):
+            samples = []
+            ok = False
+            for _ in range(args.requests // 10 or 1):
+                started = time.perf_counter()
+                ok = fn(text) is not None
+                samples.append(time.perf_counter() - started)
+            stats = summarize(samples)
+            print(f"  {name:<14} {label:<13} {len(text):>8} chars  p50={stats['p50_ms']:>8}ms  "
+                  f"p95={stats['p95_ms']:>8}ms  parsed={ok}")
+
+
+def bench_local_sentiment(args) -> None:
+    """Lexicon scorer throughput, single reviews vs one batch, and the share that would escalate"""
+    from local_sentiment import LexiconSentimentScorer
+
+    threshold = 0.75
+    reviews = [
+        "Amazing city! Very clean and safe. Public transport is excellent. People are helpful.",
+        "Vibrant city with amazing street food! Can be chaotic and hot. Generally safe in tourist areas.",
+        "The hotel was dirty and I got robbed near the station. Terrible experience, avoid.",
+        "It was ok, nothing special.",
+        "Not clean at all and the area did not feel safe at night.",
+        "Stunning beaches, spotless rooms and very friendly staff. Felt completely safe.",
+    ]
+    scorer = LexiconSentimentScorer()
+    batch = [reviews[i % len(reviews)] for i in range(args.requests)]
+
+    samples = []
+    for text in batch:
+        started = time.perf_counter()
+        scorer.score([text])
+        samples.append(time.perf_counter() - started)
+    stats = summarize(samples)
+    print(f"  single review   p50={stats['p50_ms']}ms  p95={stats['p95_ms']}ms")
+
+    started = time.perf_counter()
+    results = scorer.score(batch)
+    elapsed = time.perf_counter() - started
+    escalated = sum(1 for r in results if r["sentiment_confidence"] < threshold)
+    print(f"  batch of {len(batch)}  {elapsed * 1e6 / len(batch):.1f}us/review  "
+          f"escalation rate at {threshold}: {escalated / len(batch):.2%}")
+
+
+def bench_auth_login(args) -> None:
+    """Login password checks under concurrency: legacy sha256, KDF on the event loop, KDF in the pool"""
+    import hashlib
+    from passwords import PasswordHasher
+
+    concurrency = 32
+    hasher = PasswordHasher(workers=4)
+    stored = hasher.hash_sync("correct horse battery staple")
+    legacy = hashlib.sha256(b"correct horse battery staple").hexdigest()
+
+    async def run(check) -> None:
+        lags: List[float] = []
+        done = asyncio.Event()
+
+        async def heartbeat():
+            # How late a 5ms timer fires shows how long the loop was blocked
+            while not done.is_set():
+                started = time.perf_counter()
+                await asyncio.sleep(0.005)
+                lags.append(time.perf_counter() - started - 0.005)
+
+        async def login():
+            await check()
+
+        beat = asyncio.ensure_future(heartbeat())
+        started = time.perf_counter()
+        for offset in range(0, args.requests, concurrency):
+            await asyncio.gather(*(login() for _ in range(min(concurrency, args.requests - offset))))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await beat
+        stats = summarize(lags or [0.0])
+        print(f"    {args.requests / elapsed:>8.1f} logins/s  loop lag p50={stats['p50_ms']}ms max={stats['max_ms']}ms")
+
+    async def legacy_check():
+        return hashlib.sha256(b"correct horse battery staple").hexdigest() == legacy
+
+    async def kdf_inline():
+        return hasher.verify_sync("correct horse battery staple", stored)
+
+    async def kdf_pool():
+        return await hasher.verify("correct horse battery staple", stored)
+
+    print(f"  {hasher.scheme}, {args.requests} logins, {concurrency} concurrent")
+    for label, check in (("legacy sha256", legacy_check), ("KDF on loop", kdf_inline), ("KDF in pool", kdf_pool)):
+        print(f"  {label}")
+        asyncio.run(run(check))
+
+
+def sample_itinerary(days: int = 14) -> Dict:
+    """A saved-itinerary document shaped like a long AI-generated plan"""
+    import uuid
+    from datetime import datetime
+
+    daily = {
+        f"day_{i}": {
+            "morning": f"Day {i}: guided walking tour of the historic quarter, coffee at a local roastery and a visit "
+                       f"to the covered market to sample regional specialities.",
+            "afternoon": "Museum of modern art, then a relaxed lunch by the river and time to explore side streets.",
+            "evening": "Sunset viewpoint followed by dinner at a family-run restaurant known for seasonal dishes.",
+            "estimated_cost": {"activities": "$40-60", "meals": "$50-80", "transport": "$10-15"},
+            "tips": ["Book tickets online to skip lines", "Carry a reusable water bottle", "Wear comfortable shoes"],
+        }
+        for i in range(1, days + 1)
+    }
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": str(uuid.uuid4()),
+        "title": f"{days} days in Lisbon",
+        "destination": {"name": "Lisbon, Portugal", "country": "Portugal"},
+        "itinerary_data": {
+            "daily_itinerary": daily,
+            "estimated_costs": {"accommodation": "$120-180 per night", "total_estimate": "$3,000-4,500"},
+            "local_tips": ["Trams get crowded at midday", "Many museums are free on Sunday mornings"] * 5,
+        },
+        "travel_dates": {"start_date": "2025-06-01", "end_date": "2025-06-14"},
+        "preferences": {"travelers": "2", "travel_style": "relaxed", "budget_range": "mid-range"},
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    }
+
+
+def bench_itinerary_storage(args) -> None:
+    """Stored document size and encode/decode latency of each itinerary storage codec"""
+    import bson
+    from storage_codec import ItineraryCodec, zstandard
+
+    doc = sample_itinerary()
+    codecs = ["none", "zlib"] + (["zstd"] if zstandard is not None else [])
+    print(f"  14-day itinerary, {args.requests} iterations" + ("" if zstandard else " (zstd not installed)"))
+    for name in codecs:
+        codec = ItineraryCodec(codec=name)
+        stored = codec.encode(doc)
+        encode_samples, decode_samples = [], []
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            codec.encode(doc)
+            encode_samples.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            codec.decode(stored)
+            decode_samples.append(time.perf_counter() - started)
+        enc, dec = summarize(encode_samples), summarize(decode_samples)
+        print(f"  {name:<5} document={len(bson.encode(stored)):>6} bytes  "
+              f"encode p50={enc['p50_ms']}ms  decode p50={dec['p50_ms']}ms")
+
+
+def bench_itinerary_save(args) -> None:
+    """Legacy query-string save vs JSON body: payload size limits and parse time"""
+    import json
+    from urllib.parse import parse_qsl, urlencode
+    import orjson
+
+    # uvicorn's h11 rejects request heads (request line included) over 16KB; nginx defaults to 8KB
+    url_limits = {"nginx (8KB)": 8 * 1024, "uvicorn/h11 (16KB)": 16 * 1024}
+    fields = ("destination", "itinerary_data", "travel_dates", "preferences")
+
+    def legacy_query(doc):
+        return urlencode({"session_token": "x" * 43, "title": doc["title"],
+                          **{field: json.dumps(doc[field]) for field in fields}})
+
+    def body(doc):
+        return orjson.dumps({"title": doc["title"], **{field: doc[field] for field in fields}})
+
+    for label, limit in url_limits.items():
+        max_days = max((d for d in range(1, 31) if len(legacy_query(sample_itinerary(d))) <= limit), default=0)
+        print(f"  legacy query string under {label}: up to {max_days} days")
+    print(f"  JSON body: bounded by SAVE_ITINERARY_MAX_BYTES (2MB default); "
+          f"a 30-day itinerary is {len(body(sample_itinerary(30)))} bytes")
+
+    doc = sample_itinerary(14)
+    query, payload = legacy_query(doc), body(doc)
+
+    def parse_legacy():
+        params = dict(parse_qsl(query))
+        return {field: json.loads(params[field]) for field in fields}
+
+    for label, size, fn in (("legacy query", len(query), parse_legacy), ("orjson body", len(payload), lambda: orjson.loads(payload))):
+        samples = []
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - started)
+        stats = summarize(samples)
+        print(f"  14 days, {label:<12} {size:>6} bytes  parse p50={stats['p50_ms']}ms  p95={stats['p95_ms']}ms")
+
+
+def sample_destination_reviews() -> Dict:
+    """/destination-reviews response for four analysed reviews"""
+    analysis = {
+        "overall_sentiment": "positive", "sentiment_confidence": 0.86, "safety_score": 8.4, "cleanliness_score": 8.9,
+        "key_insights": ["Very clean streets", "Efficient public transport", "Helpful locals"],
+        "safety_mentions": ["Felt completely safe even at night."],
+        "cleanliness_mentions": ["Streets are spotless."],
+        "recommendation": "Recommended destination",
+    }
+    review = "Incredible experience in Tokyo. The food is outstanding, streets are spotless, and I felt completely safe."
+    return {
+        "success": True, "destination": "Tokyo", "review_count": 4,
+        "aggregated_scores": {"average_safety": 8.4, "average_cleanliness": 8.9,
+                              "sentiment_distribution": {"positive": 4, "neutral": 0, "negative": 0},
+                              "dominant_sentiment": "positive"},
+        "summary": "Tokyo is consistently described as safe and exceptionally clean. " * 6,
+        "detailed_analyses": [{"review": review, "analysis": analysis}] * 3,
+        "source": "Aggregated from multiple travel platforms",
+    }
+
+
+def bench_serialization(args) -> None:
+    """Response rendering (FastAPI default vs orjson) and write-path model serialization"""
+    from typing import Any
+    from pydantic import BaseModel, TypeAdapter
+    from starlette.responses import JSONResponse
+    from serialization import FastJSONResponse, to_document
+
+    response_model = TypeAdapter(Dict[str, Any])
+    itinerary = sample_itinerary(14)
+    payloads = {
+        "14-day itinerary": {"success": True, "itinerary": itinerary["itinerary_data"]},
+        "saved itinerary (full)": {"success": True, "itinerary": itinerary},
+        "destination-reviews": sample_destination_reviews(),
+    }
+
+    def through_response_model(payload):
+        # What FastAPI does for response_model=Dict[str, Any] before the response class renders
+        return response_model.dump_python(response_model.validate_python(payload), mode="json")
+
+    def timed(fn) -> Dict[str, float]:
+        samples = []
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - started)
+        return summarize(samples)
+
+    json_response, fast_response = JSONResponse.__new__(JSONResponse), FastJSONResponse.__new__(FastJSONResponse)
+    for name, payload in payloads.items():
+        print(f"  {name} ({len(fast_response.render(payload))} bytes)")
+        for label, fn in (
+            ("response_model + JSONResponse", lambda: json_response.render(through_response_model(payload))),
+            ("response_model + FastJSONResponse", lambda: fast_response.render(through_response_model(payload))),
+            ("FastJSONResponse returned directly", lambda: fast_response.render(payload)),
+        ):
+            stats = timed(fn)
+            print(f"    {label:<36} p50={stats['p50_ms']}ms  p95={stats['p95_ms']}ms")
+
+    class SavedItinerary(BaseModel):
+        id: str
+        user_id: str
+        title: str
+        destination: Dict[str, Any]
+        itinerary_data: Dict[str, Any]
+        travel_dates: Dict[str, Any]
+        preferences: Dict[str, Any]
+        created_at: Any
+        updated_at: Any
+
+    model = SavedItinerary(**itinerary)
+    print("  write path, 14-day SavedItinerary")
+    for label, fn in (("model_dump()", model.model_dump), ("to_document()", lambda: to_document(model))):
+        stats = timed(fn)
+        print(f"    {label:<36} p50={stats['p50_ms']}ms  p95={stats['p95_ms']}ms")
+
+
+def bench_currency(args) -> None:
+    """Itinerary cost conversion: one GET per amount (old inline table) vs one bulk conversion"""
+    from exchange_rates import DEFAULT_RATES, ExchangeRateService, StaticRateSource
+
+    # An itinerary's estimated_costs: min and max for each category
+    amounts = [120, 180, 40, 60, 50, 80, 10, 15, 3000, 4500]
+    targets = ["EUR", "JPY", "INR", "GBP"]
+
+    def per_amount():
+        results = []
+        for target in targets:
+            for amount in amounts:
+                rates = dict(DEFAULT_RATES)  # the endpoint rebuilt its table on every call
+                results.append(round(amount / rates["USD"] * rates[target], 2))
+        return results
+
+    async def run():
+        service = ExchangeRateService(StaticRateSource())
+        await service.refresh()
+
+        def bulk():
+            _, converted = service.convert_batches([(amounts, "USD", target) for target in targets])
+            return [values.round(2).tolist() for values in converted]
+
+        for label, fn, calls in (("per-amount GETs", per_amount, len(amounts) * len(targets)), ("bulk", bulk, 1)):
+            samples = []
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                fn()
+                samples.append(time.perf_counter() - started)
+            stats = summarize(samples)
+            print(f"  {label:<16} {calls:>3} HTTP calls  conversion p50={stats['p50_ms']}ms  p95={stats['p95_ms']}ms")
+
+    print(f"  {len(amounts)} amounts into {len(targets)} currencies")
+    asyncio.run(run())
+
+
+def bench_destinations(args) -> None:
+    """Destination-to-place lookups: per-request dict + substring scan vs the shared compiled trie"""
+    from destinations import catalogue_places, destination_matcher, normalize_tokens
+
+    # The old endpoint's table: every alias -> currency, scanned in order with `alias in text`
+    legacy_table = {" ".join(normalize_tokens(alias)): place.currency for alias, place in catalogue_places()}
+    queries = [
+        "Tokyo, Japan", "Venice, Italy", "Cape Town, South Africa", "Fukuoka, Japan", "El Salvador",
+        "A relaxing week in Chiang Mai", "Reykjavik, Iceland", "Rio de Janeiro", "Lucerne, Switzerland",
+        "Phuket beaches", "Mexico City food tour", "Porto, Portugal",
+    ]
+    batch = [queries[i % len(queries)] for i in range(args.requests)]
+
+    def legacy(text):
+        table = dict(legacy_table)  # rebuilt per request, as the endpoint did
+        lowered = text.lower()
+        for alias, currency in table.items():
+            if alias in lowered:
+                return currency
+        return "USD"
+
+    disagreements = sorted({q for q in queries if legacy(q) != destination_matcher.currency_for(q)})
+    for label, fn in (("substring scan", legacy), ("compiled trie", destination_matcher.currency_for)):
+        started = time.perf_counter()
+        for text in batch:
+            fn(text)
+        elapsed = time.perf_counter() - started
+        print(f"  {label:<15} {len(batch) / elapsed:>10.0f} lookups/s  {elapsed * 1e6 / len(batch):.2f}us/lookup")
+    print(f"  {destination_matcher.aliases} aliases; currencies that differ: {', '.join(disagreements) or 'none'}")
+
+
+def bench_trending(args) -> None:
+    """Trending top-k: exact Counter + most_common per read vs Space-Saving with a cached ranking"""
+    from collections import Counter
+
+    import numpy as np
+    from heavy_hitters import SpaceSaving
+
+    ranks = np.random.default_rng(3).zipf(1.3, size=args.requests)
+    stream = [f"vibe {rank}" for rank in ranks]
+    reads = max(1, len(stream) // 10)  # one trending read per ten recorded events
+
+    for label, make, add, top in (
+        ("exact counter", Counter, lambda c, item: c.update((item,)), lambda c: c.most_common(10)),
+        ("space-saving", lambda: SpaceSaving(256), SpaceSaving.add, lambda c: c.top(10)),
+    ):
+        counter = make()
+        started = time.perf_counter()
+        for i, item in enumerate(stream):
+            add(counter, item)
+            if i % (len(stream) // reads) == 0:
+                top(counter)
+        elapsed = time.perf_counter() - started
+        print(f"  {label:<14} {len(stream) / elapsed:>10.0f} events/s  {len(counter):>7} counters kept")
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    "auth-login": bench_auth_login,
+    "chat-handles": bench_chat_handles,
+    "currency": bench_currency,
+    "destinations": bench_destinations,
+    "itinerary-save": bench_itinerary_save,
+    "itinerary-storage": bench_itinerary_storage,
+    "json-extract": bench_json_extract,
+    "local-sentiment": bench_local_sentiment,
+    "serialization": bench_serialization,
+    "trending": bench_trending,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--bucket", type=int, default=500)
+    parser.add_argument("--live", action="store_true", help="Call the real LLM/database where applicable")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Numeric trip-cost model: budget tiers scaled by per-destination cost indexes"""
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from destinations import Place, destination_matcher
+
+CATEGORIES = ("accommodation", "meals", "activities", "transportation")
+UNITS = ("night", "day", "day", "trip")
+ACCOMMODATION, MEALS, ACTIVITIES, TRANSPORTATION = range(len(CATEGORIES))
+
+# USD [min, max] per unit at cost index 1.0, shape (categories, 2)
+BUDGET_TIERS: Dict[str, np.ndarray] = {
+    "budget": np.array([[60, 100], [20, 40], [25, 50], [70, 130]], dtype=np.float64),
+    "mid-range": np.array([[120, 180], [50, 80], [60, 100], [150, 250]], dtype=np.float64),
+    "luxury": np.array([[250, 400], [100, 160], [120, 220], [300, 500]], dtype=np.float64),
+}
+DEFAULT_TIER = "mid-range"
+
+# Relative price level per category (accommodation, meals, activities, transportation); 1.0 is a
+# typical Western European / North American city. City entries override their country's.
+COST_INDEX: Dict[str, Tuple[float, float, float, float]] = {
+    "japan": (1.0, 0.9, 1.0, 1.1), "tokyo": (1.2, 1.0, 1.1, 1.1), "kyoto": (1.1, 0.9, 1.0, 1.0),
+    "thailand": (0.45, 0.35, 0.5, 0.4), "bangkok": (0.5, 0.4, 0.55, 0.4), "phuket": (0.6, 0.45, 0.6, 0.5),
+    "india": (0.35, 0.25, 0.35, 0.3), "mumbai": (0.5, 0.3, 0.4, 0.35), "goa": (0.45, 0.3, 0.4, 0.35),
+    "france": (1.0, 1.0, 1.0, 1.0), "paris": (1.3, 1.15, 1.2, 1.0), "nice": (1.15, 1.05, 1.0, 0.95),
+    "germany": (0.9, 0.9, 0.9, 0.95), "munich": (1.1, 1.0, 1.0, 1.0),
+    "italy": (0.95, 0.9, 0.95, 0.95), "venice": (1.35, 1.2, 1.15, 1.1), "rome": (1.05, 0.95, 1.0, 0.95),
+    "spain": (0.85, 0.8, 0.85, 0.85), "barcelona": (1.0, 0.9, 0.95, 0.9),
+    "united kingdom": (1.1, 1.05, 1.1, 1.15), "london": (1.45, 1.2, 1.3, 1.25),
+    "australia": (1.05, 1.1, 1.1, 1.1), "sydney": (1.2, 1.15, 1.15, 1.1),
+    "canada": (1.0, 1.0, 1.0, 1.05), "vancouver": (1.15, 1.05, 1.05, 1.05),
+    "mexico": (0.55, 0.45, 0.55, 0.5), "cancun": (0.85, 0.65, 0.8, 0.6), "tulum": (0.9, 0.7, 0.75, 0.6),
+    "brazil": (0.55, 0.5, 0.55, 0.5),
+    "south korea": (0.8, 0.75, 0.8, 0.75),
+    "singapore": (1.3, 0.9, 1.15, 0.8),
+    "hong kong": (1.3, 0.95, 1.05, 0.7),
+    "norway": (1.3, 1.4, 1.3, 1.3), "sweden": (1.1, 1.15, 1.1, 1.1), "denmark": (1.2, 1.3, 1.2, 1.2),
+    "switzerland": (1.5, 1.5, 1.45, 1.4),
+    "china": (0.6, 0.45, 0.6, 0.5),
+    "united arab emirates": (1.15, 0.9, 1.2, 0.8), "dubai": (1.25, 0.95, 1.3, 0.85),
+    "saudi arabia": (0.95, 0.75, 0.9, 0.8),
+    "south africa": (0.6, 0.5, 0.6, 0.6),
+    "egypt": (0.35, 0.3, 0.45, 0.3),
+    "turkey": (0.5, 0.45, 0.55, 0.5), "istanbul": (0.6, 0.5, 0.6, 0.5),
+    "united states": (1.1, 1.05, 1.1, 1.15), "new york": (1.6, 1.3, 1.35, 1.1),
+}
+DEFAULT_INDEX = (1.0, 1.0, 1.0, 1.0)
+
+# "$120", "$80-150", "$3,000 - $4,500", "$12.50"
+_AMOUNT = r"\$\s?(\d[\d,]*(?:\.\d+)?)"
+_COST_RANGE = re.compile(_AMOUNT + r"(?:\s*(?:-|–|to)\s*\$?\s?(\d[\d,]*(?:\.\d+)?))?")
+_COST_UNIT = re.compile(r"(?:\bper\s+|\ba\s+|/\s*)(night|day|person|trip)\b|\b(total)\b", re.IGNORECASE)
+
+
+def parse_cost_range(text: Any) -> Optional[Tuple[float, float]]:
+    """(min, max) in dollars from an LLM cost string, or None if it has no dollar amount"""
+    if isinstance(text, (int, float)):
+        return float(text), float(text)
+    match = _COST_RANGE.search(text) if isinstance(text, str) else None
+    if not match:
+        return None
+    low = float(match.group(1).replace(",", ""))
+    high = float(match.group(2).replace(",", "")) if match.group(2) else low
+    return min(low, high), max(low, high)
+
+
+def parse_cost_unit(text: str) -> Optional[str]:
+    match = _COST_UNIT.search(text) if isinstance(text, str) else None
+    if not match:
+        return None
+    unit = (match.group(1) or match.group(2)).lower()
+    return "trip" if unit == "total" else unit
+
+
+def normalize_tier(budget_range: Optional[str]) -> str:
+    key = (budget_range or "").strip().lower().replace(" ", "-").replace("_", "-")
+    if key in ("mid", "midrange", "moderate"):
+        key = "mid-range"
+    return key if key in BUDGET_TIERS else DEFAULT_TIER
+
+
+def format_range(low: float, high: float, unit: str) -> str:
+    suffix = " total" if unit == "trip" else f" per {unit}"
+    if round(low) == round(high):
+        return f"${round(low):,}{suffix}"
+    return f"${round(low):,}-{round(high):,}{suffix}"
+
+
+@dataclass
+class TripCost:
+    """Per-category [min, max] totals for a whole trip, in one currency"""
+    totals: np.ndarray  # (categories, 2)
+    rates: np.ndarray  # (categories, 2) per unit
+    quantities: np.ndarray  # (categories,)
+    currency: str
+    place: Optional[Place]
+    sources: Dict[str, str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        totals = self.totals.round(2)
+        total = totals.sum(axis=0)
+        return {
+            "currency": self.currency,
+            "matched_place": self.place.name if self.place else None,
+            "categories": {
+                name: {
+                    "min": totals[i, 0].item(),
+                    "max": totals[i, 1].item(),
+                    "unit": UNITS[i],
+                    "units": int(self.quantities[i]),
+                    "per_unit": {"min": round(self.rates[i, 0].item(), 2), "max": round(self.rates[i, 1].item(), 2)},
+                    "source": self.sources[name],
+                }
+                for i, name in enumerate(CATEGORIES)
+            },
+            "total": {"min": round(total[0].item(), 2), "max": round(total[1].item(), 2)},
+        }
+
+
+class CostEngine:
+    """Builds trip costs from budget tiers and cost indexes, optionally overridden by itinerary figures"""
+
+    def __init__(self, tiers: Dict[str, np.ndarray] = BUDGET_TIERS, index: Dict[str, Tuple[float, ...]] = COST_INDEX):
+        self.tiers = tiers
+        self.index = {key: np.asarray(values, dtype=np.float64) for key, values in index.items()}
+        self.default_index = np.asarray(DEFAULT_INDEX, dtype=np.float64)
+
+    def cost_index(self, destination: Optional[str]) -> Tuple[np.ndarray, Optional[Place]]:
+        """Category price levels for a free-text destination (city, then its country, then 1.0)"""
+        place = destination_matcher.resolve(destination) if destination else None
+        if place is None:
+            return self.default_index, None
+        for key in (place.key, place.country.lower()):
+            if key in self.index:
+                return self.index[key], place
+        return self.default_index, place
+
+    def unit_rates(self, destination: Optional[str], budget_range: Optional[str]) -> Tuple[np.ndarray, Optional[Place]]:
+        """USD [min, max] per unit for each category, shape (categories, 2)"""
+        index, place = self.cost_index(destination)
+        return self.tiers[normalize_tier(budget_range)] * index[:, None], place
+
+    @staticmethod
+    def quantities(days: int, travelers: int) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Units bought per category, and how many of each cost-string unit a trip contains per category.
+
+        Accommodation is bought per room (two travelers each) and night; everything else per traveler.
+        """
+        days, travelers = max(1, days), max(1, travelers)
+        nights, rooms = max(1, days - 1), math.ceil(travelers / 2)
+        buyers = np.array([rooms, travelers, travelers, travelers], dtype=np.float64)
+        units = {"night": buyers * nights, "day": buyers * days, "trip": buyers, "person": buyers}
+        return np.array([rooms * nights, travelers * days, travelers * days, travelers], dtype=np.float64), units
+
+    def estimate(
+        self,
+        destination: Optional[str],
+        budget_range: Optional[str],
+        days: int,
+        travelers: int = 1,
+        itinerary: Optional[Dict[str, Any]] = None,
+        rate: float = 1.0,
+        currency: str = "USD"
+    ) -> TripCost:
+        """Trip cost in `currency` (`rate` units per USD); itinerary figures replace modelled ones where present"""
+        rates, place = self.unit_rates(destination, budget_range)
+        quantities, units = self.quantities(days, travelers)
+        sources = dict.fromkeys(CATEGORIES, "model")
+
+        if itinerary:
+            rates = rates.copy()
+            for i, name in enumerate(CATEGORIES):
+                text = (itinerary.get("estimated_costs") or {}).get(name)
+                parsed = parse_cost_range(text)
+                if parsed is None:
+                    continue
+                # Re-express "$X per <unit>" in the category's own unit
+                unit = parse_cost_unit(text) or UNITS[i]
+                rates[i] = np.asarray(parsed) * units[unit][i] / quantities[i]
+                sources[name] = "itinerary"
+
+            # Priced activities in the day plans beat the per-day estimate
+            slots = [
+                parse_cost_range(slot.get("cost"))
+                for day in (itinerary.get("daily_itinerary") or {}).values() if isinstance(day, dict)
+                for slot in day.values() if isinstance(slot, dict)
+            ]
+            priced = np.array([slot for slot in slots if slot is not None], dtype=np.float64).reshape(-1, 2)
+            if len(priced):
+                rates[ACTIVITIES] = priced.sum(axis=0) * units["trip"][ACTIVITIES] / quantities[ACTIVITIES]
+                sources["activities"] = "daily_itinerary"
+
+        # One multiply converts every figure into the target currency
+        scale = np.float64(rate)
+        totals = rates * quantities[:, None] * scale
+        return TripCost(totals, rates * scale, quantities, currency, place, sources)
+
+    def estimated_costs(self, destination: Optional[str], budget_range: Optional[str]) -> Dict[str, str]:
+        """USD per-unit ranges in the itinerary's estimated_costs string format"""
+        rates, _ = self.unit_rates(destination, budget_range)
+        return {name: format_range(rates[i, 0], rates[i, 1], UNITS[i]) for i, name in enumerate(CATEGORIES)}
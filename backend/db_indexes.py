@@ -0,0 +1,141 @@
+"""Declarative MongoDB index registry, applied idempotently at startup"""
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+IndexKeys = Tuple[Tuple[str, int], ...]
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    collection: str
+    keys: IndexKeys
+    unique: bool = False
+    expire_after_seconds: Optional[int] = None
+
+    def options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {}
+        if self.unique:
+            options["unique"] = True
+        if self.expire_after_seconds is not None:
+            options["expireAfterSeconds"] = self.expire_after_seconds
+        return options
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """A query the app runs: equality-matched fields, then the sort it needs"""
+    name: str
+    collection: str
+    equality: Tuple[str, ...] = ()
+    sort: IndexKeys = ()
+    notes: str = field(default="", compare=False)
+
+
+def index_registry(review_sentiment_ttl: int) -> List[IndexSpec]:
+    return [
+        IndexSpec("users", (("email", 1),), unique=True),
+        IndexSpec("users", (("id", 1),), unique=True),
+        IndexSpec("sessions", (("token", 1),), unique=True),
+        # Mongo removes sessions once expires_at passes (the TTL monitor runs about once a minute)
+        IndexSpec("sessions", (("expires_at", 1),), expire_after_seconds=0),
+        IndexSpec("saved_itineraries", (("id", 1),), unique=True),
+        IndexSpec("saved_itineraries", (("user_id", 1), ("created_at", -1), ("id", -1))),
+        IndexSpec("review_sentiment_cache", (("key", 1),), unique=True),
+        IndexSpec("review_sentiment_cache", (("created_at", 1),), expire_after_seconds=review_sentiment_ttl),
+        IndexSpec("review_analyses", (("created_at", -1),)),
+        IndexSpec("review_analyses", (("destination", 1), ("created_at", -1))),
+        IndexSpec("travel_recommendations", (("created_at", -1),)),
+        IndexSpec("vibe_destinations", (("created_at", -1),)),
+        IndexSpec("insight_rollups", (("granularity", 1), ("bucket", -1))),
+        # Each rollup carries its own expiry (hourly ones are kept for days, daily ones for about a year)
+        IndexSpec("insight_rollups", (("expires_at", 1),), expire_after_seconds=0),
+        IndexSpec("insight_vibes", (("granularity", 1), ("bucket", -1))),
+        IndexSpec("insight_vibes", (("expires_at", 1),), expire_after_seconds=0),
+    ]
+
+
+QUERY_SHAPES: List[QueryShape] = [
+    QueryShape("register/login by email", "users", equality=("email",)),
+    QueryShape("session user lookup, preference update", "users", equality=("id",)),
+    QueryShape("session lookup", "sessions", equality=("token",)),
+    QueryShape("my itineraries page", "saved_itineraries", equality=("user_id",), sort=(("created_at", -1), ("id", -1))),
+    QueryShape("get/delete itinerary", "saved_itineraries", equality=("id", "user_id")),
+    QueryShape("sentiment cache lookup", "review_sentiment_cache", equality=("key",)),
+    QueryShape("travel insights: rollup window", "insight_rollups", equality=("granularity",), sort=(("bucket", -1),),
+               notes="bucket is a range condition, served by the same index"),
+    QueryShape("travel insights: popular vibes", "insight_vibes", equality=("granularity",), sort=(("bucket", -1),),
+               notes="bucket is a range condition; one document per vibe and bucket"),
+    QueryShape("destination reviews: latest analyses", "review_analyses", equality=("destination",), sort=(("created_at", -1),)),
+    QueryShape("vibe cache warm-up", "vibe_destinations", sort=(("created_at", -1),),
+               notes="preferences/fallback/cache_hit are filtered on the created_at scan, bounded by the limit"),
+    # destination_review_stats is only read by _id, which Mongo always indexes
+]
+
+
+def coverage(shape: QueryShape, indexes: Sequence[IndexKeys], unique: Sequence[IndexKeys] = ()) -> str:
+    """"covered" if an index can serve the whole query, "partial" if it narrows it, else "missing"."""
+    sort_forward = tuple(shape.sort)
+    sort_reverse = tuple((name, -direction) for name, direction in shape.sort)
+    width = len(shape.equality)
+
+    # A unique index on some of the equality fields matches at most one document
+    for keys in unique:
+        if keys and {name for name, _ in keys} <= set(shape.equality):
+            return "covered"
+    for keys in indexes:
+        prefix = {name for name, _ in keys[:width]}
+        if prefix != set(shape.equality):
+            continue
+        rest = tuple(keys[width:width + len(shape.sort)])
+        if not shape.sort or rest in (sort_forward, sort_reverse):
+            return "covered"
+    # An index whose leading key is one of the equality fields still avoids a collection scan
+    for keys in indexes:
+        if keys and keys[0][0] in shape.equality:
+            return "partial"
+    return "missing"
+
+
+async def ensure_indexes(db, specs: Sequence[IndexSpec], shapes: Sequence[QueryShape] = QUERY_SHAPES) -> Dict[str, Any]:
+    """Create every declared index (a no-op for ones that already exist) and report query coverage"""
+    created, failed = [], []
+    for spec in specs:
+        try:
+            name = await db[spec.collection].create_index(list(spec.keys), **spec.options())
+            created.append(f"{spec.collection}.{name}")
+        except Exception as e:
+            # Typically existing duplicates blocking a unique index, or an index with conflicting options
+            failed.append({"collection": spec.collection, "keys": list(spec.keys), "error": str(e)})
+            logging.warning(f"Could not create index {spec.collection} {list(spec.keys)}: {str(e)}")
+
+    existing: Dict[str, List[IndexKeys]] = {}
+    existing_unique: Dict[str, List[IndexKeys]] = {}
+    for collection in sorted({shape.collection for shape in shapes}):
+        existing[collection], existing_unique[collection] = [], []
+        try:
+            info = await db[collection].index_information()
+        except Exception as e:
+            logging.warning(f"Could not read indexes for {collection}: {str(e)}")
+            continue
+        for index in info.values():
+            # Directions are numbers except for special indexes ("text", "2dsphere", ...)
+            keys = tuple((name, direction if isinstance(direction, str) else int(direction))
+                         for name, direction in index["key"])
+            existing[collection].append(keys)
+            if index.get("unique"):
+                existing_unique[collection].append(keys)
+
+    queries = []
+    for shape in shapes:
+        status = coverage(shape, existing[shape.collection], existing_unique[shape.collection])
+        queries.append({"query": shape.name, "collection": shape.collection, "coverage": status, "notes": shape.notes})
+        if status != "covered":
+            logging.warning(f"Query '{shape.name}' on {shape.collection} has {status} index coverage")
+
+    return {
+        "indexes": created,
+        "failed": failed,
+        "queries": queries,
+        "uncovered": [q["query"] for q in queries if q["coverage"] != "covered"],
+    }
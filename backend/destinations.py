@@ -0,0 +1,188 @@
+"""Free-text destination resolution with a multi-pattern matcher compiled once at import"""
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+@dataclass(frozen=True)
+class Place:
+    key: str  # canonical id, e.g. "mexico city"; stable across aliases
+    name: str
+    country: str
+    currency: str
+    kind: str  # "city" or "country"
+
+
+@dataclass(frozen=True)
+class DestinationMatch:
+    place: Place
+    alias: str
+    start: int  # character offsets into fold(text)
+    end: int
+
+
+# country: (currency, country aliases, {city: city aliases})
+CATALOGUE: Dict[str, Tuple[str, Tuple[str, ...], Dict[str, Tuple[str, ...]]]] = {
+    "Japan": ("JPY", (), {"Tokyo": (), "Kyoto": (), "Osaka": ()}),
+    "Thailand": ("THB", (), {"Bangkok": (), "Phuket": (), "Chiang Mai": ()}),
+    "India": ("INR", (), {"Mumbai": ("bombay",), "Delhi": ("new delhi",), "Goa": (), "Kerala": ()}),
+    "France": ("EUR", (), {"Paris": (), "Nice": (), "Lyon": ()}),
+    "Germany": ("EUR", (), {"Berlin": (), "Munich": (), "Hamburg": ()}),
+    "Italy": ("EUR", (), {"Rome": (), "Florence": (), "Venice": ()}),
+    "Spain": ("EUR", (), {"Madrid": (), "Barcelona": (), "Seville": ()}),
+    "United Kingdom": ("GBP", ("uk", "england", "scotland"), {"London": (), "Edinburgh": (), "Manchester": ()}),
+    "Australia": ("AUD", (), {"Sydney": (), "Melbourne": (), "Brisbane": ()}),
+    "Canada": ("CAD", (), {"Toronto": (), "Vancouver": (), "Montreal": ()}),
+    "Mexico": ("MXN", (), {"Mexico City": (), "Cancun": (), "Tulum": ()}),
+    "Brazil": ("BRL", (), {"Rio de Janeiro": ("rio",), "Sao Paulo": (), "Salvador": ()}),
+    "South Korea": ("KRW", ("korea",), {"Seoul": (), "Busan": ()}),
+    "Singapore": ("SGD", (), {}),
+    "Hong Kong": ("HKD", (), {}),
+    "Norway": ("NOK", (), {"Oslo": (), "Bergen": ()}),
+    "Sweden": ("SEK", (), {"Stockholm": (), "Gothenburg": ()}),
+    "Denmark": ("DKK", (), {"Copenhagen": ()}),
+    "Switzerland": ("CHF", (), {"Zurich": (), "Geneva": ()}),
+    "China": ("CNY", (), {"Beijing": (), "Shanghai": ()}),
+    "United Arab Emirates": ("AED", ("uae",), {"Dubai": (), "Abu Dhabi": ()}),
+    "Saudi Arabia": ("SAR", (), {"Riyadh": (), "Jeddah": ()}),
+    "South Africa": ("ZAR", (), {"Cape Town": (), "Johannesburg": ()}),
+    "Egypt": ("EGP", (), {"Cairo": (), "Alexandria": ()}),
+    "Turkey": ("TRY", ("turkiye",), {"Istanbul": (), "Ankara": ()}),
+    # Listed so their names win over the shorter city names they contain ("El Salvador" is not Salvador, Brazil)
+    "El Salvador": ("USD", (), {}),
+    "United States": ("USD", ("usa",), {"New York": ("nyc",), "Las Vegas": (), "San Francisco": ()}),
+}
+
+
+def fold(text: str) -> str:
+    """Lowercase ASCII form of text ("São Paulo" -> "sao paulo")"""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return text.lower()
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase ASCII word tokens ("São Paulo!" -> ["sao", "paulo"])"""
+    return _TOKEN.findall(fold(text))
+
+
+def catalogue_places() -> Iterable[Tuple[str, Place]]:
+    """(alias, place) for every name in CATALOGUE"""
+    for country, (currency, country_aliases, cities) in CATALOGUE.items():
+        country_place = Place(" ".join(normalize_tokens(country)), country, country, currency, "country")
+        for alias in (country, *country_aliases):
+            yield alias, country_place
+        for city, city_aliases in cities.items():
+            city_place = Place(" ".join(normalize_tokens(city)), city, country, currency, "city")
+            for alias in (city, *city_aliases):
+                yield alias, city_place
+
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    """Regex for a character trie; optional tails are greedy, so the longest alias wins"""
+    alternatives = []
+    for char, child in sorted(node.items()):
+        if char:
+            # Aliases are stored with single spaces; text may separate words with any punctuation
+            alternatives.append(("[^a-z0-9]+" if char == " " else re.escape(char)) + _trie_pattern(child))
+    if not alternatives:
+        return ""
+    body = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+    return f"(?:{body})?" if "" in node else body
+
+
+class DestinationMatcher:
+    """Word-boundary, leftmost-longest multi-pattern matching of place aliases.
+
+    The aliases are merged into a character trie once and compiled into a single regex, so a
+    lookup is one scan in the regex engine instead of a substring test per alias. Texts that are
+    exactly aliases, or comma-separated aliases such as "Tokyo, Japan", skip the scan entirely.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Place]]):
+        self.places: Dict[str, Place] = {}
+        self.by_alias: Dict[str, Place] = {}
+        # Adjacent word pairs inside multi-word aliases; only these can join two comma-separated parts
+        self.bigrams = set()
+        trie: Dict[str, dict] = {}
+        for alias, place in entries:
+            alias = " ".join(normalize_tokens(alias))
+            if not alias:
+                continue
+            node = trie
+            for char in alias:
+                node = node.setdefault(char, {})
+            node[""] = {}  # end-of-alias marker; real characters are never empty
+            self.by_alias[alias] = place
+            self.places[place.key] = place
+            words = alias.split()
+            self.bigrams.update(zip(words, words[1:]))
+        self.aliases = len(self.by_alias)
+        self.pattern = re.compile(r"\b(?:" + _trie_pattern(trie) + r")\b") if trie else None
+
+    def _alias(self, matched: str) -> str:
+        return matched if matched in self.by_alias else " ".join(_TOKEN.findall(matched))
+
+    def find_all(self, text: str) -> List[DestinationMatch]:
+        """Non-overlapping matches, taking the longest alias at each position (offsets into fold(text))"""
+        if self.pattern is None:
+            return []
+        matches = []
+        for m in self.pattern.finditer(fold(text)):
+            alias = self._alias(m.group())
+            matches.append(DestinationMatch(self.by_alias[alias], alias, m.start(), m.end()))
+        return matches
+
+    def _exact_parts(self, folded: str) -> Optional[List[Tuple[Place, int, int]]]:
+        """(place, start, end) for each comma-separated part if every part is exactly one alias.
+
+        These are then the only matches the regex scan could find, so resolve() can rank them
+        directly. Only plain string operations and dict lookups are used; None means the scan runs.
+        """
+        parts: List[Tuple[Place, int, int]] = []
+        offset, previous = 0, None
+        for chunk in folded.split(","):
+            alias = chunk.strip()
+            place = self.by_alias.get(alias)
+            if place is None or (parts and (previous, alias.split(" ", 1)[0]) in self.bigrams):
+                return None
+            start = offset + chunk.index(alias)
+            parts.append((place, start, start + len(alias)))
+            previous = alias.rsplit(" ", 1)[-1]
+            offset += len(chunk) + 1
+        return parts
+
+    def resolve(self, text: str) -> Optional[Place]:
+        """Most specific place named in text: cities before countries, then the longest, then leftmost match"""
+        if self.pattern is None:
+            return None
+        folded = fold(text)
+        parts = self._exact_parts(folded)
+        if parts is None:
+            parts = [(self.by_alias[self._alias(m.group())], m.start(), m.end()) for m in self.pattern.finditer(folded)]
+        best, best_rank = None, None
+        for place, start, end in parts:
+            rank = (place.kind != "city", start - end, start)
+            if best_rank is None or rank < best_rank:
+                best, best_rank = place, rank
+        return best
+
+    def currency_for(self, text: str, default: str = "USD") -> str:
+        place = self.resolve(text)
+        return place.currency if place else default
+
+
+destination_matcher = DestinationMatcher(catalogue_places())
+
+
+def canonical_destination(text: Optional[str]) -> Optional[str]:
+    """Stable key for a destination: the matched place's key, else the normalized text itself"""
+    if not text:
+        return None
+    place = destination_matcher.resolve(text)
+    if place is not None:
+        return place.key
+    return " ".join(normalize_tokens(text)) or None
@@ -0,0 +1,217 @@
+"""Exchange rates from a pluggable source, cached as a precomputed cross-rate matrix"""
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Units of each currency per 1 USD; used until (and whenever) the configured source cannot be read
+DEFAULT_RATES: Dict[str, float] = {
+    "USD": 1.0,
+    "EUR": 0.85,
+    "GBP": 0.73,
+    "JPY": 110.0,
+    "AUD": 1.35,
+    "CAD": 1.25,
+    "CHF": 0.92,
+    "CNY": 6.45,
+    "INR": 74.5,
+    "THB": 31.0,
+    "MXN": 20.0,
+    "BRL": 5.2,
+    "KRW": 1180.0,
+    "SGD": 1.35,
+    "HKD": 7.8,
+    "NOK": 8.5,
+    "SEK": 8.8,
+    "DKK": 6.3,
+    "PLN": 3.9,
+    "CZK": 21.5,
+    "HUF": 295.0,
+    "RUB": 73.0,
+    "TRY": 8.5,
+    "ZAR": 14.2,
+    "EGP": 15.7,
+    "AED": 3.67,
+    "SAR": 3.75,
+}
+
+
+def parse_rates(payload: Dict[str, Any]) -> Tuple[str, Dict[str, float]]:
+    """(base, rates) from an exchangerate-style {"base": ..., "rates": {...}} document"""
+    base = str(payload.get("base", "USD")).upper()
+    rates = {str(code).upper(): float(rate) for code, rate in payload["rates"].items()}
+    rates.setdefault(base, 1.0)
+    invalid = [code for code, rate in rates.items() if not np.isfinite(rate) or rate <= 0]
+    if invalid:
+        raise ValueError(f"Non-positive or non-finite rates for {', '.join(sorted(invalid))}")
+    return base, rates
+
+
+class StaticRateSource:
+    """Fixed rate table (the built-in defaults unless given one)"""
+
+    name = "static"
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, base: str = "USD"):
+        self.payload = {"base": base, "rates": dict(rates or DEFAULT_RATES)}
+
+    async def fetch(self) -> Dict[str, Any]:
+        return self.payload
+
+
+class FileRateSource:
+    """JSON file in the {"base": ..., "rates": {...}} shape, re-read on every refresh"""
+
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    async def fetch(self) -> Dict[str, Any]:
+        text = await asyncio.to_thread(self.path.read_text)
+        return json.loads(text)
+
+
+class HTTPRateSource:
+    """GET an exchangerate-style JSON document from a rates service"""
+
+    name = "http"
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    async def fetch(self) -> Dict[str, Any]:
+        import httpx
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+            return response.json()
+
+
+def rate_source_from_config(kind: str, path: Optional[str] = None, url: Optional[str] = None):
+    if kind == "static":
+        return StaticRateSource()
+    if kind == "file" and path:
+        return FileRateSource(path)
+    if kind == "http" and url:
+        return HTTPRateSource(url)
+    raise ValueError(f"Exchange rate source {kind!r} is unknown or missing its path/url")
+
+
+@dataclass(frozen=True)
+class RateTable:
+    """One loaded set of rates; matrix[i, j] converts 1 unit of currencies[i] into currencies[j]"""
+    currencies: Tuple[str, ...]
+    index: Dict[str, int]
+    matrix: np.ndarray
+    base: str
+    source: str
+    loaded_at: float
+
+    @classmethod
+    def build(cls, base: str, rates: Dict[str, float], source: str) -> "RateTable":
+        currencies = tuple(sorted(rates))
+        per_base = np.array([rates[code] for code in currencies], dtype=np.float64)
+        matrix = np.outer(1.0 / per_base, per_base)
+        matrix.setflags(write=False)
+        return cls(currencies, {code: i for i, code in enumerate(currencies)}, matrix, base, source, time.time())
+
+
+class UnsupportedCurrency(ValueError):
+    def __init__(self, codes: Sequence[str]):
+        self.codes = sorted(set(codes))
+        super().__init__(f"Currency {', '.join(self.codes)} not supported")
+
+
+class ExchangeRateService:
+    """Serves conversions from the current RateTable and refreshes it from the source in the background.
+
+    A stale table keeps serving while one refresh runs; a failed refresh keeps the last good table.
+    """
+
+    def __init__(self, source, refresh_seconds: float = 3600, retry_seconds: float = 60):
+        self.source = source
+        self.refresh_seconds = refresh_seconds
+        self.retry_seconds = retry_seconds
+        self.table = RateTable.build("USD", DEFAULT_RATES, "default")
+        self.next_refresh = 0.0
+        self.refreshing: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    async def refresh(self) -> bool:
+        """Load the source now; returns False (keeping the current table) if it fails"""
+        try:
+            base, rates = parse_rates(await self.source.fetch())
+            self.table = RateTable.build(base, rates, self.source.name)
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            self.next_refresh = time.monotonic() + self.retry_seconds
+            logging.warning(f"Exchange rate refresh from {self.source.name} failed, keeping {self.table.source} rates: {e}")
+            return False
+        self.refreshes += 1
+        self.last_error = None
+        self.next_refresh = time.monotonic() + self.refresh_seconds
+        return True
+
+    def current(self) -> RateTable:
+        """The table to serve now, scheduling a background refresh once it is due"""
+        if time.monotonic() >= self.next_refresh and (self.refreshing is None or self.refreshing.done()):
+            self.refreshing = asyncio.get_running_loop().create_task(self.refresh())
+        return self.table
+
+    def pair_rates(self, from_currencies: Sequence[str], to_currencies: Sequence[str]) -> np.ndarray:
+        """Rate for each (from, to) pair; NaN where either currency is unsupported"""
+        table = self.current()
+        lookup = table.index.get
+        from_idx = np.fromiter((lookup(code, -1) for code in from_currencies), dtype=np.intp, count=len(from_currencies))
+        to_idx = np.fromiter((lookup(code, -1) for code in to_currencies), dtype=np.intp, count=len(to_currencies))
+        rates = table.matrix[from_idx, to_idx]
+        rates[(from_idx < 0) | (to_idx < 0)] = np.nan
+        return rates
+
+    def convert_batches(
+        self,
+        batches: Sequence[Tuple[Sequence[float], str, str]]
+    ) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """Convert (amounts, from, to) batches with one gather and one multiply over all amounts.
+
+        Returns the per-batch rates and the converted amounts per batch (NaN for unsupported pairs).
+        """
+        rates = self.pair_rates([batch[1] for batch in batches], [batch[2] for batch in batches])
+        lengths = np.fromiter((len(batch[0]) for batch in batches), dtype=np.intp, count=len(batches))
+        if not lengths.sum():
+            return rates, [np.empty(0) for _ in batches]
+        amounts = np.concatenate([np.asarray(batch[0], dtype=np.float64) for batch in batches])
+        converted = amounts * np.repeat(rates, lengths)
+        return rates, np.split(converted, np.cumsum(lengths)[:-1])
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Single rate; raises UnsupportedCurrency for unknown codes"""
+        table = self.current()
+        missing = [code for code in (from_currency, to_currency) if code not in table.index]
+        if missing:
+            raise UnsupportedCurrency(missing)
+        return float(table.matrix[table.index[from_currency], table.index[to_currency]])
+
+    def stats(self) -> Dict[str, Any]:
+        table = self.table
+        return {
+            "source": table.source,
+            "base": table.base,
+            "currencies": len(table.currencies),
+            "age_seconds": round(time.time() - table.loaded_at, 1),
+            "refresh_seconds": self.refresh_seconds,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
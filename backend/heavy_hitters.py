@@ -0,0 +1,186 @@
+"""Streaming top-k (Space-Saving) for trending vibes and destinations, checkpointed to Mongo"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class SpaceSaving:
+    """Space-Saving heavy-hitter summary over at most `capacity` counters.
+
+    Counts overestimate the true frequency by at most their recorded error, and any item seen more
+    than total / capacity times is guaranteed to be tracked. Counters are grouped into buckets by
+    count, so an increment (including evicting the minimum) is O(1).
+    """
+
+    def __init__(self, capacity: int = 256):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.buckets: Dict[int, Dict[str, None]] = {}  # count -> items with that count (insertion ordered)
+        self.min_count = 0
+        self.total = 0
+        self.version = 0
+        self._top: Tuple[int, List[Tuple[str, int, int]]] = (-1, [])
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def _place(self, item: str, count: int) -> None:
+        self.counts[item] = count
+        self.buckets.setdefault(count, {})[item] = None
+
+    def _unplace(self, item: str) -> int:
+        count = self.counts.pop(item)
+        bucket = self.buckets[count]
+        del bucket[item]
+        if not bucket:
+            del self.buckets[count]
+        return count
+
+    def add(self, item: str) -> None:
+        self.total += 1
+        self.version += 1
+        if item in self.counts:
+            count = self._unplace(item)
+            self._place(item, count + 1)
+            if count == self.min_count and count not in self.buckets:
+                self.min_count = count + 1
+            return
+        if len(self.counts) < self.capacity:
+            self._place(item, 1)
+            self.errors[item] = 0
+            self.min_count = 1
+            return
+        # Replace the oldest minimum counter; the newcomer inherits its count as error
+        victim = next(iter(self.buckets[self.min_count]))
+        floor = self._unplace(victim)
+        del self.errors[victim]
+        self._place(item, floor + 1)
+        self.errors[item] = floor
+        if floor not in self.buckets:
+            self.min_count = floor + 1
+
+    def top(self, n: int) -> List[Tuple[str, int, int]]:
+        """(item, count, error) for the n largest counters, recomputed at most once per update"""
+        version, ranked = self._top
+        if version != self.version:
+            ranked = sorted(
+                ((item, count, self.errors[item]) for item, count in self.counts.items()),
+                key=lambda entry: (-entry[1], entry[0])
+            )
+            self._top = (self.version, ranked)
+        return ranked[:n]
+
+    def decay(self) -> None:
+        """Halve every counter so older activity fades (drops counters that reach zero)"""
+        entries = [(item, count // 2, self.errors[item] // 2) for item, count in self.counts.items() if count > 1]
+        self.restore(entries, sum(count for _, count, _ in entries))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "total": self.total,
+            "items": [[item, count, self.errors[item]] for item, count in self.counts.items()],
+        }
+
+    def restore(self, items: List[Any], total: int) -> None:
+        self.counts, self.errors, self.buckets = {}, {}, {}
+        # Oldest-first within a bucket is approximated by restoring smaller counts first
+        for item, count, error in sorted(items, key=lambda entry: entry[1])[-self.capacity:]:
+            self._place(str(item), int(count))
+            self.errors[str(item)] = int(error)
+        self.min_count = min(self.buckets) if self.buckets else 0
+        self.total = int(total)
+        self.version += 1
+
+
+class TrendingTracker:
+    """Named Space-Saving summaries with time decay and periodic Mongo checkpoints"""
+
+    def __init__(
+        self,
+        collection,
+        names: Tuple[str, ...],
+        capacity: int = 256,
+        half_life_seconds: float = 24 * 3600,
+        checkpoint_seconds: float = 60
+    ):
+        self.collection = collection
+        self.summaries = {name: SpaceSaving(capacity) for name in names}
+        self.half_life_seconds = half_life_seconds
+        self.checkpoint_seconds = checkpoint_seconds
+        self.last_decay = time.time()
+        self.saved_versions = {name: 0 for name in names}
+        self.checkpoints = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def record(self, name: str, item: Optional[str]) -> None:
+        if item:
+            self.summaries[name].add(item)
+
+    def trending(self, name: str, n: int = 10) -> List[Dict[str, Any]]:
+        summary = self.summaries[name]
+        return [
+            {"item": item, "count": count, "guaranteed": count - error}
+            for item, count, error in summary.top(n)
+        ]
+
+    def maybe_decay(self, now: Optional[float] = None) -> bool:
+        now = now or time.time()
+        if not self.half_life_seconds or now - self.last_decay < self.half_life_seconds:
+            return False
+        for summary in self.summaries.values():
+            summary.decay()
+        self.last_decay = now
+        return True
+
+    async def checkpoint(self) -> int:
+        """Save summaries that changed since the last checkpoint; returns how many were written"""
+        written = 0
+        for name, summary in self.summaries.items():
+            if summary.version == self.saved_versions[name]:
+                continue
+            version = summary.version
+            await self.collection.replace_one(
+                {"_id": name},
+                {**summary.snapshot(), "last_decay": self.last_decay, "updated_at": datetime.utcnow()},
+                upsert=True
+            )
+            self.saved_versions[name] = version
+            written += 1
+        self.checkpoints += written
+        return written
+
+    async def restore(self) -> int:
+        """Load the last checkpoint of each summary; returns how many were found"""
+        restored = 0
+        async for doc in self.collection.find({"_id": {"$in": list(self.summaries)}}):
+            summary = self.summaries[doc["_id"]]
+            summary.restore(doc.get("items", []), doc.get("total", 0))
+            self.saved_versions[doc["_id"]] = summary.version
+            self.last_decay = min(self.last_decay, doc.get("last_decay", self.last_decay))
+            restored += 1
+        return restored
+
+    async def run(self) -> None:
+        """Decay and checkpoint loop; start it as a background task"""
+        while True:
+            await asyncio.sleep(self.checkpoint_seconds)
+            try:
+                self.maybe_decay()
+                await self.checkpoint()
+            except Exception as e:
+                logging.warning(f"Trending checkpoint failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "checkpoints": self.checkpoints,
+            "summaries": {
+                name: {"tracked": len(summary), "capacity": summary.capacity, "total": summary.total}
+                for name, summary in self.summaries.items()
+            },
+        }
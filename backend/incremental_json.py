@@ -0,0 +1,139 @@
+"""Incremental JSON parser that emits object members as soon as they are complete"""
+import json
+from typing import Any, Iterable, List, Optional, Tuple
+
+Event = Tuple[Tuple[str, ...], Any]
+
+
+class _Frame:
+    __slots__ = ("kind", "start", "path", "key", "expect", "index")
+
+    def __init__(self, kind: str, start: int, path: Tuple[str, ...]):
+        self.kind = kind          # "object" or "array"
+        self.start = start
+        self.path = path
+        self.key: Optional[str] = None
+        self.expect = "key" if kind == "object" else "value"
+        self.index = 0
+
+
+class IncrementalJSONParser:
+    """Feed text chunks of a (possibly prose-wrapped) JSON object and collect completed members.
+
+    Members of the root object are emitted as ((key,), value). Keys listed in ``expand`` are
+    emitted member by member instead, as ((key, member_key), value), so e.g. each ``day_N`` of
+    ``daily_itinerary`` is available before the whole itinerary has arrived.
+
+    Like extract_json, a balanced span that is not valid JSON (prose such as "{your}", a trailing
+    comma) is discarded and scanning resumes after it.
+    """
+
+    def __init__(self, expand: Iterable[str] = ()):
+        self.expand = set(expand)
+        self.buffer = ""
+        self.pos = 0
+        self.stack: List[_Frame] = []
+        self.root_start: Optional[int] = None
+        self.root_end: Optional[int] = None
+        self.root: Optional[dict] = None
+        self.in_string = False
+        self.escape = False
+        self.string_start = 0
+        self.string_is_key = False
+        self.primitive_start: Optional[int] = None
+
+    @property
+    def complete(self) -> bool:
+        return self.root_end is not None
+
+    def document(self) -> Optional[dict]:
+        """The full root object, once it has been completely received and parsed"""
+        return self.root
+
+    def feed(self, chunk: str) -> List[Event]:
+        events: List[Event] = []
+        self.buffer += chunk
+        buffer = self.buffer
+
+        while self.pos < len(buffer) and self.root_end is None:
+            i = self.pos
+            c = buffer[i]
+            self.pos += 1
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif c == "\\":
+                    self.escape = True
+                elif c == '"':
+                    self.in_string = False
+                    frame = self.stack[-1]
+                    if self.string_is_key:
+                        frame.key = json.loads(buffer[self.string_start:i + 1])
+                        frame.expect = "colon"
+                    else:
+                        self._complete_value(frame, self.string_start, i + 1, events)
+                continue
+
+            if not self.stack:
+                if c == "{":
+                    self.root_start = i
+                    self.stack.append(_Frame("object", i, ()))
+                continue
+
+            frame = self.stack[-1]
+
+            if self.primitive_start is not None and (c.isspace() or c in ",}]"):
+                self._complete_value(frame, self.primitive_start, i, events)
+                self.primitive_start = None
+
+            if c.isspace():
+                continue
+            if c == '"':
+                self.in_string = True
+                self.string_start = i
+                self.string_is_key = frame.kind == "object" and frame.expect == "key"
+            elif c == ":":
+                frame.expect = "value"
+            elif c == ",":
+                frame.expect = "key" if frame.kind == "object" else "value"
+            elif c in "{[":
+                self.stack.append(_Frame("object" if c == "{" else "array", i, frame.path + (self._member_name(frame),)))
+            elif c in "}]":
+                closed = self.stack.pop()
+                if not self.stack:
+                    try:
+                        self.root = json.loads(buffer[self.root_start:i + 1])
+                        self.root_end = i + 1
+                    except ValueError:
+                        self.root_start = None
+                        self.primitive_start = None
+                else:
+                    self._complete_value(self.stack[-1], closed.start, i + 1, events)
+            elif self.primitive_start is None:
+                self.primitive_start = i
+
+        return events
+
+    @staticmethod
+    def _member_name(frame: _Frame) -> str:
+        return frame.key if frame.kind == "object" else str(frame.index)
+
+    def _complete_value(self, frame: _Frame, start: int, end: int, events: List[Event]) -> None:
+        name = self._member_name(frame)
+        path = frame.path + (name,)
+        frame.expect = "comma"
+        if frame.kind == "array":
+            frame.index += 1
+
+        depth = len(path)
+        # A value without a key ("{42}") can only come from prose; it is never a member
+        emit = None not in path and (
+            (depth == 1 and name not in self.expand) or (depth == 2 and path[0] in self.expand)
+        )
+        if not emit:
+            return
+        try:
+            events.append((path, json.loads(self.buffer[start:end])))
+        except ValueError:
+            pass
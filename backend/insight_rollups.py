@@ -0,0 +1,155 @@
+"""Hourly and daily rollups behind /travel-insights, maintained with $inc on every write
+
+Totals live in one document per bucket. Vibe counts live in a separate collection with one
+document per (bucket, vibe), so a busy bucket's totals document stays a fixed size however many
+distinct queries it sees.
+"""
+import asyncio
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from review_stats import SENTIMENTS, stats_increment
+
+GRANULARITIES = {"h": "hour", "d": "day"}
+# Rollups expire after this long; it also bounds the longest window each granularity can answer
+RETENTION = {"hour": timedelta(days=8), "day": timedelta(days=400)}
+MAX_WINDOW = {"hour": 168, "day": 365}
+POPULAR_VIBES = 3
+
+_WINDOW = re.compile(r"^\s*(\d+)\s*([hd])\s*$", re.IGNORECASE)
+MAX_VIBE_QUERY = 200
+
+
+def parse_window(window: str) -> Tuple[str, int]:
+    """("hour" | "day", bucket count) for "24h", "7d", "30d", ...; raises ValueError otherwise"""
+    match = _WINDOW.match(window or "")
+    if not match:
+        raise ValueError(f"Invalid window {window!r}; use hours or days like 24h, 7d or 30d")
+    granularity, count = GRANULARITIES[match.group(2).lower()], int(match.group(1))
+    if not 1 <= count <= MAX_WINDOW[granularity]:
+        raise ValueError(f"Window {window!r} must be between 1 and {MAX_WINDOW[granularity]} {granularity}s")
+    return granularity, count
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def vibe_key(query: Optional[str]) -> Optional[str]:
+    """Case- and whitespace-insensitive grouping key for a vibe query"""
+    key = " ".join((query or "").lower().split())[:80].strip()
+    return key or None
+
+
+def rollup_updates(
+    increment: Dict[str, float],
+    now: datetime,
+    key: Optional[str] = None,
+    fields: Optional[Dict[str, Any]] = None
+) -> List[UpdateOne]:
+    """Upserts adding increment to the current hourly and daily documents (per key, if given)"""
+    updates = []
+    for granularity in ("hour", "day"):
+        bucket = bucket_start(now, granularity)
+        doc_id = f"{granularity}:{bucket.isoformat()}"
+        update = {
+            "$inc": increment,
+            "$setOnInsert": {
+                "granularity": granularity,
+                "bucket": bucket,
+                "expires_at": bucket + RETENTION[granularity],
+            },
+        }
+        if key is not None:
+            doc_id += f":{key}"
+            update["$setOnInsert"]["vibe"] = key
+        if fields:
+            update["$set"] = fields
+        updates.append(UpdateOne({"_id": doc_id}, update, upsert=True))
+    return updates
+
+
+def window_pipelines(granularity: str, start: datetime) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """(totals, popular vibes) pipelines over the rollup and vibe documents of one window"""
+    match = {"$match": {"granularity": granularity, "bucket": {"$gte": start}}}
+    totals = [
+        match,
+        {"$group": {
+            "_id": None,
+            "buckets": {"$sum": 1},
+            "review_count": {"$sum": "$reviews.review_count"},
+            "safety_total": {"$sum": "$reviews.safety_total"},
+            "cleanliness_total": {"$sum": "$reviews.cleanliness_total"},
+            **{sentiment: {"$sum": f"$reviews.sentiment.{sentiment}"} for sentiment in SENTIMENTS},
+            "recommendations": {"$sum": "$recommendations"},
+            "vibe_searches": {"$sum": "$vibe_searches"},
+        }},
+    ]
+    vibes = [
+        match,
+        # Oldest bucket first, so $last picks the spelling from the vibe's most recent search; it is
+        # shown instead of the lowercased key. The (granularity, bucket) index serves match and sort
+        {"$sort": {"bucket": 1}},
+        {"$group": {"_id": "$vibe", "count": {"$sum": "$count"}, "query": {"$last": "$query"}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": POPULAR_VIBES},
+    ]
+    return totals, vibes
+
+
+class InsightRollups:
+    """Records events into rollups and answers windowed insight queries from them"""
+
+    def __init__(self, collection, vibes_collection):
+        self.collection = collection
+        self.vibes_collection = vibes_collection
+
+    async def _apply(self, increment: Dict[str, float], now: Optional[datetime] = None) -> None:
+        await self.collection.bulk_write(rollup_updates(increment, now or datetime.utcnow()), ordered=False)
+
+    async def record_reviews(self, records: List[Dict[str, Any]], now: Optional[datetime] = None) -> None:
+        if records:
+            await self._apply({f"reviews.{key}": value for key, value in stats_increment(records).items()}, now)
+
+    async def record_recommendation(self, now: Optional[datetime] = None) -> None:
+        await self._apply({"recommendations": 1}, now)
+
+    async def record_vibe_search(self, query: str, now: Optional[datetime] = None) -> None:
+        now = now or datetime.utcnow()
+        writes = [self._apply({"vibe_searches": 1}, now)]
+        key = vibe_key(query)
+        if key:
+            updates = rollup_updates({"count": 1}, now, key=key, fields={"query": query.strip()[:MAX_VIBE_QUERY]})
+            writes.append(self.vibes_collection.bulk_write(updates, ordered=False))
+        await asyncio.gather(*writes)
+
+    async def insights(self, window: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Insights over the last `window`, aligned to whole buckets (the current one included)"""
+        granularity, count = parse_window(window)
+        step = timedelta(hours=1) if granularity == "hour" else timedelta(days=1)
+        start = bucket_start(now or datetime.utcnow(), granularity) - step * (count - 1)
+        totals_pipeline, vibes_pipeline = window_pipelines(granularity, start)
+
+        totals, vibes = await asyncio.gather(
+            self.collection.aggregate(totals_pipeline).to_list(1),
+            self.vibes_collection.aggregate(vibes_pipeline).to_list(POPULAR_VIBES),
+        )
+        totals = totals[0] if totals else {}
+        reviews = totals.get("review_count", 0)
+        return {
+            "window": window,
+            "window_start": start,
+            "buckets": totals.get("buckets", 0),
+            "total_reviews_analyzed": reviews,
+            "average_safety_score": round(totals.get("safety_total", 0) / reviews, 2) if reviews else 0,
+            "average_cleanliness_score": round(totals.get("cleanliness_total", 0) / reviews, 2) if reviews else 0,
+            "sentiment_distribution": {sentiment: totals.get(sentiment, 0) for sentiment in SENTIMENTS},
+            "recent_recommendations": totals.get("recommendations", 0),
+            "vibe_searches": totals.get("vibe_searches", 0),
+            "popular_vibes": [doc.get("query") or doc["_id"] for doc in vibes],
+        }
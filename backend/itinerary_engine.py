@@ -0,0 +1,67 @@
+"""Chunked generation of long itineraries: day ranges are generated concurrently and merged"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+DayRange = Tuple[int, int]
+
+
+def day_ranges(duration: int, chunk_days: int) -> List[DayRange]:
+    """Split days 1..duration into inclusive ranges of at most chunk_days"""
+    chunk_days = max(1, chunk_days)
+    return [(start, min(start + chunk_days - 1, duration)) for start in range(1, duration + 1, chunk_days)]
+
+
+async def generate_days_in_chunks(
+    duration: int,
+    generate_chunk: Callable[[int, int], Awaitable[Dict[str, Any]]],
+    fallback_day: Callable[[int], Dict[str, Any]],
+    chunk_days: int = 4,
+    concurrency: int = 3,
+    retries: int = 1,
+    on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Generate day_1..day_N with bounded parallelism.
+
+    Each chunk is retried on its own; days a chunk still fails to deliver come from fallback_day.
+    on_chunk, if given, receives each chunk's days (in day order) as soon as that chunk is done.
+    Returns the merged daily itinerary (in day order) and generation stats.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    stats = {"chunks": 0, "retries": 0, "fallback_days": 0}
+
+    async def run_chunk(start: int, end: int) -> Dict[str, Any]:
+        wanted = [f"day_{day}" for day in range(start, end + 1)]
+        days: Dict[str, Any] = {}
+        async with semaphore:
+            for attempt in range(retries + 1):
+                if attempt:
+                    stats["retries"] += 1
+                try:
+                    generated = await generate_chunk(start, end)
+                    days.update({key: generated[key] for key in wanted if key in generated})
+                except asyncio.TimeoutError:
+                    logging.warning(f"Itinerary chunk days {start}-{end} timed out (attempt {attempt + 1})")
+                except Exception as e:
+                    logging.warning(f"Itinerary chunk days {start}-{end} failed (attempt {attempt + 1}): {str(e)}")
+                if len(days) == len(wanted):
+                    break
+
+        for day in range(start, end + 1):
+            if f"day_{day}" not in days:
+                days[f"day_{day}"] = fallback_day(day)
+                stats["fallback_days"] += 1
+        days = {key: days[key] for key in wanted}
+        if on_chunk is not None:
+            on_chunk(days)
+        return days
+
+    ranges = day_ranges(duration, chunk_days)
+    stats["chunks"] = len(ranges)
+    chunks = await asyncio.gather(*(run_chunk(start, end) for start, end in ranges))
+
+    merged: Dict[str, Any] = {}
+    for chunk in chunks:
+        merged.update(chunk)
+    ordered = {f"day_{day}": merged[f"day_{day}"] for day in range(1, duration + 1)}
+    return ordered, stats
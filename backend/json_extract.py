@@ -0,0 +1,159 @@
+"""Fast, robust extraction of JSON objects/arrays from LLM responses"""
+import json
+import re
+from typing import Any, Optional, Tuple
+
+_MISSING = object()
+_UNDECIDED = object()
+_PAIRS = {"{": "}", "[": "]"}
+_STRUCTURAL = re.compile(r'["{}\[\],\\]')
+_FENCE = re.compile(r"```[ \t]*(?:json|JSON|javascript|js)?[ \t]*\r?\n?(.*?)(?:```|\Z)", re.DOTALL)
+_OPENER = re.compile(r"[{\[]")
+_MAX_RESTARTS = 8
+_MAX_DIRECT_CANDIDATES = 32
+_decoder = json.JSONDecoder()
+
+
+def _closers(stack) -> str:
+    return "".join(_PAIRS[opener] for opener in reversed(stack))
+
+
+def _repair(fragment: str, in_string: bool, stack: list, last_cut: Optional[Tuple[int, tuple]]) -> Any:
+    """Close a truncated JSON fragment, preferring to keep as much of it as possible"""
+    body = fragment.rstrip()
+    if in_string:
+        candidates = [body + '"' + _closers(stack)]
+    else:
+        candidates = [body.rstrip(",") + _closers(stack)]
+    if last_cut is not None:
+        cut, cut_stack = last_cut
+        candidates.append(fragment[:cut].rstrip().rstrip(",") + _closers(cut_stack))
+
+    for candidate in candidates:
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            continue
+    return _MISSING
+
+
+def _scan(text: str, openers: str, repair: bool, pos: int = 0) -> Tuple[Any, Optional[int]]:
+    """Linear scan for the first top-level container starting with one of openers.
+
+    Containers of the other kind are skipped whole rather than searched. Returns (value, None) on success, or (_MISSING, restart) where restart is the position
+    after an unbalanced candidate's opener (None if there is nothing left to try).
+    """
+    start = None
+    stack: list = []
+    in_string = False
+    skip_to = -1
+    last_cut = None
+
+    for match in _STRUCTURAL.finditer(text, pos):
+        i = match.start()
+        if i < skip_to:
+            continue
+        c = match.group()
+
+        if start is None:
+            if c in "{[":
+                start, stack, in_string, last_cut = i, [c], False, (1, (c,))
+            continue
+
+        if in_string:
+            if c == "\\":
+                skip_to = i + 2
+            elif c == '"':
+                in_string = False
+            continue
+
+        if c == '"':
+            in_string = True
+        elif c in "{[":
+            stack.append(c)
+            last_cut = (i + 1 - start, tuple(stack))
+        elif c == ",":
+            last_cut = (i - start, tuple(stack))
+        elif c in "}]":
+            if _PAIRS[stack[-1]] != c:
+                start, stack = None, []
+                continue
+            stack.pop()
+            if not stack:
+                if text[start] in openers:
+                    try:
+                        return json.loads(text[start:i + 1]), None
+                    except ValueError:
+                        # Prose such as "{your}" balances but isn't JSON; keep scanning after it
+                        pass
+                start = None
+
+    if start is None:
+        return _MISSING, None
+    if repair:
+        repaired = _repair(text[start:], in_string, stack, last_cut)
+        if repaired is not _MISSING:
+            return (repaired if text[start] in openers else _MISSING), None
+    return _MISSING, start + 1
+
+
+def _decode_direct(text: str, openers: str) -> Any:
+    """C-speed path: decode each top-level container straight from its opener.
+
+    Complete containers of the other kind are skipped whole, so nothing nested inside one is
+    returned. Gives up (_UNDECIDED) at the first opener that doesn't decode: it may be a truncated
+    document whose complete inner values must not be mistaken for the reply, so the scan repairs it.
+    """
+    pos = 0
+    for _ in range(_MAX_DIRECT_CANDIDATES):
+        match = _OPENER.search(text, pos)
+        if match is None:
+            return _MISSING
+        try:
+            value, pos = _decoder.raw_decode(text, match.start())
+        except ValueError:
+            return _UNDECIDED
+        if match.group() in openers:
+            return value
+    return _UNDECIDED
+
+
+def _extract(text: str, openers: str, repair: bool) -> Any:
+    value = _decode_direct(text, openers)
+    if value is not _UNDECIDED:
+        return value
+
+    pos = 0
+    for _ in range(_MAX_RESTARTS):
+        value, restart = _scan(text, openers, repair, pos)
+        if value is not _MISSING or restart is None:
+            return value
+        pos = restart
+    return _MISSING
+
+
+def extract_json(text: str, kind: Optional[str] = None, repair: bool = True) -> Any:
+    """Parse the JSON object ("object"), array ("array") or either (None) in an LLM reply.
+
+    Code fences are searched first, then the whole text. Truncated output (unclosed strings,
+    arrays and objects) is repaired when possible. Returns None if nothing parses.
+    """
+    if not text:
+        return None
+    openers = {"object": "{", "array": "[", None: "{["}[kind]
+
+    stripped = text.strip()
+    if stripped[:1] in openers:
+        try:
+            return json.loads(stripped)
+        except ValueError:
+            pass
+
+    if "```" in text:
+        for fence in _FENCE.finditer(text):
+            value = _extract(fence.group(1), openers, repair)
+            if value is not _MISSING:
+                return value
+
+    value = _extract(text, openers, repair)
+    return None if value is _MISSING else value
@@ -0,0 +1,73 @@
+"""Shared plumbing for LLM calls: chat factories and prompt fingerprints"""
+import hashlib
+import logging
+import uuid
+from typing import Any, Dict, Optional
+
+from emergentintegrations.llm.chat import LlmChat
+
+_shared_http_client = None
+
+
+def configure_shared_http_client(max_connections: int = 100, keepalive: int = 20) -> None:
+    """Route litellm's async OpenAI-compatible calls through one pooled httpx client"""
+    global _shared_http_client
+    try:
+        import httpx
+        import litellm
+    except ImportError:
+        logging.info("litellm/httpx not available, using the client library's default connections")
+        return
+
+    if _shared_http_client is None:
+        _shared_http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=keepalive),
+            timeout=httpx.Timeout(60.0)
+        )
+        litellm.aclient_session = _shared_http_client
+
+
+async def close_shared_http_client() -> None:
+    global _shared_http_client
+    if _shared_http_client is not None:
+        await _shared_http_client.aclose()
+        _shared_http_client = None
+
+
+class ChatFactory:
+    """Hands out isolated, history-free chat handles for one model"""
+
+    def __init__(self, label: str, api_key: str, system_message: str, provider: str, model: str):
+        self.label = label
+        self.api_key = api_key
+        self.system_message = system_message
+        self.provider = provider
+        self.model = model
+        self.hedge: Optional["ChatFactory"] = None
+        self.handles_created = 0
+
+    @property
+    def supports_streaming(self) -> bool:
+        return hasattr(LlmChat, "stream_message")
+
+    @property
+    def model_label(self) -> str:
+        return f"{self.provider}/{self.model}"
+
+    def acquire(self) -> LlmChat:
+        """New chat handle with a unique session so no conversation history is shared"""
+        self.handles_created += 1
+        return LlmChat(
+            api_key=self.api_key,
+            session_id=f"{self.label}-{uuid.uuid4().hex}",
+            system_message=self.system_message
+        ).with_model(self.provider, self.model)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"model": self.model_label, "handles_created": self.handles_created}
+
+
+def prompt_fingerprint(model_label: str, prompt: str) -> str:
+    """Stable key for a prompt sent to a given model"""
+    normalized = "\n".join(line.strip() for line in prompt.strip().splitlines())
+    return hashlib.sha256(f"{model_label}\n{normalized}".encode("utf-8")).hexdigest()
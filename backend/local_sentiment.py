@@ -0,0 +1,172 @@
+"""Lexicon-based sentiment, safety and cleanliness scoring for travel reviews"""
+import re
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Feature columns of the weight matrix
+SENT_POS, SENT_NEG, SAFE_POS, SAFE_NEG, CLEAN_POS, CLEAN_NEG = range(6)
+
+SENTIMENT_POSITIVE = {
+    "amazing": 1.5, "incredible": 1.5, "excellent": 1.5, "outstanding": 1.5, "fantastic": 1.5, "wonderful": 1.5,
+    "magical": 1.5, "exceeded": 1.2, "love": 1.3, "loved": 1.3, "beautiful": 1.0, "lovely": 1.0, "great": 1.0,
+    "good": 0.7, "nice": 0.7, "friendly": 0.8, "helpful": 0.8, "recommend": 1.2, "highly": 0.5, "enjoyed": 1.0,
+    "efficient": 0.8, "reliable": 0.8, "fascinating": 1.0, "vibrant": 0.8, "rich": 0.5, "perfect": 1.3,
+    "delicious": 1.0, "stunning": 1.2, "gorgeous": 1.2, "pleasant": 0.8, "best": 1.0, "disappoints": -1.0,
+}
+SENTIMENT_NEGATIVE = {
+    "terrible": 1.5, "awful": 1.5, "horrible": 1.5, "worst": 1.5, "disappointing": 1.2, "disappointed": 1.2,
+    "bad": 1.0, "poor": 1.0, "rude": 1.0, "overpriced": 0.8, "scam": 1.3, "scammed": 1.3, "avoid": 1.2,
+    "chaotic": 0.6, "crowded": 0.4, "confusing": 0.4, "challenging": 0.4, "crazy": 0.4, "noise": 0.4,
+    "noisy": 0.5, "pollution": 0.5, "hot": 0.2, "humid": 0.2, "expensive": 0.5, "boring": 0.8, "hate": 1.3,
+}
+SAFETY_POSITIVE = {
+    "safe": 1.5, "safely": 1.0, "secure": 1.2, "safety": 0.3, "peaceful": 0.6, "calm": 0.4, "welcoming": 0.4,
+}
+SAFETY_NEGATIVE = {
+    "unsafe": 1.8, "dangerous": 1.8, "danger": 1.5, "crime": 1.5, "robbed": 2.0, "robbery": 2.0, "theft": 1.5,
+    "stolen": 1.8, "pickpockets": 1.0, "pickpocket": 1.0, "pickpocketing": 1.0, "scam": 0.8, "scams": 0.8,
+    "sketchy": 1.2, "harassed": 1.8, "harassment": 1.8, "alert": 0.4, "careful": 0.3, "watch": 0.2,
+}
+CLEANLINESS_POSITIVE = {
+    "clean": 1.5, "cleaner": 0.8, "spotless": 2.0, "tidy": 1.2, "immaculate": 2.0, "pristine": 1.8,
+    "hygienic": 1.2, "maintained": 0.8, "organized": 0.5, "fresh": 0.5,
+}
+CLEANLINESS_NEGATIVE = {
+    "dirty": 1.8, "filthy": 2.0, "trash": 1.2, "garbage": 1.2, "litter": 1.0, "smelly": 1.2, "smell": 0.6,
+    "pollution": 0.8, "polluted": 1.2, "grimy": 1.5, "unclean": 1.8, "maintenance": 0.6, "stained": 1.2,
+    "cockroaches": 2.0, "bugs": 1.2, "mold": 1.5,
+}
+NEGATORS = {"not", "no", "never", "hardly", "barely", "isn't", "wasn't", "aren't", "don't", "didn't", "nothing"}
+INTENSIFIERS = {"very": 1.5, "super": 1.5, "extremely": 1.8, "really": 1.3, "completely": 1.5, "so": 1.2, "incredibly": 1.6}
+
+_TOKEN = re.compile(r"[a-z']+")
+_TOKEN_OR_BREAK = re.compile(r"[a-z']+|[.!?,;:]")
+_BREAKS = frozenset(".!?,;:")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _build_lexicon():
+    """Vocabulary (plain and NOT_-prefixed terms) and its (vocab x 6) weight matrix"""
+    lexicons = [
+        (SENTIMENT_POSITIVE, SENT_POS, SENT_NEG), (SENTIMENT_NEGATIVE, SENT_NEG, SENT_POS),
+        (SAFETY_POSITIVE, SAFE_POS, SAFE_NEG), (SAFETY_NEGATIVE, SAFE_NEG, SAFE_POS),
+        (CLEANLINESS_POSITIVE, CLEAN_POS, CLEAN_NEG), (CLEANLINESS_NEGATIVE, CLEAN_NEG, CLEAN_POS),
+    ]
+    vocab: Dict[str, int] = {}
+    rows: List[np.ndarray] = []
+
+    def row_for(term: str) -> np.ndarray:
+        if term not in vocab:
+            vocab[term] = len(rows)
+            rows.append(np.zeros(6, dtype=np.float64))
+        return rows[vocab[term]]
+
+    for lexicon, column, flipped in lexicons:
+        for term, weight in lexicon.items():
+            # Negative weights (e.g. "disappoints" in "never disappoints") count toward the opposite column
+            target, opposite = (column, flipped) if weight >= 0 else (flipped, column)
+            row_for(term)[target] += abs(weight)
+            row_for(f"NOT_{term}")[opposite] += abs(weight) * 0.8
+    return vocab, np.vstack(rows)
+
+
+VOCAB, WEIGHTS = _build_lexicon()
+SAFETY_TERMS = frozenset(SAFETY_POSITIVE) | frozenset(SAFETY_NEGATIVE)
+CLEANLINESS_TERMS = frozenset(CLEANLINESS_POSITIVE) | frozenset(CLEANLINESS_NEGATIVE)
+
+
+class LexiconSentimentScorer:
+    """Vectorized lexicon scorer returning the same fields as the LLM analysis"""
+
+    def __init__(self, vocab: Dict[str, int] = VOCAB, weights: np.ndarray = WEIGHTS):
+        self.vocab = vocab
+        self.weights = weights
+
+    def _features(self, texts: List[str]) -> np.ndarray:
+        review_idx: List[int] = []
+        term_idx: List[int] = []
+        boosts: List[float] = []
+        for r, text in enumerate(texts):
+            tokens = _TOKEN_OR_BREAK.findall(text.lower())
+            last_negator = -10
+            for i, token in enumerate(tokens):
+                if token in NEGATORS:
+                    last_negator = i
+                    continue
+                if token in _BREAKS:
+                    last_negator = -10
+                    continue
+                # A negator within the previous three tokens flips the term
+                term = f"NOT_{token}" if i - last_negator <= 3 else token
+                index = self.vocab.get(term)
+                if index is None:
+                    continue
+                review_idx.append(r)
+                term_idx.append(index)
+                boosts.append(INTENSIFIERS.get(tokens[i - 1], 1.0) if i else 1.0)
+
+        features = np.zeros((len(texts), self.weights.shape[1]), dtype=np.float64)
+        if review_idx:
+            hits = self.weights[np.array(term_idx)] * np.array(boosts)[:, None]
+            np.add.at(features, np.array(review_idx), hits)
+        return features
+
+    @staticmethod
+    def _mentions(text: str, terms: frozenset) -> List[str]:
+        sentences = [s.strip() for s in _SENTENCE.split(text) if s.strip()]
+        return [s for s in sentences if not terms.isdisjoint(_TOKEN.findall(s.lower()))]
+
+    def score(self, texts: List[str]) -> List[Dict[str, Any]]:
+        if not texts:
+            return []
+        features = self._features(texts)
+
+        # Safety and cleanliness impressions also colour the overall sentiment, at half weight
+        pos = features[:, SENT_POS] + 0.5 * (features[:, SAFE_POS] + features[:, CLEAN_POS])
+        neg = features[:, SENT_NEG] + 0.5 * (features[:, SAFE_NEG] + features[:, CLEAN_NEG])
+        net = pos - neg
+        evidence = pos + neg
+        sentiment = np.where(net > 0.5, "positive", np.where(net < -0.5, "negative", "neutral"))
+        polarity_conf = np.abs(net) / (evidence + 1.0) * (1.0 - np.exp(-evidence / 2.0))
+        # Bland reviews carry little signal either way, so "neutral" is never a confident call
+        sentiment_conf = np.where(sentiment == "neutral", 0.6 * np.exp(-np.abs(net)), 0.5 + 0.5 * polarity_conf)
+
+        safety_net = features[:, SAFE_POS] - features[:, SAFE_NEG]
+        clean_net = features[:, CLEAN_POS] - features[:, CLEAN_NEG]
+        has_safety = (features[:, SAFE_POS] + features[:, SAFE_NEG]) > 0
+        has_clean = (features[:, CLEAN_POS] + features[:, CLEAN_NEG]) > 0
+        safety_score = np.where(has_safety, 5.0 + 4.5 * np.tanh(safety_net / 2.0), 7.0)
+        cleanliness_score = np.where(has_clean, 5.0 + 4.5 * np.tanh(clean_net / 2.0), 7.0)
+
+        # Unmentioned aspects are guesses, so they lower confidence in the overall analysis
+        coverage = 0.8 + 0.1 * has_safety + 0.1 * has_clean
+        confidence = np.clip(sentiment_conf * coverage, 0.0, 0.99)
+
+        results = []
+        for i, text in enumerate(texts):
+            safety_mentions = self._mentions(text, SAFETY_TERMS)
+            cleanliness_mentions = self._mentions(text, CLEANLINESS_TERMS)
+            label = str(sentiment[i])
+            safety = round(float(safety_score[i]), 1)
+            cleanliness = round(float(cleanliness_score[i]), 1)
+            results.append({
+                "overall_sentiment": label,
+                "sentiment_confidence": round(float(confidence[i]), 2),
+                "safety_score": safety,
+                "cleanliness_score": cleanliness,
+                "key_insights": [
+                    f"Overall {label} experience",
+                    f"Safety impression {safety}/10",
+                    f"Cleanliness impression {cleanliness}/10",
+                ],
+                "safety_mentions": safety_mentions or ["No specific safety concerns mentioned"],
+                "cleanliness_mentions": cleanliness_mentions or ["No specific cleanliness comments"],
+                "recommendation": (
+                    "Recommended destination" if label == "positive" and safety >= 6 else
+                    "Travel with caution" if safety < 5 else
+                    "Mixed experience, research before visiting"
+                ),
+                "analysis_source": "local",
+            })
+        return results
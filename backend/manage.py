@@ -0,0 +1,128 @@
+"""Maintenance commands for the WanderWise AI backend
+
+Run from the backend directory, e.g.:
+    python manage.py compress-itineraries --codec zlib
+    python manage.py decompress-itineraries
+    python manage.py rebuild-review-stats
+"""
+import argparse
+import asyncio
+import os
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from review_stats import STATS_COLLECTION, rebuild_pipeline
+from storage_codec import BLOB_FIELD, CODEC_FIELD, ItineraryCodec
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+
+def get_db():
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    return client, client[os.environ['DB_NAME']]
+
+
+async def migrate_itineraries(collection, codec: ItineraryCodec, compress: bool, batch_size: int = 500,
+                              dry_run: bool = False) -> Tuple[int, int]:
+    """Rewrite saved itineraries into (or out of) the compressed storage format in batches.
+
+    Returns (scanned, rewritten). Pass a codec of "none" to decompress.
+    """
+    query = {"itinerary_data": {"$exists": True}} if compress else {BLOB_FIELD: {"$exists": True}}
+    scanned = rewritten = 0
+
+    batch = []
+    async for doc in collection.find(query):
+        scanned += 1
+        if compress:
+            stored = codec.encode(doc)
+            if BLOB_FIELD not in stored:
+                continue
+            update = {"$set": {BLOB_FIELD: stored[BLOB_FIELD], CODEC_FIELD: stored[CODEC_FIELD]},
+                      "$unset": {"itinerary_data": ""}}
+        else:
+            update = {"$set": {"itinerary_data": codec.decode(doc)["itinerary_data"]},
+                      "$unset": {BLOB_FIELD: "", CODEC_FIELD: ""}}
+        # Guarding on the source field makes re-runs and concurrent runs harmless
+        source = "itinerary_data" if compress else BLOB_FIELD
+        batch.append(UpdateOne({"_id": doc["_id"], source: {"$exists": True}}, update))
+        rewritten += 1
+
+        if len(batch) >= batch_size:
+            if not dry_run:
+                await collection.bulk_write(batch, ordered=False)
+            batch = []
+    if batch and not dry_run:
+        await collection.bulk_write(batch, ordered=False)
+    return scanned, rewritten
+
+
+async def run_itinerary_migration(args, compress: bool) -> None:
+    client, db = get_db()
+    codec = ItineraryCodec(codec=args.codec if compress else "none", min_size=args.min_bytes)
+    try:
+        scanned, rewritten = await migrate_itineraries(
+            db.saved_itineraries, codec, compress, batch_size=args.batch, dry_run=args.dry_run
+        )
+    finally:
+        client.close()
+
+    verb = "would rewrite" if args.dry_run else "rewrote"
+    print(f"Scanned {scanned} itineraries, {verb} {rewritten}")
+    if codec.stored_bytes:
+        print(f"itinerary_data: {codec.raw_bytes} bytes of JSON -> {codec.stored_bytes} bytes "
+              f"({codec.raw_bytes / codec.stored_bytes:.1f}x)")
+
+
+async def compress_itineraries(args) -> None:
+    await run_itinerary_migration(args, compress=True)
+
+
+async def decompress_itineraries(args) -> None:
+    await run_itinerary_migration(args, compress=False)
+
+
+async def rebuild_review_stats(args) -> None:
+    """Recompute destination_review_stats from review_analyses in one aggregation pass"""
+    client, db = get_db()
+    pipeline = rebuild_pipeline()
+    try:
+        if args.dry_run:
+            # Same pass without the final $out
+            stats = await db.review_analyses.aggregate(pipeline[:-1]).to_list(None)
+            print(f"Would write stats for {len(stats)} destinations "
+                  f"({sum(doc['review_count'] for doc in stats)} review analyses)")
+            return
+        # $out swaps the collection in atomically; increments made while the pass runs can be lost, so run it when quiet
+        await db.review_analyses.aggregate(pipeline).to_list(None)
+        destinations = await db[STATS_COLLECTION].count_documents({})
+        print(f"Rebuilt {STATS_COLLECTION} for {destinations} destinations")
+    finally:
+        client.close()
+
+
+COMMANDS: Dict[str, Callable] = {
+    "compress-itineraries": compress_itineraries,
+    "decompress-itineraries": decompress_itineraries,
+    "rebuild-review-stats": rebuild_review_stats,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument("--codec", default="zlib", choices=["zlib", "zstd"])
+    parser.add_argument("--min-bytes", type=int, default=1024, help="Leave smaller itineraries uncompressed")
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(COMMANDS[args.command](args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Lightweight in-process metrics for the WanderWise AI backend"""
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Dict
+
+
+class LatencyTracker:
+    """Rolling window of call latencies with percentile reporting"""
+
+    def __init__(self, name: str, window: int = 500):
+        self.name = name
+        self.samples = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.cancelled = 0  # abandoned calls (lost hedge races, caller timeouts); no latency sample
+
+    def record(self, seconds: float) -> None:
+        self.calls += 1
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+        return ordered[index]
+
+    @asynccontextmanager
+    async def time(self):
+        """Time an awaited block, counting timeouts and errors separately"""
+        started = time.perf_counter()
+        try:
+            yield
+        except TimeoutError:
+            self.timeouts += 1
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.record(time.perf_counter() - started)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "p50_ms": round(self.percentile(50) * 1000, 1),
+            "p95_ms": round(self.percentile(95) * 1000, 1),
+            "max_ms": round(max(self.samples, default=0.0) * 1000, 1),
+        }
+
+
+_trackers: Dict[str, LatencyTracker] = {}
+
+
+def tracker(name: str) -> LatencyTracker:
+    """Get or create the named latency tracker"""
+    if name not in _trackers:
+        _trackers[name] = LatencyTracker(name)
+    return _trackers[name]
+
+
+def latency_snapshot() -> Dict[str, Any]:
+    return {name: t.snapshot() for name, t in sorted(_trackers.items())}
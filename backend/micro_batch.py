@@ -0,0 +1,102 @@
+"""Dynamic micro-batching: concurrent callers' items are collected briefly and processed together"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from metrics import LatencyTracker
+
+# Upper bounds of the batch-size histogram buckets
+HISTOGRAM_BOUNDS = (1, 2, 4, 8, 16, 32, 64)
+
+
+class MicroBatcher:
+    """Collect submitted items for up to window_ms (or until max_batch_size) and run them as one batch.
+
+    process_batch receives the items in submission order and must return one result per item;
+    each caller's future gets its own result, and an exception from the batch is raised to every caller.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        process_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+        window_ms: float = 10.0,
+        max_batch_size: int = 16
+    ):
+        self.name = name
+        self.process_batch = process_batch
+        self.window = max(0.0, window_ms) / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self._pending: List[Tuple[Any, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self.batches = 0
+        self.items = 0
+        self.sizes: Dict[str, int] = {f"<={bound}": 0 for bound in HISTOGRAM_BOUNDS}
+        self.sizes[f">{HISTOGRAM_BOUNDS[-1]}"] = 0
+        self.queue_delay = LatencyTracker(f"{name}_queue_delay")
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        # Callers that gave up (timeout/cancel) while queued are dropped from the batch
+        live = [entry for entry in self._pending if not entry[1].done()]
+        batch, rest = live[:self.max_batch_size], live[self.max_batch_size:]
+        self._pending = rest
+        if rest:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        if not batch:
+            return
+
+        dispatched = time.perf_counter()
+        for _, _, enqueued in batch:
+            self.queue_delay.record(dispatched - enqueued)
+        self.batches += 1
+        self.items += len(batch)
+        bucket = next((f"<={bound}" for bound in HISTOGRAM_BOUNDS if len(batch) <= bound), f">{HISTOGRAM_BOUNDS[-1]}")
+        self.sizes[bucket] += 1
+
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future, float]]) -> None:
+        try:
+            results = await self.process_batch([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"{self.name} batch returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            logging.warning(f"{self.name} batch of {len(batch)} failed: {str(e)}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": round(self.window * 1000, 1),
+            "max_batch_size": self.max_batch_size,
+            "batches": self.batches,
+            "items": self.items,
+            "queued": len(self._pending),
+            "average_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "batch_size_histogram": dict(self.sizes),
+            "queue_delay": self.queue_delay.snapshot(),
+        }
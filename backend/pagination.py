@@ -0,0 +1,44 @@
+"""Keyset (cursor) pagination on (created_at, id), newest first"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# Sort order the keyset filter below assumes; the backing index must match it
+KEYSET_SORT = [("created_at", -1), ("id", -1)]
+
+
+def encode_cursor(doc: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just past doc"""
+    payload = json.dumps({"c": doc["created_at"].isoformat(), "i": doc["id"]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(payload["c"]), str(payload["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_filter(query: Dict[str, Any], cursor: Optional[str]) -> Dict[str, Any]:
+    """Restrict query to documents that sort after cursor"""
+    if not cursor:
+        return query
+    created_at, last_id = decode_cursor(cursor)
+    return {
+        **query,
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "id": {"$lt": last_id}},
+        ],
+    }
+
+
+def split_page(docs: List[Dict[str, Any]], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Given up to limit + 1 documents, return the page and the cursor for the next one (if any)"""
+    page = docs[:limit]
+    next_cursor = encode_cursor(page[-1]) if len(docs) > limit and page else None
+    return page, next_cursor
@@ -0,0 +1,99 @@
+"""Versioned password hashing with stdlib KDFs, run off the event loop"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple
+
+# Stored formats:
+#   scrypt$<n>$<r>$<p>$<salt>$<hash>
+#   pbkdf2_sha256$<iterations>$<salt>$<hash>
+#   <64 hex chars>                        legacy unsalted sha256, rehashed on next login
+SCHEMES = ("scrypt", "pbkdf2_sha256")
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+class PasswordHasher:
+    """Hashes with the configured scheme; verifies any supported format and flags outdated ones"""
+
+    def __init__(
+        self,
+        scheme: str = "scrypt",
+        workers: int = 4,
+        scrypt_n: int = 2 ** 14,
+        scrypt_r: int = 8,
+        scrypt_p: int = 1,
+        pbkdf2_iterations: int = 600_000
+    ):
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unsupported password scheme {scheme!r}, expected one of {SCHEMES}")
+        self.scheme = scheme
+        self.scrypt_params = (scrypt_n, scrypt_r, scrypt_p)
+        self.pbkdf2_iterations = pbkdf2_iterations
+        # hashlib's KDFs release the GIL, so a small thread pool keeps them off the event loop
+        self.workers = max(1, workers)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-kdf")
+        self.hashes = 0
+        self.verifications = 0
+        self.rehashes = 0
+
+    # Synchronous primitives (run in the executor)
+
+    def _scrypt(self, password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 2 ** 20, dklen=32)
+
+    def _pbkdf2(self, password: str, salt: bytes, iterations: int) -> bytes:
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations, dklen=32)
+
+    def hash_sync(self, password: str) -> str:
+        salt = secrets.token_bytes(16)
+        if self.scheme == "scrypt":
+            n, r, p = self.scrypt_params
+            return f"scrypt${n}${r}${p}${_b64(salt)}${_b64(self._scrypt(password, salt, n, r, p))}"
+        return f"pbkdf2_sha256${self.pbkdf2_iterations}${_b64(salt)}${_b64(self._pbkdf2(password, salt, self.pbkdf2_iterations))}"
+
+    def verify_sync(self, password: str, stored: str) -> Tuple[bool, bool]:
+        """(matches, needs_rehash) for a stored hash in any supported format"""
+        parts = stored.split("$")
+        try:
+            if parts[0] == "scrypt" and len(parts) == 6:
+                n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+                ok = hmac.compare_digest(self._scrypt(password, _unb64(parts[4]), n, r, p), _unb64(parts[5]))
+                return ok, self.scheme != "scrypt" or (n, r, p) != self.scrypt_params
+            if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+                iterations = int(parts[1])
+                ok = hmac.compare_digest(self._pbkdf2(password, _unb64(parts[2]), iterations), _unb64(parts[3]))
+                return ok, self.scheme != "pbkdf2_sha256" or iterations != self.pbkdf2_iterations
+        except (ValueError, TypeError):
+            return False, False
+        if len(parts) == 1 and len(stored) == 64:
+            return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored), True
+        return False, False
+
+    # Async API
+
+    async def hash(self, password: str) -> str:
+        self.hashes += 1
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self.hash_sync, password)
+
+    async def verify(self, password: str, stored: str) -> Tuple[bool, bool]:
+        self.verifications += 1
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self.verify_sync, password, stored)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "scheme": self.scheme,
+            "workers": self.workers,
+            "hashes": self.hashes,
+            "verifications": self.verifications,
+            "rehashes": self.rehashes,
+        }
@@ -0,0 +1,120 @@
+"""Circuit breakers and hedged requests for LLM providers"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open trial -> closed"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.trips = 0
+        self.short_circuits = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        self.short_circuits += 1
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """A half-open trial ended without a verdict (e.g. cancelled)"""
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.trial_in_flight or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self.trial_in_flight:
+                self.trips += 1
+            self.opened_at = time.monotonic()
+        self.trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trips": self.trips,
+            "short_circuits": self.short_circuits,
+        }
+
+
+class HedgeStats:
+    def __init__(self):
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.primary_wins_after_hedge = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "primary_wins_after_hedge": self.primary_wins_after_hedge,
+            "hedge_win_rate": round(self.hedge_wins / self.hedged, 3) if self.hedged else 0.0,
+        }
+
+
+async def run_hedged(
+    primary: Callable[[], Awaitable[Any]],
+    hedge: Optional[Callable[[], Awaitable[Any]]],
+    hedge_delay: float,
+    stats: HedgeStats
+) -> Tuple[Any, str]:
+    """Run primary; if it hasn't finished after hedge_delay, race it against hedge.
+
+    Returns (result, "primary" | "hedge"). The loser is cancelled. If both fail, the
+    primary's error is raised.
+    """
+    stats.calls += 1
+    primary_task = asyncio.ensure_future(primary())
+    hedge_task = None
+    try:
+        done, _ = await asyncio.wait({primary_task}, timeout=hedge_delay)
+        if done or hedge is None:
+            return await primary_task, "primary"
+
+        stats.hedged += 1
+        hedge_task = asyncio.ensure_future(hedge())
+        pending = {primary_task, hedge_task}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge_task:
+                        stats.hedge_wins += 1
+                        return task.result(), "hedge"
+                    stats.primary_wins_after_hedge += 1
+                    return task.result(), "primary"
+        raise primary_task.exception()
+    finally:
+        for task in (primary_task, hedge_task):
+            if task is not None and not task.done():
+                task.cancel()
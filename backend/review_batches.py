@@ -0,0 +1,57 @@
+"""Multi-review sentiment prompts: packing reviews into batches and mapping replies back by index"""
+import json
+from typing import Any, Dict, List, Optional
+
+
+def pack_review_batches(items: List[tuple], max_reviews: int, max_chars: int) -> List[List[tuple]]:
+    """Group (index, text) pairs into prompt-sized batches by review count and total characters"""
+    batches: List[List[tuple]] = []
+    current: List[tuple] = []
+    size = 0
+    for item in items:
+        if current and (len(current) >= max_reviews or size + len(item[1]) > max_chars):
+            batches.append(current)
+            current, size = [], 0
+        current.append(item)
+        size += len(item[1])
+    if current:
+        batches.append(current)
+    return batches
+
+
+def batch_prompt(texts: List[str]) -> str:
+    numbered = json.dumps([{"index": i, "review": text} for i, text in enumerate(texts)], ensure_ascii=False)
+    return f"""
+    Analyze each of these travel reviews for sentiment, safety, and cleanliness insights:
+
+    Reviews: {numbered}
+
+    Respond with only a JSON array containing one object per review, each with:
+    1. index: the review's index from the input
+    2. overall_sentiment: "positive", "negative", or "neutral"
+    3. sentiment_confidence: 0-1 confidence score
+    4. safety_score: 0-10 (how safe the place seems)
+    5. cleanliness_score: 0-10 (how clean the place seems)
+    6. key_insights: List of important points mentioned
+    7. safety_mentions: Specific safety-related comments
+    8. cleanliness_mentions: Specific cleanliness-related comments
+    9. recommendation: Overall recommendation based on analysis
+    """
+
+
+def map_batch_results(parsed: Any, count: int) -> List[Optional[Dict[str, Any]]]:
+    """Analyses from a batch reply in input order; entries the reply lacks (or repeats) are None"""
+    results: List[Optional[Dict[str, Any]]] = [None] * count
+    if not isinstance(parsed, list):
+        return results
+
+    for position, item in enumerate(parsed):
+        if not isinstance(item, dict):
+            continue
+        index = item.get("index")
+        if not isinstance(index, int) or isinstance(index, bool):
+            # Without an index only a complete, in-order reply can be mapped back
+            index = position if len(parsed) == count else None
+        if index is not None and 0 <= index < count and results[index] is None:
+            results[index] = {key: value for key, value in item.items() if key != "index"}
+    return results
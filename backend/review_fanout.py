@@ -0,0 +1,39 @@
+"""Concurrent per-review analysis, with follow-up work started before the slowest review finishes"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+Analysis = Dict[str, Any]
+
+
+async def analyze_reviews_concurrently(
+    reviews: List[str],
+    analyze: Callable[[int, str], Awaitable[Tuple[int, Analysis]]],
+    early_threshold: int = 0,
+    on_early: Optional[Callable[[List[Analysis]], Awaitable[Any]]] = None
+) -> Tuple[List[Analysis], Optional["asyncio.Task"]]:
+    """Run analyze(index, review) for every review at once and return the analyses in review order.
+
+    Once early_threshold analyses are in, on_early(analyses so far) starts as a task that overlaps
+    the rest; it is returned alongside the results (None if on_early was not given). If an analysis
+    raises, the others and the early task are cancelled.
+    """
+    results: List[Optional[Analysis]] = [None] * len(reviews)
+    tasks = [asyncio.create_task(analyze(i, review)) for i, review in enumerate(reviews)]
+    early_task = None
+    completed = 0
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, analysis = await next_done
+            results[index] = analysis
+            completed += 1
+            if on_early is not None and early_task is None and completed >= early_threshold:
+                early_task = asyncio.create_task(on_early([a for a in results if a is not None]))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        if early_task is not None:
+            early_task.cancel()
+        raise
+
+    return results, early_task
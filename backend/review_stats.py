@@ -0,0 +1,116 @@
+"""Per-destination review aggregates, maintained with $inc as review analyses are stored"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+SENTIMENTS = ("positive", "neutral", "negative")
+STATS_COLLECTION = "destination_review_stats"
+
+
+def sentiment_of(record: Dict[str, Any]) -> str:
+    sentiment = record.get("overall_sentiment")
+    return sentiment if sentiment in SENTIMENTS else "neutral"
+
+
+def stats_increment(records: Iterable[Dict[str, Any]]) -> Dict[str, float]:
+    """$inc document adding review analysis records to a destination's running totals"""
+    increment = {"review_count": 0, "safety_total": 0.0, "cleanliness_total": 0.0}
+    for record in records:
+        increment["review_count"] += 1
+        increment["safety_total"] += float(record.get("safety_score", 5.0))
+        increment["cleanliness_total"] += float(record.get("cleanliness_score", 5.0))
+        key = f"sentiment.{sentiment_of(record)}"
+        increment[key] = increment.get(key, 0) + 1
+    return increment
+
+
+def aggregates_from_stats(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """The /destination-reviews aggregated_scores shape, from a stats document"""
+    count = max(doc.get("review_count", 0), 1)
+    distribution = {sentiment: int(doc.get("sentiment", {}).get(sentiment, 0)) for sentiment in SENTIMENTS}
+    return {
+        "average_safety": round(doc.get("safety_total", 0.0) / count, 1),
+        "average_cleanliness": round(doc.get("cleanliness_total", 0.0) / count, 1),
+        "sentiment_distribution": distribution,
+        "dominant_sentiment": max(distribution, key=distribution.get)
+    }
+
+
+def rebuild_pipeline(target: str = STATS_COLLECTION) -> List[Dict[str, Any]]:
+    """One aggregation pass over review_analyses that replaces the stats collection"""
+    def count_of(sentiment: str) -> Dict[str, Any]:
+        return {"$sum": {"$cond": [{"$eq": ["$overall_sentiment", sentiment]}, 1, 0]}}
+
+    return [
+        {"$match": {"destination": {"$type": "string"}}},
+        {"$group": {
+            "_id": "$destination",
+            "review_count": {"$sum": 1},
+            "safety_total": {"$sum": {"$ifNull": ["$safety_score", 5.0]}},
+            "cleanliness_total": {"$sum": {"$ifNull": ["$cleanliness_score", 5.0]}},
+            "positive": count_of("positive"),
+            "negative": count_of("negative"),
+            "updated_at": {"$max": "$created_at"},
+        }},
+        {"$project": {
+            "review_count": 1,
+            "safety_total": 1,
+            "cleanliness_total": 1,
+            "updated_at": 1,
+            # Anything that is not positive/negative counts as neutral, as in stats_increment
+            "sentiment": {
+                "positive": "$positive",
+                "negative": "$negative",
+                "neutral": {"$subtract": ["$review_count", {"$add": ["$positive", "$negative"]}]},
+            },
+            "seeded": {"$literal": True},
+        }},
+        {"$out": target},
+    ]
+
+
+class ReviewStatsStore:
+    """Reads and increments destination_review_stats documents (_id is the canonical destination)"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def record(self, destination: Optional[str], records: List[Dict[str, Any]]) -> None:
+        """Add stored analyses to a destination's totals in one atomic upsert"""
+        if not destination or not records:
+            return
+        await self.collection.update_one(
+            {"_id": destination},
+            {"$inc": stats_increment(records), "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+
+    async def get(self, destination: Optional[str]) -> Optional[Dict[str, Any]]:
+        """(review_count, aggregated_scores) as a dict, or None if nothing is recorded yet"""
+        if not destination:
+            return None
+        doc = await self.collection.find_one({"_id": destination})
+        if not doc or not doc.get("review_count"):
+            return None
+        return {"review_count": int(doc["review_count"]), "aggregated_scores": aggregates_from_stats(doc)}
+
+    async def claim_seed(self, destination: str) -> bool:
+        """True for exactly one caller per destination, so concurrent requests seed sample reviews once"""
+        try:
+            await self.collection.update_one(
+                {"_id": destination, "seeded": {"$ne": True}},
+                {"$set": {"seeded": True}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def release_seed(self, destination: str) -> None:
+        """Give up a seed claim whose analyses could not be stored, so a later request can retry"""
+        try:
+            await self.collection.delete_one({"_id": destination, "review_count": {"$exists": False}})
+        except Exception as e:
+            logging.warning(f"Releasing the review seed claim for {destination} failed: {str(e)}")
@@ -0,0 +1,87 @@
+"""Request parsing and storage for saved itineraries"""
+import uuid
+from datetime import datetime
+from typing import Any, Dict
+
+import orjson
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, Field, ValidationError
+
+from serialization import to_document
+from storage_codec import ItineraryCodec
+
+
+class SavedItinerary(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    title: str
+    destination: Dict[str, Any]
+    itinerary_data: Dict[str, Any]
+    travel_dates: Dict[str, Any]
+    preferences: Dict[str, Any]
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class SaveItineraryRequest(BaseModel):
+    title: str = Field(..., min_length=1, max_length=200)
+    destination: Dict[str, Any]
+    itinerary_data: Dict[str, Any]
+    travel_dates: Dict[str, Any]
+    preferences: Dict[str, Any]
+
+
+async def read_json_body(request: Request, max_bytes: int) -> Any:
+    """Read a JSON request body incrementally, rejecting it as soon as it exceeds max_bytes"""
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Request body exceeds {max_bytes} bytes")
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Request body exceeds {max_bytes} bytes")
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Request body is not valid JSON")
+
+
+def parse_save_request(data: Any) -> SaveItineraryRequest:
+    """Validate a decoded body, turning validation failures into the 422 FastAPI itself would send"""
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=422, detail="Request body must be a JSON object")
+    try:
+        return SaveItineraryRequest(**data)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+
+
+def parse_legacy_save_request(
+    title: str, destination: str, itinerary_data: str, travel_dates: str, preferences: str
+) -> SaveItineraryRequest:
+    """Build a request from the legacy query-string form, where each object is a JSON string"""
+    fields = {
+        "destination": destination,
+        "itinerary_data": itinerary_data,
+        "travel_dates": travel_dates,
+        "preferences": preferences
+    }
+    data: Dict[str, Any] = {"title": title}
+    for name, raw in fields.items():
+        try:
+            data[name] = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            raise HTTPException(status_code=400, detail=f"{name} is not valid JSON")
+    return parse_save_request(data)
+
+
+async def store_itinerary(collection, codec: ItineraryCodec, user_id: str, payload: SaveItineraryRequest) -> Dict[str, Any]:
+    saved_itinerary = SavedItinerary(user_id=user_id, **to_document(payload))
+    await collection.insert_one(codec.encode(to_document(saved_itinerary)))
+    return {
+        "success": True,
+        "itinerary_id": saved_itinerary.id,
+        "message": "Itinerary saved successfully!"
+    }
@@ -0,0 +1,83 @@
+"""Content-addressed cache for review sentiment analyses"""
+import hashlib
+import logging
+import re
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+
+
+def normalize_review_text(review_text: str) -> str:
+    """Collapse whitespace and case so trivially different texts share a key"""
+    return re.sub(r"\s+", " ", review_text).strip().lower()
+
+
+class SentimentCache:
+    """Two-tier cache: in-process LRU (with TTL) in front of a Mongo collection"""
+
+    def __init__(self, collection, prompt_version: str, maxsize: int = 2048, ttl_seconds: int = 30 * 24 * 3600):
+        self.collection = collection
+        self.prompt_version = prompt_version
+        self.ttl_seconds = ttl_seconds
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self.memory_hits = 0
+        self.mongo_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def key_for(self, review_text: str) -> str:
+        payload = f"{self.prompt_version}\n{normalize_review_text(review_text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, review_text: str) -> Optional[Dict[str, Any]]:
+        key = self.key_for(review_text)
+        cached = self.memory.get(key)
+        if cached is not None:
+            self.memory_hits += 1
+            return dict(cached)
+
+        try:
+            doc = await self.collection.find_one({"key": key}, {"_id": 0, "analysis": 1})
+        except Exception as e:
+            logging.warning(f"Sentiment cache lookup failed: {str(e)}")
+            doc = None
+
+        if doc:
+            self.mongo_hits += 1
+            self.memory[key] = doc["analysis"]
+            return dict(doc["analysis"])
+
+        self.misses += 1
+        return None
+
+    async def put(self, review_text: str, analysis: Dict[str, Any]) -> None:
+        key = self.key_for(review_text)
+        self.memory[key] = analysis
+        try:
+            await self.collection.update_one(
+                {"key": key},
+                {"$setOnInsert": {
+                    "key": key,
+                    "prompt_version": self.prompt_version,
+                    "analysis": analysis,
+                    "created_at": datetime.utcnow()
+                }},
+                upsert=True
+            )
+            self.writes += 1
+        except Exception as e:
+            logging.warning(f"Sentiment cache write failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.mongo_hits
+        lookups = hits + self.misses
+        return {
+            "prompt_version": self.prompt_version,
+            "memory_hits": self.memory_hits,
+            "mongo_hits": self.mongo_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "memory_entries": len(self.memory),
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
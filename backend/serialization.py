@@ -0,0 +1,55 @@
+"""Fast JSON responses and lean model-to-document conversion"""
+from decimal import Decimal
+from typing import Any, Dict
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+# Naive datetimes in this app (and everything read back from Mongo) are UTC, so say so on the wire
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson does not handle natively"""
+    if isinstance(obj, BaseModel):
+        return to_document(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if type(obj).__name__ == "ObjectId":
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+def dumps_str(content: Any) -> str:
+    return dumps(content).decode()
+
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson-rendered response; datetimes as RFC 3339 (UTC), UUIDs as strings"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def to_document(model: BaseModel) -> Dict[str, Any]:
+    """Shallow field dict for inserting a model into Mongo.
+
+    Unlike .dict()/.model_dump(), nested dict/list values (e.g. a whole itinerary) are reused
+    rather than deep-copied; nested models are converted recursively.
+    """
+    document = {}
+    for name, value in model.__dict__.items():
+        if isinstance(value, BaseModel):
+            value = to_document(value)
+        elif isinstance(value, list) and value and isinstance(value[0], BaseModel):
+            value = [to_document(item) for item in value]
+        document[name] = value
+    return document
+
@@ -1,21 +1,48 @@
-from fastapi import FastAPI, APIRouter, HTTPException, status
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Request, status
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, validator
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 import uuid
 from datetime import datetime, timedelta
-from emergentintegrations.llm.chat import LlmChat, UserMessage
+from emergentintegrations.llm.chat import UserMessage
 import asyncio
 import json
 import re
-import hashlib
 import secrets
-from typing import Optional
+import time
+from metrics import tracker, latency_snapshot
+from sentiment_cache import SentimentCache
+from db_indexes import index_registry, ensure_indexes
+from session_cache import AuthenticatedSession, SessionCache, SessionError
+from passwords import PasswordHasher
+from pagination import KEYSET_SORT, keyset_filter, split_page
+from storage_codec import ItineraryCodec
+from saved_itineraries import parse_legacy_save_request, parse_save_request, read_json_body, store_itinerary
+from serialization import FastJSONResponse, dumps_str, to_document
+from destinations import canonical_destination, destination_matcher
+from cost_engine import CostEngine
+from exchange_rates import ExchangeRateService, UnsupportedCurrency, rate_source_from_config
+from review_stats import ReviewStatsStore
+from insight_rollups import InsightRollups, vibe_key
+from heavy_hitters import TrendingTracker
+from local_sentiment import LexiconSentimentScorer
+from review_batches import batch_prompt, map_batch_results, pack_review_batches
+from review_fanout import analyze_reviews_concurrently
+from micro_batch import MicroBatcher
+from vibe_cache import SemanticVibeCache
+from incremental_json import IncrementalJSONParser
+from itinerary_engine import generate_days_in_chunks
+from json_extract import extract_json
+from single_flight import SingleFlight
+from resilience import CircuitBreaker, CircuitOpenError, HedgeStats, run_hedged
+from llm_client import ChatFactory, prompt_fingerprint, configure_shared_http_client, close_shared_http_client
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -29,7 +56,8 @@ db = client[os.environ['DB_NAME']]
 app = FastAPI(
     title="WanderWise AI - Travel Platform",
     description="AI-powered travel platform for personalized experiences",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Create a router with the /api prefix
@@ -38,26 +66,259 @@ api_router = APIRouter(prefix="/api")
 # Initialize AI models
 EMERGENT_LLM_KEY = os.environ.get('EMERGENT_LLM_KEY')
 
+# Each request gets its own history-free chat handle from these factories
 # OpenAI for NLP and personalization
-openai_chat = LlmChat(
+openai_chat = ChatFactory(
+    label="openai-travel",
     api_key=EMERGENT_LLM_KEY,
-    session_id="openai-travel-session",
-    system_message="You are WanderWise AI, an expert travel advisor specializing in personalized travel recommendations based on user preferences and vibes."
-).with_model("openai", "gpt-4o")
+    system_message="You are WanderWise AI, an expert travel advisor specializing in personalized travel recommendations based on user preferences and vibes.",
+    provider="openai",
+    model="gpt-4o"
+)
 
 # Anthropic for travel recommendations
-claude_chat = LlmChat(
-    api_key=EMERGENT_LLM_KEY,  
-    session_id="claude-travel-session",
-    system_message="You are Claude, a sophisticated travel expert who creates detailed, personalized itineraries and provides comprehensive travel insights."
-).with_model("anthropic", "claude-3-7-sonnet-20250219")
+claude_chat = ChatFactory(
+    label="claude-travel",
+    api_key=EMERGENT_LLM_KEY,
+    system_message="You are Claude, a sophisticated travel expert who creates detailed, personalized itineraries and provides comprehensive travel insights.",
+    provider="anthropic",
+    model="claude-3-7-sonnet-20250219"
+)
+
+# Slow primary calls are hedged with a faster model from the other provider/tier
+openai_chat.hedge = ChatFactory(
+    label="openai-travel-hedge",
+    api_key=EMERGENT_LLM_KEY,
+    system_message=openai_chat.system_message,
+    provider="openai",
+    model="gpt-4o-mini"
+)
+claude_chat.hedge = ChatFactory(
+    label="claude-travel-hedge",
+    api_key=EMERGENT_LLM_KEY,
+    system_message=claude_chat.system_message,
+    provider="openai",
+    model="gpt-4o-mini"
+)
 
 # Sentiment analysis (simulated with OpenAI for now)
-sentiment_chat = LlmChat(
+sentiment_chat = ChatFactory(
+    label="sentiment",
     api_key=EMERGENT_LLM_KEY,
-    session_id="sentiment-session", 
-    system_message="You are a sentiment analysis expert specializing in travel reviews. Analyze sentiment, safety, and cleanliness insights from travel reviews."
-).with_model("openai", "gpt-4o-mini")
+    system_message="You are a sentiment analysis expert specializing in travel reviews. Analyze sentiment, safety, and cleanliness insights from travel reviews.",
+    provider="openai",
+    model="gpt-4o-mini"
+)
+
+# Identical prompts in flight at the same time share one LLM call
+llm_singleflight = SingleFlight()
+
+# Hedging and per-provider circuit breakers
+LLM_HEDGING_ENABLED = os.environ.get('LLM_HEDGING_ENABLED', 'true').lower() == 'true'
+LLM_HEDGE_PERCENTILE = float(os.environ.get('LLM_HEDGE_PERCENTILE', '90'))
+LLM_HEDGE_MIN_SAMPLES = int(os.environ.get('LLM_HEDGE_MIN_SAMPLES', '20'))
+LLM_HEDGE_DEFAULT_DELAY = float(os.environ.get('LLM_HEDGE_DEFAULT_DELAY', '8'))
+LLM_HEDGE_MIN_DELAY = float(os.environ.get('LLM_HEDGE_MIN_DELAY', '1'))
+LLM_BREAKER_FAILURES = int(os.environ.get('LLM_BREAKER_FAILURES', '5'))
+LLM_BREAKER_RESET_SECONDS = float(os.environ.get('LLM_BREAKER_RESET_SECONDS', '30'))
+llm_breakers: Dict[str, CircuitBreaker] = {}
+llm_hedge_stats: Dict[str, HedgeStats] = {}
+
+def provider_breaker(provider: str) -> CircuitBreaker:
+    if provider not in llm_breakers:
+        llm_breakers[provider] = CircuitBreaker(provider, LLM_BREAKER_FAILURES, LLM_BREAKER_RESET_SECONDS)
+    return llm_breakers[provider]
+
+def hedge_delay_for(chat_factory: ChatFactory) -> float:
+    """Observed latency percentile of the model, or a default until enough samples exist"""
+    latency = tracker(f"llm:{chat_factory.model_label}")
+    if len(latency.samples) < LLM_HEDGE_MIN_SAMPLES:
+        return LLM_HEDGE_DEFAULT_DELAY
+    return max(LLM_HEDGE_MIN_DELAY, latency.percentile(LLM_HEDGE_PERCENTILE))
+
+async def call_model(chat_factory: ChatFactory, prompt: str) -> str:
+    """Single model call with circuit-breaker accounting and latency tracking"""
+    breaker = provider_breaker(chat_factory.provider)
+    if not breaker.allow():
+        raise CircuitOpenError(f"{chat_factory.provider} circuit is open")
+
+    latency = tracker(f"llm:{chat_factory.model_label}")
+    started = time.perf_counter()
+    try:
+        response = await chat_factory.acquire().send_message(UserMessage(text=prompt))
+    except asyncio.CancelledError:
+        # Lost a hedge race or hit the caller's timeout. The elapsed time says nothing about the
+        # model's latency and would skew the hedge delay, so it is counted but not sampled
+        latency.cancelled += 1
+        breaker.release_trial()
+        raise
+    except Exception:
+        latency.errors += 1
+        breaker.record_failure()
+        raise
+
+    latency.record(time.perf_counter() - started)
+    breaker.record_success()
+    return str(response)
+
+async def send_prompt(chat_factory: ChatFactory, prompt: str, timeout: Optional[float] = None) -> str:
+    """Send a prompt on a fresh chat handle, coalescing with identical in-flight prompts.
+
+    Slow calls are hedged to chat_factory.hedge after the model's observed p90; raises
+    CircuitOpenError without calling the model while its provider's circuit is open.
+    """
+    async def call():
+        hedge = chat_factory.hedge if LLM_HEDGING_ENABLED else None
+        hedged = run_hedged(
+            lambda: call_model(chat_factory, prompt),
+            (lambda: call_model(hedge, prompt)) if hedge else None,
+            hedge_delay_for(chat_factory),
+            llm_hedge_stats.setdefault(chat_factory.model_label, HedgeStats())
+        )
+        try:
+            response_text, _ = await (asyncio.wait_for(hedged, timeout=timeout) if timeout else hedged)
+        except asyncio.TimeoutError:
+            provider_breaker(chat_factory.provider).record_failure()
+            raise
+        return response_text
+
+    return await llm_singleflight.do(prompt_fingerprint(chat_factory.model_label, prompt), call)
+
+async def stream_prompt(chat_factory: ChatFactory, prompt: str):
+    """Yield response text chunks as the model produces them"""
+    if not chat_factory.supports_streaming:
+        # Client without a streaming API: the whole response arrives as one chunk
+        yield await call_model(chat_factory, prompt)
+        return
+
+    breaker = provider_breaker(chat_factory.provider)
+    if not breaker.allow():
+        raise CircuitOpenError(f"{chat_factory.provider} circuit is open")
+    try:
+        async for chunk in chat_factory.acquire().stream_message(UserMessage(text=prompt)):
+            yield str(chunk)
+    except (asyncio.CancelledError, GeneratorExit):
+        breaker.release_trial()
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+
+# Review analysis fan-out settings
+REVIEW_ANALYSIS_CONCURRENCY = int(os.environ.get('REVIEW_ANALYSIS_CONCURRENCY', '4'))
+REVIEW_ANALYSIS_TIMEOUT = float(os.environ.get('REVIEW_ANALYSIS_TIMEOUT', '12'))
+REVIEW_SUMMARY_MODE = os.environ.get('REVIEW_SUMMARY_MODE', 'llm')  # "llm" or "deterministic"
+REVIEW_SUMMARY_MIN_SCORES = int(os.environ.get('REVIEW_SUMMARY_MIN_SCORES', '3'))
+REVIEW_SUMMARY_TIMEOUT = float(os.environ.get('REVIEW_SUMMARY_TIMEOUT', '10'))
+review_analysis_semaphore = asyncio.Semaphore(REVIEW_ANALYSIS_CONCURRENCY)
+
+# /itineraries/my pages through summaries; the full itinerary_data comes from /itineraries/{id}
+ITINERARY_PAGE_SIZE = int(os.environ.get('ITINERARY_PAGE_SIZE', '20'))
+ITINERARY_PAGE_SIZE_MAX = int(os.environ.get('ITINERARY_PAGE_SIZE_MAX', '100'))
+SAVED_ITINERARY_SUMMARY_FIELDS = {
+    "_id": 0, "id": 1, "title": 1, "destination": 1, "travel_dates": 1,
+    "preferences": 1, "created_at": 1, "updated_at": 1
+}
+
+# POST /itineraries bodies larger than this are rejected while streaming in
+SAVE_ITINERARY_MAX_BYTES = int(os.environ.get('SAVE_ITINERARY_MAX_BYTES', str(2 * 1024 * 1024)))
+
+# Large itinerary_data payloads can be stored compressed ("zlib" or "zstd"); "none" stores plain documents
+itinerary_codec = ItineraryCodec(
+    codec=os.environ.get('SAVED_ITINERARY_CODEC', 'none'),
+    min_size=int(os.environ.get('SAVED_ITINERARY_CODEC_MIN_BYTES', '1024'))
+)
+
+# Bulk /analyze-reviews packs reviews into multi-review prompts bounded by count and size
+REVIEW_BATCH_MAX_REVIEWS = int(os.environ.get('REVIEW_BATCH_MAX_REVIEWS', '5000'))
+REVIEW_BATCH_PROMPT_REVIEWS = int(os.environ.get('REVIEW_BATCH_PROMPT_REVIEWS', '25'))
+REVIEW_BATCH_PROMPT_CHARS = int(os.environ.get('REVIEW_BATCH_PROMPT_CHARS', '12000'))
+REVIEW_BATCH_CONCURRENCY = int(os.environ.get('REVIEW_BATCH_CONCURRENCY', '4'))
+REVIEW_BATCH_TIMEOUT = float(os.environ.get('REVIEW_BATCH_TIMEOUT', '45'))
+
+# Trips longer than ITINERARY_CHUNK_DAYS are generated as a skeleton plus concurrent day ranges;
+# ITINERARY_MAX_DAYS bounds how many chunk calls a single request can fan out to
+ITINERARY_CHUNK_DAYS = int(os.environ.get('ITINERARY_CHUNK_DAYS', '4'))
+ITINERARY_MAX_DAYS = int(os.environ.get('ITINERARY_MAX_DAYS', '60'))
+ITINERARY_CHUNK_CONCURRENCY = int(os.environ.get('ITINERARY_CHUNK_CONCURRENCY', '4'))
+ITINERARY_CHUNK_RETRIES = int(os.environ.get('ITINERARY_CHUNK_RETRIES', '1'))
+ITINERARY_CHUNK_TIMEOUT = float(os.environ.get('ITINERARY_CHUNK_TIMEOUT', '20'))
+
+# Bump when the sentiment prompt changes so stale cached analyses are ignored
+SENTIMENT_PROMPT_VERSION = "v1"
+sentiment_cache = SentimentCache(
+    db.review_sentiment_cache,
+    prompt_version=SENTIMENT_PROMPT_VERSION,
+    maxsize=int(os.environ.get('SENTIMENT_CACHE_SIZE', '2048')),
+    ttl_seconds=int(os.environ.get('SENTIMENT_CACHE_TTL', str(30 * 24 * 3600)))
+)
+
+# Authenticated sessions are resolved from memory; invalid tokens are remembered briefly too
+session_cache = SessionCache(
+    db.sessions,
+    db.users,
+    maxsize=int(os.environ.get('SESSION_CACHE_SIZE', '10000')),
+    ttl_seconds=int(os.environ.get('SESSION_CACHE_TTL', '300')),
+    negative_ttl_seconds=int(os.environ.get('SESSION_NEGATIVE_CACHE_TTL', '60'))
+)
+
+# Running review totals per canonical destination, incremented whenever analyses are stored
+review_stats = ReviewStatsStore(db.destination_review_stats)
+
+# Hourly/daily rollups behind /travel-insights, incremented on every review, recommendation and vibe write
+insight_rollups = InsightRollups(db.insight_rollups, db.insight_vibes)
+
+async def update_rollups(update: Awaitable) -> None:
+    """Apply a rollup increment without failing the request that triggered it"""
+    try:
+        await update
+    except Exception as e:
+        logging.warning(f"Updating insight rollups failed: {str(e)}")
+
+# Trending vibes and destinations: bounded top-k counters in memory, halved every half-life and checkpointed to Mongo
+TRENDING_LIMIT = int(os.environ.get('TRENDING_LIMIT', '10'))
+trending = TrendingTracker(
+    db.trending_checkpoints,
+    ("vibes", "destinations"),
+    capacity=int(os.environ.get('TRENDING_CAPACITY', '256')),
+    half_life_seconds=float(os.environ.get('TRENDING_HALF_LIFE_SECONDS', str(24 * 3600))),
+    checkpoint_seconds=float(os.environ.get('TRENDING_CHECKPOINT_SECONDS', '60'))
+)
+
+def trending_snapshot(limit: int = TRENDING_LIMIT) -> Dict[str, Any]:
+    """Top vibes and destinations straight from the in-memory counters"""
+    destinations = trending.trending("destinations", limit)
+    for entry in destinations:
+        place = destination_matcher.places.get(entry["item"])
+        entry["name"] = place.name if place else entry["item"]
+    return {"vibes": trending.trending("vibes", limit), "destinations": destinations}
+
+# Reviews the lexicon scorer is confident about skip the LLM; set the threshold above 1 to always escalate
+LOCAL_SENTIMENT_THRESHOLD = float(os.environ.get('LOCAL_SENTIMENT_THRESHOLD', '0.75'))
+local_sentiment = LexiconSentimentScorer()
+sentiment_paths = {"local": 0, "escalated": 0}
+
+# Exchange rates come from "static" (built-in table), "file" or "http" and are refreshed in the background
+exchange_rates = ExchangeRateService(
+    rate_source_from_config(
+        os.environ.get('EXCHANGE_RATE_SOURCE', 'static'),
+        path=os.environ.get('EXCHANGE_RATE_FILE'),
+        url=os.environ.get('EXCHANGE_RATE_URL')
+    ),
+    refresh_seconds=float(os.environ.get('EXCHANGE_RATE_REFRESH_SECONDS', '3600'))
+)
+CURRENCY_BULK_MAX_AMOUNTS = int(os.environ.get('CURRENCY_BULK_MAX_AMOUNTS', '10000'))
+
+# Numeric trip costs from budget tiers and per-destination cost indexes (no LLM call)
+cost_engine = CostEngine()
+
+# Near-duplicate vibe queries are served from previously stored results
+vibe_cache = SemanticVibeCache(
+    threshold=float(os.environ.get('VIBE_CACHE_THRESHOLD', '0.82')),
+    max_entries=int(os.environ.get('VIBE_CACHE_SIZE', '2000')),
+    ttl_seconds=int(os.environ.get('VIBE_CACHE_TTL', str(7 * 24 * 3600)))
+)
 
 # Models
 class TravelPreferences(BaseModel):
@@ -65,7 +326,7 @@ class TravelPreferences(BaseModel):
     destination_type: str = Field(..., description="beach, mountain, city, cultural, adventure")
     budget_range: str = Field(..., description="budget, mid-range, luxury")
     travel_style: str = Field(..., description="relaxed, adventure, cultural, party, romantic")
-    duration: int = Field(..., description="Trip duration in days")
+    duration: int = Field(..., ge=1, le=ITINERARY_MAX_DAYS, description="Trip duration in days")
     activities: List[str] = Field(default=[], description="Preferred activities")
     vibe: str = Field(..., description="Desired travel vibe/mood")
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -86,14 +347,22 @@ class ReviewAnalysis(BaseModel):
     cleanliness_score: float = Field(..., ge=0, le=10) 
     sentiment_confidence: float = Field(..., ge=0, le=1)
     key_insights: List[str]
+    destination: Optional[str] = None  # canonical destination key, when the review is about a known place
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+class ReviewBatchRequest(BaseModel):
+    reviews: List[str]
+    destination: Optional[str] = None
+
 class VibeDestination(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     vibe_query: str
     matched_destinations: List[Dict[str, Any]]
     vibe_score: float = Field(..., ge=0, le=1)
     reasoning: str
+    preferences: Dict[str, Any] = Field(default_factory=dict)
+    fallback: bool = False
+    cache_hit: bool = False
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 class User(BaseModel):
@@ -108,20 +377,30 @@ class User(BaseModel):
     })
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
-class SavedItinerary(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    user_id: str
-    title: str
-    destination: Dict[str, Any]
-    itinerary_data: Dict[str, Any]
-    travel_dates: Dict[str, Any]
-    preferences: Dict[str, Any]
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+class CurrencyConversion(BaseModel):
+    amounts: List[float]
+    from_currency: str = "USD"
+    to_currency: str = "USD"
+
+class BulkCurrencyConversionRequest(BaseModel):
+    conversions: List[CurrencyConversion] = Field(..., min_length=1)
+
+class TripCostRequest(BaseModel):
+    destination: Optional[str] = None
+    budget_range: str = "mid-range"
+    duration: Optional[int] = Field(None, ge=1, le=365)
+    travelers: int = Field(1, ge=1, le=50)
+    currency: str = "USD"
+    itinerary: Optional[Dict[str, Any]] = None
 
 # AI Helper Functions
 async def analyze_travel_vibe(vibe_description: str, preferences: dict) -> Dict[str, Any]:
     """Analyze travel vibe and match with destinations"""
+    cached = vibe_cache.lookup(vibe_description, preferences)
+    if cached is not None:
+        result, similarity = cached
+        return {**result, "cache": {"hit": True, "similarity": round(similarity, 3)}}
+
     prompt = f"""
     Analyze this travel vibe: "{vibe_description}"
     User preferences: {json.dumps(preferences)}
@@ -143,15 +422,13 @@ async def analyze_travel_vibe(vibe_description: str, preferences: dict) -> Dict[
     - highlights: Array of top 3-4 attractions/activities
     """
     
-    message = UserMessage(text=prompt)
-    response = await openai_chat.send_message(message)
-    
     try:
         # Extract JSON from response
-        response_text = str(response)
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)  
-        if json_match:
-            return json.loads(json_match.group())
+        response_text = await send_prompt(openai_chat, prompt)
+        result = extract_json(response_text, "object")
+        if result is not None:
+            vibe_cache.add(vibe_description, preferences, result)
+            return result
         else:
             # Fallback response
             return {
@@ -169,20 +446,21 @@ async def analyze_travel_vibe(vibe_description: str, preferences: dict) -> Dict[
                     }
                 ],
                 "vibe_score": 0.8,
-                "reasoning": "Based on your vibe preferences, these destinations offer the perfect atmosphere."
+                "reasoning": "Based on your vibe preferences, these destinations offer the perfect atmosphere.",
+                "fallback": True
             }
     except Exception:
         return {
             "matched_destinations": [],
             "vibe_score": 0.5,
-            "reasoning": "Unable to process vibe analysis"
+            "reasoning": "Unable to process vibe analysis",
+            "fallback": True
         }
 
-async def create_smart_itinerary(preferences: TravelPreferences) -> Dict[str, Any]:
-    """Create personalized itinerary using Claude with timeout handling"""
-    
+def build_itinerary_prompt(preferences: TravelPreferences) -> str:
+    """Prompt for a complete itinerary matching the user's preferences"""
     # Simplified prompt for faster response
-    prompt = f"""
+    return f"""
     Create a {preferences.duration}-day {preferences.destination_type} itinerary. Budget: {preferences.budget_range}, Style: {preferences.travel_style}.
 
     Return JSON with:
@@ -204,69 +482,283 @@ async def create_smart_itinerary(preferences: TravelPreferences) -> Dict[str, An
     
     Keep it concise but helpful for {preferences.vibe} travelers.
     """
+
+def fallback_day_plan(preferences: TravelPreferences, i: int) -> Dict[str, Any]:
+    """Deterministic plan for a single day of a general itinerary"""
+    return {
+        "morning": f"Day {i} morning: Explore local {preferences.destination_type} attractions",
+        "afternoon": f"Day {i} afternoon: {preferences.travel_style} activities and local cuisine", 
+        "evening": f"Day {i} evening: Relax and enjoy the {preferences.vibe} atmosphere"
+    }
+
+def build_fallback_itinerary(preferences: TravelPreferences) -> Dict[str, Any]:
+    """Deterministic itinerary used when the AI response is unavailable"""
+    # Enhanced fallback itinerary
+    days_dict = {f"day_{i}": fallback_day_plan(preferences, i) for i in range(1, preferences.duration + 1)}
     
-    message = UserMessage(text=prompt)
-    
+    return {
+        "destination_recommendations": [
+            {
+                "name": f"Perfect {preferences.destination_type.title()} Destination",
+                "description": f"Ideal {preferences.destination_type} location for {preferences.travel_style} travelers seeking {preferences.vibe} experiences",
+                "highlights": [f"Amazing {preferences.destination_type} scenery", "Local culture", "Great food scene"]
+            },
+            {
+                "name": f"Alternative {preferences.destination_type.title()} Spot", 
+                "description": f"Another excellent {preferences.destination_type} destination with {preferences.travel_style} vibes",
+                "highlights": ["Unique attractions", f"{preferences.budget_range} friendly", "Perfect for your style"]
+            }
+        ],
+        "daily_itinerary": days_dict,
+        "estimated_costs": cost_engine.estimated_costs(None, preferences.budget_range),
+        "local_tips": [
+            f"Best time to visit {preferences.destination_type} destinations varies by location",
+            f"For {preferences.travel_style} travelers, pack comfortable clothing", 
+            f"Research local customs and {preferences.budget_range} dining options",
+            "Consider travel insurance and check visa requirements"
+        ]
+    }
+
+async def request_itinerary_json(prompt: str, timeout: float) -> Optional[Dict[str, Any]]:
+    """Send an itinerary prompt to Claude and parse the JSON object in the reply"""
+    response_text = await send_prompt(claude_chat, prompt, timeout=timeout)
+    return extract_json(response_text, "object")
+
+async def create_chunked_itinerary(
+    preferences: TravelPreferences,
+    skeleton_prompt: str,
+    chunk_prompt: Callable[[int, int, Dict[str, Any]], str],
+    fallback: Dict[str, Any],
+    fallback_day: Callable[[int], Dict[str, Any]],
+    on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """Generate a short trip skeleton, then its day ranges concurrently, and merge them"""
+    try:
+        skeleton = await request_itinerary_json(skeleton_prompt, ITINERARY_CHUNK_TIMEOUT) or {}
+    except asyncio.TimeoutError:
+        logging.warning("Claude AI skeleton timed out, using fallback outline")
+        skeleton = {}
+    except Exception as e:
+        logging.warning(f"Claude AI skeleton error: {str(e)}, using fallback outline")
+        skeleton = {}
+
+    async def generate_chunk(start: int, end: int) -> Dict[str, Any]:
+        async with tracker("itinerary_chunk").time():
+            return await request_itinerary_json(chunk_prompt(start, end, skeleton), ITINERARY_CHUNK_TIMEOUT) or {}
+
+    days, stats = await generate_days_in_chunks(
+        preferences.duration,
+        generate_chunk,
+        fallback_day,
+        chunk_days=ITINERARY_CHUNK_DAYS,
+        concurrency=ITINERARY_CHUNK_CONCURRENCY,
+        retries=ITINERARY_CHUNK_RETRIES,
+        on_chunk=on_chunk
+    )
+    logging.info(f"Chunked itinerary for {preferences.duration} days: {stats}")
+
+    result = {key: skeleton.get(key) or value for key, value in fallback.items()}
+    result["daily_itinerary"] = days
+    return result
+
+def format_day_themes(skeleton: Dict[str, Any], start: int, end: int) -> str:
+    themes = skeleton.get("day_themes") or {}
+    return "\n".join(f"    - day_{day}: {themes.get(f'day_{day}', 'Free exploration')}" for day in range(start, end + 1))
+
+async def create_long_smart_itinerary(
+    preferences: TravelPreferences,
+    on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """Chunked variant of create_smart_itinerary for trips longer than ITINERARY_CHUNK_DAYS"""
+    fallback = build_fallback_itinerary(preferences)
+
+    skeleton_prompt = f"""
+    Outline a {preferences.duration}-day {preferences.destination_type} trip. Budget: {preferences.budget_range}, Style: {preferences.travel_style}, Vibe: {preferences.vibe}.
+
+    Return JSON with:
+    {{
+        "destination_recommendations": [
+            {{"name": "Destination Name", "description": "Brief description", "highlights": ["key attraction 1", "key attraction 2"]}}
+        ],
+        "day_themes": {{"day_1": "Short theme", "day_2": "Short theme"}},
+        "estimated_costs": {{
+            "accommodation": "$X-Y per night",
+            "meals": "$X-Y per day", 
+            "activities": "$X-Y per day"
+        }},
+        "local_tips": ["tip 1", "tip 2"]
+    }}
+
+    Give a theme for every day from day_1 to day_{preferences.duration}. Do not write daily activities yet.
+    """
+
+    def chunk_prompt(start: int, end: int, skeleton: Dict[str, Any]) -> str:
+        recommendations = skeleton.get("destination_recommendations") or fallback["destination_recommendations"]
+        destination_name = recommendations[0].get("name", "the destination")
+        return f"""
+    Write days {start} to {end} of a {preferences.duration}-day {preferences.destination_type} trip to {destination_name}.
+    Budget: {preferences.budget_range}, Style: {preferences.travel_style}, Vibe: {preferences.vibe}.
+    Day themes:
+{format_day_themes(skeleton, start, end)}
+
+    Return JSON with exactly the keys day_{start} to day_{end}:
+    {{
+        "day_{start}": {{"morning": "Activity", "afternoon": "Activity", "evening": "Activity"}}
+    }}
+    """
+
+    return await create_chunked_itinerary(
+        preferences, skeleton_prompt, chunk_prompt, fallback,
+        lambda day: fallback_day_plan(preferences, day),
+        on_chunk
+    )
+
+async def create_smart_itinerary(preferences: TravelPreferences) -> Dict[str, Any]:
+    """Create personalized itinerary using Claude with timeout handling"""
+    if preferences.duration > ITINERARY_CHUNK_DAYS:
+        try:
+            return await create_long_smart_itinerary(preferences)
+        except Exception as e:
+            logging.error(f"Chunked itinerary creation failed: {str(e)}")
+            return {"error": f"Unable to create itinerary: {str(e)}"}
+
+    prompt = build_itinerary_prompt(preferences)
+
     try:
-        # Add timeout handling
-        import asyncio
-        
-        async def get_ai_response():
-            return await claude_chat.send_message(message)
-        
         # Try to get AI response with 20 second timeout
         try:
-            response = await asyncio.wait_for(get_ai_response(), timeout=20.0)
-            response_text = str(response)
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                parsed_result = json.loads(json_match.group())
+            response_text = await send_prompt(claude_chat, prompt, timeout=20.0)
+            parsed_result = extract_json(response_text, "object")
+            if parsed_result is not None:
                 return parsed_result
         except asyncio.TimeoutError:
             logging.warning("Claude AI timed out, using fallback itinerary")
         except Exception as e:
             logging.warning(f"Claude AI error: {str(e)}, using fallback")
         
-        # Enhanced fallback itinerary
-        duration = preferences.duration
-        days_dict = {}
-        for i in range(1, min(duration + 1, 8)):  # Limit to 7 days max
-            days_dict[f"day_{i}"] = {
-                "morning": f"Day {i} morning: Explore local {preferences.destination_type} attractions",
-                "afternoon": f"Day {i} afternoon: {preferences.travel_style} activities and local cuisine", 
-                "evening": f"Day {i} evening: Relax and enjoy the {preferences.vibe} atmosphere"
-            }
-        
-        return {
-            "destination_recommendations": [
-                {
-                    "name": f"Perfect {preferences.destination_type.title()} Destination",
-                    "description": f"Ideal {preferences.destination_type} location for {preferences.travel_style} travelers seeking {preferences.vibe} experiences",
-                    "highlights": [f"Amazing {preferences.destination_type} scenery", "Local culture", "Great food scene"]
-                },
-                {
-                    "name": f"Alternative {preferences.destination_type.title()} Spot", 
-                    "description": f"Another excellent {preferences.destination_type} destination with {preferences.travel_style} vibes",
-                    "highlights": ["Unique attractions", f"{preferences.budget_range} friendly", "Perfect for your style"]
-                }
-            ],
-            "daily_itinerary": days_dict,
-            "estimated_costs": {
-                "accommodation": f"${80 if preferences.budget_range == 'budget' else 150 if preferences.budget_range == 'mid-range' else 300}/night",
-                "meals": f"${30 if preferences.budget_range == 'budget' else 60 if preferences.budget_range == 'mid-range' else 120}/day",
-                "activities": f"${40 if preferences.budget_range == 'budget' else 80 if preferences.budget_range == 'mid-range' else 160}/day"
-            },
-            "local_tips": [
-                f"Best time to visit {preferences.destination_type} destinations varies by location",
-                f"For {preferences.travel_style} travelers, pack comfortable clothing", 
-                f"Research local customs and {preferences.budget_range} dining options",
-                "Consider travel insurance and check visa requirements"
-            ]
-        }
+        return build_fallback_itinerary(preferences)
     except Exception as e:
         logging.error(f"Itinerary creation failed: {str(e)}")
         return {"error": f"Unable to create itinerary: {str(e)}"}
 
+def fallback_destination_day_plan(destination: str, preferences: TravelPreferences, i: int) -> Dict[str, Any]:
+    """Deterministic plan for a single day at a specific destination"""
+    return {
+        "morning": {
+            "activity": f"Explore {destination} highlights",
+            "time": "9:00 AM",
+            "cost": "$20-40",
+            "description": f"Visit top attractions in {destination}"
+        },
+        "afternoon": {
+            "activity": f"{preferences.travel_style.title()} activities",
+            "time": "2:00 PM", 
+            "cost": "$30-60",
+            "description": f"Enjoy {preferences.travel_style} experiences"
+        },
+        "evening": {
+            "activity": f"Local dining and {preferences.vibe} atmosphere",
+            "time": "7:00 PM",
+            "cost": "$25-50",
+            "description": f"Experience the {preferences.vibe} nightlife"
+        }
+    }
+
+def build_destination_fallback_itinerary(destination: str, preferences: TravelPreferences) -> Dict[str, Any]:
+    """Deterministic destination itinerary used when the AI response is unavailable"""
+    # Enhanced fallback itinerary with destination-specific content
+    days_dict = {
+        f"day_{i}": fallback_destination_day_plan(destination, preferences, i)
+        for i in range(1, preferences.duration + 1)
+    }
+    
+    return {
+        "destination_info": {
+            "name": destination,
+            "description": f"Beautiful destination perfect for {preferences.travel_style} travelers",
+            "best_time_to_visit": "Year-round destination with seasonal highlights",
+            "local_currency": destination_matcher.currency_for(destination, default="Local currency"),
+            "language": "Local language"
+        },
+        "daily_itinerary": days_dict,
+        "estimated_costs": cost_engine.estimated_costs(destination, preferences.budget_range),
+        "local_tips": [
+            f"Research local customs and etiquette in {destination}",
+            f"Best {preferences.travel_style} spots are often recommended by locals",
+            f"Consider {preferences.budget_range} dining options for authentic experiences",
+            "Download offline maps and translation apps"
+        ],
+        "packing_suggestions": [
+            "Comfortable walking shoes",
+            "Weather-appropriate clothing",
+            "Portable charger and adapters",
+            "Travel insurance documents"
+        ]
+    }
+
+async def create_long_destination_itinerary(
+    destination: str,
+    preferences: TravelPreferences,
+    activities_text: str,
+    dates_text: str
+) -> Dict[str, Any]:
+    """Chunked variant of create_smart_itinerary_for_destination for long trips"""
+    skeleton_prompt = f"""
+    Outline a {preferences.duration}-day trip to {destination}.
+    Travel dates: {dates_text}
+    Budget: {preferences.budget_range}
+    Style: {preferences.travel_style}
+    Vibe: {preferences.vibe}
+    Preferred activities: {activities_text}
+
+    Return JSON with:
+    {{
+        "destination_info": {{
+            "name": "{destination}",
+            "description": "Brief overview",
+            "best_time_to_visit": "Season info",
+            "local_currency": "Currency",
+            "language": "Primary language"
+        }},
+        "day_themes": {{"day_1": "Short theme", "day_2": "Short theme"}},
+        "estimated_costs": {{
+            "accommodation": "$X-Y per night",
+            "meals": "$X-Y per day",
+            "activities": "$X-Y per day",
+            "transportation": "$X-Y total"
+        }},
+        "local_tips": ["tip 1", "tip 2"],
+        "packing_suggestions": ["item 1", "item 2"]
+    }}
+
+    Give a theme for every day from day_1 to day_{preferences.duration}. Do not write daily activities yet.
+    """
+
+    def chunk_prompt(start: int, end: int, skeleton: Dict[str, Any]) -> str:
+        return f"""
+    Write days {start} to {end} of a {preferences.duration}-day itinerary for {destination}.
+    Travel dates: {dates_text}
+    Budget: {preferences.budget_range}, Style: {preferences.travel_style}, Vibe: {preferences.vibe}
+    Preferred activities: {activities_text}
+    Day themes:
+{format_day_themes(skeleton, start, end)}
+
+    Return JSON with exactly the keys day_{start} to day_{end}:
+    {{
+        "day_{start}": {{
+            "morning": {{"activity": "Activity name", "time": "9:00 AM", "cost": "$XX", "description": "Details"}},
+            "afternoon": {{"activity": "Activity name", "time": "2:00 PM", "cost": "$XX", "description": "Details"}},
+            "evening": {{"activity": "Activity name", "time": "7:00 PM", "cost": "$XX", "description": "Details"}}
+        }}
+    }}
+    """
+
+    return await create_chunked_itinerary(
+        preferences, skeleton_prompt, chunk_prompt,
+        build_destination_fallback_itinerary(destination, preferences),
+        lambda day: fallback_destination_day_plan(destination, preferences, day)
+    )
+
 async def create_smart_itinerary_for_destination(
     destination: str, 
     preferences: TravelPreferences, 
@@ -278,6 +770,13 @@ async def create_smart_itinerary_for_destination(
     # Build enhanced prompt with destination and activities
     activities_text = ", ".join(selected_activities) if selected_activities else "general activities"
     dates_text = f"from {travel_dates.get('start_date')} to {travel_dates.get('end_date')}" if travel_dates else "flexible dates"
+
+    if preferences.duration > ITINERARY_CHUNK_DAYS:
+        try:
+            return await create_long_destination_itinerary(destination, preferences, activities_text, dates_text)
+        except Exception as e:
+            logging.error(f"Chunked itinerary creation failed: {str(e)}")
+            return {"error": f"Unable to create itinerary for {destination}: {str(e)}"}
     
     prompt = f"""
     Create a detailed {preferences.duration}-day itinerary for {destination}.
@@ -314,84 +813,39 @@ async def create_smart_itinerary_for_destination(
     }}
     """
     
-    message = UserMessage(text=prompt)
-    
     try:
         # Try to get AI response with timeout
-        async def get_ai_response():
-            return await claude_chat.send_message(message)
-        
         try:
-            response = await asyncio.wait_for(get_ai_response(), timeout=25.0)
-            response_text = str(response)
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                parsed_result = json.loads(json_match.group())
+            response_text = await send_prompt(claude_chat, prompt, timeout=25.0)
+            parsed_result = extract_json(response_text, "object")
+            if parsed_result is not None:
                 return parsed_result
         except asyncio.TimeoutError:
             logging.warning("Claude AI timed out, using enhanced fallback itinerary")
         except Exception as e:
             logging.warning(f"Claude AI error: {str(e)}, using enhanced fallback")
         
-        # Enhanced fallback itinerary with destination-specific content
-        duration = preferences.duration
-        days_dict = {}
-        for i in range(1, min(duration + 1, 8)):
-            days_dict[f"day_{i}"] = {
-                "morning": {
-                    "activity": f"Explore {destination} highlights",
-                    "time": "9:00 AM",
-                    "cost": "$20-40",
-                    "description": f"Visit top attractions in {destination}"
-                },
-                "afternoon": {
-                    "activity": f"{preferences.travel_style.title()} activities",
-                    "time": "2:00 PM", 
-                    "cost": "$30-60",
-                    "description": f"Enjoy {preferences.travel_style} experiences"
-                },
-                "evening": {
-                    "activity": f"Local dining and {preferences.vibe} atmosphere",
-                    "time": "7:00 PM",
-                    "cost": "$25-50",
-                    "description": f"Experience the {preferences.vibe} nightlife"
-                }
-            }
-        
-        return {
-            "destination_info": {
-                "name": destination,
-                "description": f"Beautiful destination perfect for {preferences.travel_style} travelers",
-                "best_time_to_visit": "Year-round destination with seasonal highlights",
-                "local_currency": "Local currency",
-                "language": "Local language"
-            },
-            "daily_itinerary": days_dict,
-            "estimated_costs": {
-                "accommodation": f"${80 if preferences.budget_range == 'budget' else 150 if preferences.budget_range == 'mid-range' else 300}/night",
-                "meals": f"${30 if preferences.budget_range == 'budget' else 60 if preferences.budget_range == 'mid-range' else 120}/day",
-                "activities": f"${40 if preferences.budget_range == 'budget' else 80 if preferences.budget_range == 'mid-range' else 160}/day",
-                "transportation": f"${100 if preferences.budget_range == 'budget' else 200 if preferences.budget_range == 'mid-range' else 400} total"
-            },
-            "local_tips": [
-                f"Research local customs and etiquette in {destination}",
-                f"Best {preferences.travel_style} spots are often recommended by locals",
-                f"Consider {preferences.budget_range} dining options for authentic experiences",
-                "Download offline maps and translation apps"
-            ],
-            "packing_suggestions": [
-                "Comfortable walking shoes",
-                "Weather-appropriate clothing",
-                "Portable charger and adapters",
-                "Travel insurance documents"
-            ]
-        }
+        return build_destination_fallback_itinerary(destination, preferences)
     except Exception as e:
         logging.error(f"Enhanced itinerary creation failed: {str(e)}")
         return {"error": f"Unable to create itinerary for {destination}: {str(e)}"}
+
 async def analyze_review_sentiment(review_text: str) -> Dict[str, Any]:
     """Analyze travel review for sentiment, safety, and cleanliness"""
-    prompt = f"""
+    started = time.perf_counter()
+    local = local_sentiment.score([review_text])[0]
+    if local["sentiment_confidence"] >= LOCAL_SENTIMENT_THRESHOLD:
+        sentiment_paths["local"] += 1
+        tracker("sentiment_local").record(time.perf_counter() - started)
+        return local
+    sentiment_paths["escalated"] += 1
+
+    async with tracker("sentiment_llm").time():
+        return await analyze_review_sentiment_llm(review_text)
+
+def review_sentiment_prompt(review_text: str) -> str:
+    """Single-review prompt, used when sentiment micro-batching is disabled"""
+    return f"""
     Analyze this travel review for sentiment, safety, and cleanliness insights:
     
     Review: "{review_text}"
@@ -406,15 +860,21 @@ async def analyze_review_sentiment(review_text: str) -> Dict[str, Any]:
     7. cleanliness_mentions: Specific cleanliness-related comments
     8. recommendation: Overall recommendation based on analysis
     """
-    
-    message = UserMessage(text=prompt)
-    response = await sentiment_chat.send_message(message)
-    
+
+async def analyze_review_sentiment_llm(review_text: str) -> Dict[str, Any]:
+    """LLM analysis for reviews the local scorer is not confident about"""
+    cached = await sentiment_cache.get(review_text)
+    if cached is not None:
+        return cached
+
     try:
-        response_text = str(response)
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            result = json.loads(json_match.group())
+        if SENTIMENT_BATCH_ENABLED:
+            result = await sentiment_batcher.submit(review_text)
+        else:
+            response_text = await send_prompt(sentiment_chat, review_sentiment_prompt(review_text))
+            result = extract_json(response_text, "object")
+        if result is not None:
+            await sentiment_cache.put(review_text, result)
             return result
         else:
             # Fallback analysis
@@ -426,35 +886,230 @@ async def analyze_review_sentiment(review_text: str) -> Dict[str, Any]:
                 "key_insights": ["Analysis completed"],
                 "safety_mentions": ["No specific safety concerns mentioned"],
                 "cleanliness_mentions": ["Standard cleanliness mentioned"],
-                "recommendation": "Further analysis recommended"
+                "recommendation": "Further analysis recommended",
+                "fallback": True
             }
     except Exception:
-        return {
-            "overall_sentiment": "neutral", 
-            "sentiment_confidence": 0.5,
-            "safety_score": 5.0,
-            "cleanliness_score": 5.0,
-            "key_insights": ["Unable to analyze"],
-            "recommendation": "Manual review needed"
-        }
+        return neutral_review_analysis()
+
+async def analyze_review_bounded(index: int, review_text: str) -> tuple:
+    """Analyze one review under the shared concurrency limit and its own timeout"""
+    async with review_analysis_semaphore:
+        try:
+            async with tracker("review_sentiment").time():
+                analysis = await asyncio.wait_for(
+                    analyze_review_sentiment(review_text), timeout=REVIEW_ANALYSIS_TIMEOUT
+                )
+        except asyncio.TimeoutError:
+            logging.warning("Review sentiment analysis timed out, using neutral analysis")
+            analysis = None
+        except Exception as e:
+            logging.warning(f"Review sentiment analysis error: {str(e)}, using neutral analysis")
+            analysis = None
+
+    if analysis is None:
+        analysis = neutral_review_analysis()
+    return index, analysis
+
+def neutral_review_analysis() -> Dict[str, Any]:
+    return {
+        "overall_sentiment": "neutral",
+        "sentiment_confidence": 0.5,
+        "safety_score": 5.0,
+        "cleanliness_score": 5.0,
+        "key_insights": ["Unable to analyze"],
+        "recommendation": "Manual review needed",
+        "fallback": True
+    }
+
+def review_analysis_record(review_text: str, analysis: Dict[str, Any], destination: Optional[str] = None) -> Dict[str, Any]:
+    """ReviewAnalysis document for an analysis result, with scores clamped to their valid ranges"""
+    def clamp(value: Any, default: float, upper: float) -> float:
+        try:
+            return min(max(float(value), 0.0), upper)
+        except (TypeError, ValueError):
+            return default
+
+    insights = analysis.get("key_insights", [])
+    return to_document(ReviewAnalysis(
+        review_text=review_text,
+        overall_sentiment=analysis.get("overall_sentiment", "neutral"),
+        safety_score=clamp(analysis.get("safety_score"), 5.0, 10.0),
+        cleanliness_score=clamp(analysis.get("cleanliness_score"), 5.0, 10.0),
+        sentiment_confidence=clamp(analysis.get("sentiment_confidence"), 0.5, 1.0),
+        key_insights=[str(item) for item in insights] if isinstance(insights, list) else [str(insights)],
+        destination=destination
+    ))
+
+async def store_review_analyses(records: List[Dict[str, Any]], destination: Optional[str] = None) -> None:
+    """Insert review analysis records and add them to the destination's running stats"""
+    if len(records) == 1:
+        await db.review_analyses.insert_one(records[0])
+    else:
+        await db.review_analyses.insert_many(records, ordered=False)
+    try:
+        await review_stats.record(destination, records)
+    except Exception as e:
+        # The stats can be recomputed from review_analyses with `manage.py rebuild-review-stats`
+        logging.warning(f"Updating review stats for {destination} failed: {str(e)}")
+    await update_rollups(insight_rollups.record_reviews(records))
+
+async def analyze_review_batch_llm(texts: List[str], timeout: Optional[float] = None) -> List[Optional[Dict[str, Any]]]:
+    """Analyze several reviews with one sentiment prompt; entries the reply lacks come back as None"""
+    response_text = await send_prompt(sentiment_chat, batch_prompt(texts), timeout=timeout)
+    return map_batch_results(extract_json(response_text, "array"), len(texts))
+
+# Concurrent single-review LLM analyses are coalesced into multi-review prompts
+SENTIMENT_BATCH_ENABLED = os.environ.get('SENTIMENT_BATCH_ENABLED', 'true').lower() == 'true'
+sentiment_batcher = MicroBatcher(
+    "sentiment_batch",
+    lambda texts: analyze_review_batch_llm(texts, timeout=REVIEW_BATCH_TIMEOUT),
+    window_ms=float(os.environ.get('SENTIMENT_BATCH_WINDOW_MS', '15')),
+    max_batch_size=int(os.environ.get('SENTIMENT_BATCH_MAX_SIZE', '16'))
+)
+
+def aggregate_review_analyses(analyses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate safety, cleanliness and sentiment across review analyses"""
+    total_safety = 0
+    total_cleanliness = 0
+    sentiment_counts = {"positive": 0, "neutral": 0, "negative": 0}
+
+    for analysis in analyses:
+        total_safety += analysis.get("safety_score", 5.0)
+        total_cleanliness += analysis.get("cleanliness_score", 5.0)
+        sentiment = analysis.get("overall_sentiment", "neutral")
+        sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
+
+    count = max(len(analyses), 1)
+    return {
+        "average_safety": round(total_safety / count, 1),
+        "average_cleanliness": round(total_cleanliness / count, 1),
+        "sentiment_distribution": sentiment_counts,
+        "dominant_sentiment": max(sentiment_counts, key=sentiment_counts.get)
+    }
+
+def build_review_summary(destination: str, aggregates: Dict[str, Any]) -> str:
+    """Deterministic review summary built from aggregated scores"""
+    def describe(score: float) -> str:
+        if score >= 8:
+            return "excellent"
+        if score >= 6.5:
+            return "good"
+        if score >= 5:
+            return "mixed"
+        return "concerning"
+
+    safety = aggregates["average_safety"]
+    cleanliness = aggregates["average_cleanliness"]
+    return (
+        f"1. Overall safety impression: {describe(safety).capitalize()} ({safety}/10) based on traveler reviews of {destination}.\n"
+        f"2. Cleanliness standards: {describe(cleanliness).capitalize()} ({cleanliness}/10).\n"
+        f"3. Key recommendations: Reviews are mostly {aggregates['dominant_sentiment']}. "
+        "Stay in well-reviewed areas, keep an eye on belongings in crowded places and check recent travel advisories."
+    )
+
+async def generate_review_summary(destination: str, aggregates: Dict[str, Any]) -> str:
+    """Summarize review aggregates with the LLM, falling back to the deterministic summary"""
+    summary_prompt = f"""Based on these travel reviews for {destination}, provide a concise summary of:
+        1. Overall safety impression
+        2. Cleanliness standards
+        3. Key recommendations for travelers
+
+        Reviews summary: Average safety {aggregates['average_safety']}/10, cleanliness {aggregates['average_cleanliness']}/10, mostly {aggregates['dominant_sentiment']} reviews."""
+
+    try:
+        async with tracker("review_summary").time():
+            return await send_prompt(openai_chat, summary_prompt, timeout=REVIEW_SUMMARY_TIMEOUT)
+    except asyncio.TimeoutError:
+        logging.warning("Review summary timed out, using deterministic summary")
+    except Exception as e:
+        logging.warning(f"Review summary error: {str(e)}, using deterministic summary")
+    return build_review_summary(destination, aggregates)
 
 # Helper functions for auth
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
+password_hasher = PasswordHasher(
+    scheme=os.environ.get('PASSWORD_HASH_SCHEME', 'scrypt'),
+    workers=int(os.environ.get('PASSWORD_HASH_WORKERS', '4')),
+    scrypt_n=int(os.environ.get('PASSWORD_SCRYPT_N', str(2 ** 14))),
+    pbkdf2_iterations=int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', '600000'))
+)
 
-def verify_password(password: str, password_hash: str) -> bool:
-    return hashlib.sha256(password.encode()).hexdigest() == password_hash
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+async def verify_password(password: str, user: Dict[str, Any]) -> bool:
+    """Check a login password, upgrading outdated hashes (e.g. legacy sha256) on success"""
+    ok, needs_rehash = await password_hasher.verify(password, user["password_hash"])
+    if ok and needs_rehash:
+        try:
+            await db.users.update_one(
+                {"id": user["id"], "password_hash": user["password_hash"]},
+                {"$set": {"password_hash": await hash_password(password)}}
+            )
+            password_hasher.rehashes += 1
+        except Exception as e:
+            logging.warning(f"Password rehash failed: {str(e)}")
+    return ok
 
 def generate_session_token() -> str:
     return secrets.token_urlsafe(32)
 
+async def require_session(session_token: str) -> AuthenticatedSession:
+    """Shared auth dependency: resolves the session_token query parameter through the session cache"""
+    try:
+        return await session_cache.resolve(session_token)
+    except SessionError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
 # API Endpoints
+# Handlers return FastJSONResponse themselves: a plain return value would first go through FastAPI's
+# jsonable_encoder pass, which copies the payload and renders naive datetimes without their UTC offset
 @api_router.get("/")
 async def root():
-    return {"message": "Yomigo Travel Platform API", "version": "1.0.0"}
+    return FastJSONResponse({"message": "Yomigo Travel Platform API", "version": "1.0.0"})
+
+@api_router.get("/metrics")
+async def get_metrics():
+    """Per-call latency percentiles for LLM-backed helpers"""
+    return FastJSONResponse({
+        "success": True,
+        "latency": latency_snapshot(),
+        "llm_coalescing": llm_singleflight.stats(),
+        "llm_resilience": {
+            "hedging_enabled": LLM_HEDGING_ENABLED,
+            "breakers": {name: breaker.snapshot() for name, breaker in llm_breakers.items()},
+            "hedging": {model: stats.snapshot() for model, stats in llm_hedge_stats.items()}
+        },
+        "llm_handles": [factory.stats() for factory in (openai_chat, claude_chat, sentiment_chat)],
+        "password_hashing": password_hasher.stats(),
+        "itinerary_storage": itinerary_codec.stats(),
+        "exchange_rates": exchange_rates.stats(),
+        "trending": trending.stats(),
+        "review_sentiment_paths": {
+            **sentiment_paths,
+            "escalation_rate": round(
+                sentiment_paths["escalated"] / max(1, sentiment_paths["local"] + sentiment_paths["escalated"]), 3
+            ),
+            "local_confidence_threshold": LOCAL_SENTIMENT_THRESHOLD
+        },
+        "sentiment_batching": {"enabled": SENTIMENT_BATCH_ENABLED, **sentiment_batcher.stats()},
+        "indexes": index_report,
+        "caches": {
+            "sessions": session_cache.stats(),
+            "review_sentiment": sentiment_cache.stats(),
+            "vibe_semantic": vibe_cache.stats()
+        },
+        "settings": {
+            "review_analysis_concurrency": REVIEW_ANALYSIS_CONCURRENCY,
+            "review_analysis_timeout": REVIEW_ANALYSIS_TIMEOUT,
+            "review_summary_mode": REVIEW_SUMMARY_MODE,
+            "review_batch_prompt_reviews": REVIEW_BATCH_PROMPT_REVIEWS,
+            "review_batch_prompt_chars": REVIEW_BATCH_PROMPT_CHARS
+        }
+    })
 
 # Authentication Endpoints
-@api_router.post("/auth/register", response_model=Dict[str, Any])
+@api_router.post("/auth/register")
 async def register_user(email: str, password: str, name: str):
     """Register a new user"""
     try:
@@ -464,14 +1119,18 @@ async def register_user(email: str, password: str, name: str):
             raise HTTPException(status_code=400, detail="Email already registered")
         
         # Create new user
-        password_hash = hash_password(password)
+        password_hash = await hash_password(password)
         user = User(
             email=email,
             password_hash=password_hash,
             name=name
         )
         
-        await db.users.insert_one(user.dict())
+        try:
+            await db.users.insert_one(to_document(user))
+        except DuplicateKeyError:
+            # A concurrent registration with the same email won the unique email index
+            raise HTTPException(status_code=400, detail="Email already registered")
         
         # Generate session token
         session_token = generate_session_token()
@@ -482,8 +1141,9 @@ async def register_user(email: str, password: str, name: str):
             "expires_at": datetime.utcnow() + timedelta(days=30)  # 30 day expiry
         }
         await db.sessions.insert_one(session)
+        session_cache.remember(session_token, to_document(user), session["expires_at"])
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "user": {
                 "id": user.id, 
@@ -492,7 +1152,7 @@ async def register_user(email: str, password: str, name: str):
                 "preferences": user.preferences
             },
             "session_token": session_token
-        }
+        })
         
     except HTTPException:
         raise
@@ -500,12 +1160,12 @@ async def register_user(email: str, password: str, name: str):
         logging.error(f"Registration error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
 
-@api_router.post("/auth/login", response_model=Dict[str, Any])
+@api_router.post("/auth/login")
 async def login_user(email: str, password: str):
     """Login user"""
     try:
         user = await db.users.find_one({"email": email})
-        if not user or not verify_password(password, user["password_hash"]):
+        if not user or not await verify_password(password, user):
             raise HTTPException(status_code=401, detail="Invalid email or password")
         
         # Generate session token
@@ -517,8 +1177,9 @@ async def login_user(email: str, password: str):
             "expires_at": datetime.utcnow() + timedelta(days=30)
         }
         await db.sessions.insert_one(session)
+        session_cache.remember(session_token, user, session["expires_at"])
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "user": {
                 "id": user["id"], 
@@ -531,7 +1192,7 @@ async def login_user(email: str, password: str):
                 })
             },
             "session_token": session_token
-        }
+        })
         
     except HTTPException:
         raise
@@ -539,24 +1200,13 @@ async def login_user(email: str, password: str):
         logging.error(f"Login error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Login failed: {str(e)}")
 
-@api_router.post("/auth/verify", response_model=Dict[str, Any])
+@api_router.post("/auth/verify")
 async def verify_session(session_token: str):
     """Verify session token"""
     try:
-        session = await db.sessions.find_one({"token": session_token})
-        if not session:
-            raise HTTPException(status_code=401, detail="Invalid session")
+        user = (await require_session(session_token)).user
         
-        # Check if session expired
-        if datetime.utcnow() > session["expires_at"]:
-            await db.sessions.delete_one({"token": session_token})
-            raise HTTPException(status_code=401, detail="Session expired")
-        
-        user = await db.users.find_one({"id": session["user_id"]})
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        
-        return {
+        return FastJSONResponse({
             "success": True,
             "user": {
                 "id": user["id"], 
@@ -568,7 +1218,7 @@ async def verify_session(session_token: str):
                     "budget_preference": "mid-range"
                 })
             }
-        }
+        })
         
     except HTTPException:
         raise
@@ -577,18 +1227,11 @@ async def verify_session(session_token: str):
         raise HTTPException(status_code=401, detail="Invalid session")
 
 # User Preferences Endpoints
-@api_router.get("/user/preferences", response_model=Dict[str, Any])
-async def get_user_preferences(session_token: str):
+@api_router.get("/user/preferences")
+async def get_user_preferences(session: AuthenticatedSession = Depends(require_session)):
     """Get user preferences"""
     try:
-        # Verify session
-        session = await db.sessions.find_one({"token": session_token})
-        if not session:
-            raise HTTPException(status_code=401, detail="Invalid session")
-        
-        user = await db.users.find_one({"id": session["user_id"]})
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
+        user = session.user
         
         # Return preferences with defaults if not set
         preferences = user.get("preferences", {
@@ -597,10 +1240,10 @@ async def get_user_preferences(session_token: str):
             "budget_preference": "mid-range"
         })
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "preferences": preferences
-        }
+        })
         
     except HTTPException:
         raise
@@ -608,20 +1251,15 @@ async def get_user_preferences(session_token: str):
         logging.error(f"Get preferences error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get preferences: {str(e)}")
 
-@api_router.post("/user/preferences", response_model=Dict[str, Any])
+@api_router.post("/user/preferences")
 async def update_user_preferences(
-    session_token: str,
     preferred_currency: Optional[str] = None,
     travel_style: Optional[str] = None,
-    budget_preference: Optional[str] = None
+    budget_preference: Optional[str] = None,
+    session: AuthenticatedSession = Depends(require_session)
 ):
     """Update user preferences"""
     try:
-        # Verify session
-        session = await db.sessions.find_one({"token": session_token})
-        if not session:
-            raise HTTPException(status_code=401, detail="Invalid session")
-        
         # Build update data
         update_data = {}
         if preferred_currency:
@@ -636,17 +1274,18 @@ async def update_user_preferences(
         
         # Update user preferences
         result = await db.users.update_one(
-            {"id": session["user_id"]},
+            {"id": session.user_id},
             {"$set": update_data}
         )
+        session_cache.invalidate_user(session.user_id)
         
         if result.modified_count == 0:
             raise HTTPException(status_code=404, detail="User not found or no changes made")
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "message": "Preferences updated successfully"
-        }
+        })
         
     except HTTPException:
         raise
@@ -655,108 +1294,104 @@ async def update_user_preferences(
         raise HTTPException(status_code=500, detail=f"Failed to update preferences: {str(e)}")
 
 # Saved Itinerary Endpoints
-@api_router.post("/itineraries/save", response_model=Dict[str, Any])
+@api_router.post("/itineraries")
+async def create_saved_itinerary(request: Request, session: AuthenticatedSession = Depends(require_session)):
+    """Save itinerary for user from a JSON body (see SaveItineraryRequest)"""
+    payload = parse_save_request(await read_json_body(request, SAVE_ITINERARY_MAX_BYTES))
+    try:
+        return FastJSONResponse(await store_itinerary(db.saved_itineraries, itinerary_codec, session.user_id, payload))
+    except Exception as e:
+        logging.error(f"Save itinerary error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to save itinerary: {str(e)}")
+
+@api_router.post("/itineraries/save")
 async def save_itinerary(
-    session_token: str,
     title: str,
     destination: str,
     itinerary_data: str,
     travel_dates: str,
-    preferences: str
+    preferences: str,
+    session: AuthenticatedSession = Depends(require_session)
 ):
-    """Save itinerary for user"""
+    """Save itinerary for user (legacy query-string form; prefer POST /itineraries)"""
+    payload = parse_legacy_save_request(title, destination, itinerary_data, travel_dates, preferences)
     try:
-        # Verify session
-        session = await db.sessions.find_one({"token": session_token})
-        if not session:
-            raise HTTPException(status_code=401, detail="Invalid session")
-        
-        # Parse JSON strings
-        destination_dict = json.loads(destination) if isinstance(destination, str) else destination
-        itinerary_data_dict = json.loads(itinerary_data) if isinstance(itinerary_data, str) else itinerary_data
-        travel_dates_dict = json.loads(travel_dates) if isinstance(travel_dates, str) else travel_dates
-        preferences_dict = json.loads(preferences) if isinstance(preferences, str) else preferences
-        
-        # Create saved itinerary
-        saved_itinerary = SavedItinerary(
-            user_id=session["user_id"],
-            title=title,
-            destination=destination_dict,
-            itinerary_data=itinerary_data_dict,
-            travel_dates=travel_dates_dict,
-            preferences=preferences_dict
-        )
-        
-        await db.saved_itineraries.insert_one(saved_itinerary.dict())
+        return FastJSONResponse(await store_itinerary(db.saved_itineraries, itinerary_codec, session.user_id, payload))
+    except Exception as e:
+        logging.error(f"Save itinerary error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to save itinerary: {str(e)}")
+
+@api_router.get("/itineraries/my")
+async def get_my_itineraries(
+    limit: int = ITINERARY_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    full: bool = False,
+    session: AuthenticatedSession = Depends(require_session)
+):
+    """Get a page of the user's saved itineraries, newest first (summaries unless full=true)"""
+    try:
+        limit = max(1, min(limit, ITINERARY_PAGE_SIZE_MAX))
+        try:
+            query = keyset_filter({"user_id": session.user_id}, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        projection = {"_id": 0} if full else SAVED_ITINERARY_SUMMARY_FIELDS
+        docs = await db.saved_itineraries.find(query, projection).sort(KEYSET_SORT).limit(limit + 1).to_list(limit + 1)
+        itineraries, next_cursor = split_page(docs, limit)
+        if full:
+            itineraries = [itinerary_codec.decode(doc) for doc in itineraries]
         
-        return {
+        return FastJSONResponse({
             "success": True,
-            "itinerary_id": saved_itinerary.id,
-            "message": "Itinerary saved successfully!"
-        }
+            "itineraries": itineraries,
+            "next_cursor": next_cursor
+        })
         
     except HTTPException:
         raise
     except Exception as e:
-        logging.error(f"Save itinerary error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to save itinerary: {str(e)}")
+        logging.error(f"Get itineraries error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get itineraries: {str(e)}")
 
-@api_router.get("/itineraries/my", response_model=Dict[str, Any])
-async def get_my_itineraries(session_token: str):
-    """Get user's saved itineraries"""
+@api_router.get("/itineraries/{itinerary_id}")
+async def get_itinerary(itinerary_id: str, session: AuthenticatedSession = Depends(require_session)):
+    """Get one saved itinerary in full"""
     try:
-        # Verify session
-        session = await db.sessions.find_one({"token": session_token})
-        if not session:
-            raise HTTPException(status_code=401, detail="Invalid session")
-        
-        # Get user's itineraries
-        itineraries_raw = await db.saved_itineraries.find(
-            {"user_id": session["user_id"]}
-        ).sort("created_at", -1).to_list(50)
-        
-        # Convert ObjectIds to strings for JSON serialization
-        itineraries = []
-        for itinerary in itineraries_raw:
-            # Convert ObjectId to string if it exists
-            if '_id' in itinerary:
-                itinerary['id'] = str(itinerary['_id'])
-                del itinerary['_id']
-            itineraries.append(itinerary)
+        itinerary = await db.saved_itineraries.find_one(
+            {"id": itinerary_id, "user_id": session.user_id}, {"_id": 0}
+        )
+        if not itinerary:
+            raise HTTPException(status_code=404, detail="Itinerary not found")
         
-        return {
+        return FastJSONResponse({
             "success": True,
-            "itineraries": itineraries
-        }
+            "itinerary": itinerary_codec.decode(itinerary)
+        })
         
     except HTTPException:
         raise
     except Exception as e:
-        logging.error(f"Get itineraries error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to get itineraries: {str(e)}")
+        logging.error(f"Get itinerary error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get itinerary: {str(e)}")
 
-@api_router.delete("/itineraries/{itinerary_id}", response_model=Dict[str, Any])
-async def delete_itinerary(itinerary_id: str, session_token: str):
+@api_router.delete("/itineraries/{itinerary_id}")
+async def delete_itinerary(itinerary_id: str, session: AuthenticatedSession = Depends(require_session)):
     """Delete saved itinerary"""
     try:
-        # Verify session
-        session = await db.sessions.find_one({"token": session_token})
-        if not session:
-            raise HTTPException(status_code=401, detail="Invalid session")
-        
         # Delete itinerary (only if owned by user)
         result = await db.saved_itineraries.delete_one({
             "id": itinerary_id,
-            "user_id": session["user_id"]
+            "user_id": session.user_id
         })
         
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Itinerary not found")
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "message": "Itinerary deleted successfully!"
-        }
+        })
         
     except HTTPException:
         raise
@@ -764,7 +1399,90 @@ async def delete_itinerary(itinerary_id: str, session_token: str):
         logging.error(f"Delete itinerary error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to delete itinerary: {str(e)}")
 
-@api_router.post("/vibe-match", response_model=Dict[str, Any])
+def trip_cost_response(
+    destination: Optional[str],
+    budget_range: Optional[str],
+    duration: Optional[int],
+    travelers: Any,
+    currency: str,
+    itinerary: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Trip cost for an itinerary (or just a destination and duration) in the requested currency"""
+    currency = (currency or "USD").upper()
+    try:
+        rate = exchange_rates.rate("USD", currency)
+    except UnsupportedCurrency:
+        raise HTTPException(status_code=400, detail=f"Currency {currency} not supported")
+    # Saved preferences hold these as form strings ("2"); bad values fall back to the itinerary/defaults
+    try:
+        travelers = max(1, int(travelers))
+    except (TypeError, ValueError):
+        travelers = 1
+    try:
+        days = max(1, int(duration))
+    except (TypeError, ValueError):
+        days = len((itinerary or {}).get("daily_itinerary") or {}) or 1
+    cost = cost_engine.estimate(destination, budget_range, days, travelers, itinerary, rate=rate, currency=currency)
+    return {
+        "success": True,
+        "destination": destination,
+        "duration": days,
+        "travelers": travelers,
+        "budget_range": budget_range,
+        **cost.to_dict()
+    }
+
+@api_router.post("/trip-cost")
+async def estimate_trip_cost(request: TripCostRequest):
+    """Total trip cost from the cost model and any figures in the itinerary, without an LLM call"""
+    destination = request.destination
+    if not destination and request.itinerary:
+        destination = (request.itinerary.get("destination_info") or {}).get("name")
+    try:
+        return FastJSONResponse(trip_cost_response(
+            destination, request.budget_range, request.duration,
+            request.travelers, request.currency, request.itinerary
+        ))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Trip cost error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to estimate trip cost: {str(e)}")
+
+@api_router.get("/itineraries/{itinerary_id}/cost")
+async def get_itinerary_cost(
+    itinerary_id: str,
+    currency: Optional[str] = None,
+    session: AuthenticatedSession = Depends(require_session)
+):
+    """Trip cost of a saved itinerary, in the user's preferred currency unless one is given"""
+    try:
+        itinerary = await db.saved_itineraries.find_one(
+            {"id": itinerary_id, "user_id": session.user_id}, {"_id": 0}
+        )
+        if not itinerary:
+            raise HTTPException(status_code=404, detail="Itinerary not found")
+        itinerary = itinerary_codec.decode(itinerary)
+        preferences = itinerary.get("preferences") or {}
+        
+        response = trip_cost_response(
+            (itinerary.get("destination") or {}).get("name"),
+            preferences.get("budget_range"),
+            preferences.get("duration"),
+            preferences.get("travelers"),
+            currency or session.user.get("preferences", {}).get("preferred_currency", "USD"),
+            itinerary.get("itinerary_data")
+        )
+        response["itinerary_id"] = itinerary_id
+        return FastJSONResponse(response)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Itinerary cost error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to estimate itinerary cost: {str(e)}")
+
+@api_router.post("/vibe-match")
 async def match_vibe_destinations(vibe_query: str, destination_type: Optional[str] = None, budget: Optional[str] = None):
     """Match destinations based on travel vibe"""
     try:
@@ -780,22 +1498,27 @@ async def match_vibe_destinations(vibe_query: str, destination_type: Optional[st
             vibe_query=vibe_query,
             matched_destinations=result.get("matched_destinations", []),
             vibe_score=result.get("vibe_score", 0.5),
-            reasoning=result.get("reasoning", "")
+            reasoning=result.get("reasoning", ""),
+            preferences=preferences,
+            fallback=result.get("fallback", False),
+            cache_hit="cache" in result
         )
         
-        await db.vibe_destinations.insert_one(vibe_destination.dict())
+        await db.vibe_destinations.insert_one(to_document(vibe_destination))
+        await update_rollups(insight_rollups.record_vibe_search(vibe_query))
+        trending.record("vibes", vibe_key(vibe_query))
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "vibe_query": vibe_query,
             "results": result
-        }
+        })
         
     except Exception as e:
         logging.error(f"Vibe matching error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Vibe matching failed: {str(e)}")
 
-@api_router.post("/destination-suggestions", response_model=Dict[str, Any])
+@api_router.post("/destination-suggestions")
 async def get_destination_suggestions(
     destination_type: str,
     budget_range: str,
@@ -805,6 +1528,7 @@ async def get_destination_suggestions(
 ):
     """Get destination suggestions based on preferences"""
     try:
+        trending.record("vibes", vibe_key(vibe))
         prompt = f"""
         Suggest 5 specific destinations for:
         - Type: {destination_type}
@@ -827,18 +1551,17 @@ async def get_destination_suggestions(
         }}]
         """
         
-        message = UserMessage(text=prompt)
-        response = await openai_chat.send_message(message)
-        
         try:
-            response_text = str(response)
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                destinations = json.loads(json_match.group())
-                return {
+            response_text = await send_prompt(openai_chat, prompt)
+            destinations = extract_json(response_text, "array")
+            if destinations is not None:
+                for suggestion in destinations:
+                    if isinstance(suggestion, dict) and isinstance(suggestion.get("name"), str):
+                        trending.record("destinations", canonical_destination(suggestion["name"]))
+                return FastJSONResponse({
                     "success": True,
                     "destinations": destinations
-                }
+                })
         except Exception:
             pass
         
@@ -861,16 +1584,16 @@ async def get_destination_suggestions(
             }
         ]
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "destinations": fallback_destinations
-        }
+        })
         
     except Exception as e:
         logging.error(f"Destination suggestions error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get suggestions: {str(e)}")
 
-@api_router.post("/activity-suggestions", response_model=Dict[str, Any])
+@api_router.post("/activity-suggestions")
 async def get_activity_suggestions(
     destination: str,
     travel_style: str,
@@ -905,23 +1628,19 @@ async def get_activity_suggestions(
         }}
         """
         
-        message = UserMessage(text=prompt)
-        response = await openai_chat.send_message(message)
-        
         try:
-            response_text = str(response)
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                activities = json.loads(json_match.group())
-                return {
+            response_text = await send_prompt(openai_chat, prompt)
+            activities = extract_json(response_text, "object")
+            if activities is not None:
+                return FastJSONResponse({
                     "success": True,
                     "activities": activities
-                }
+                })
         except Exception:
             pass
         
         # Fallback activities
-        return {
+        return FastJSONResponse({
             "success": True,
             "activities": {
                 "seasonal_activities": [
@@ -943,17 +1662,17 @@ async def get_activity_suggestions(
                     }
                 ]
             }
-        }
+        })
         
     except Exception as e:
         logging.error(f"Activity suggestions error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get activities: {str(e)}")
 
-@api_router.post("/smart-itinerary", response_model=Dict[str, Any])
+@api_router.post("/smart-itinerary")
 async def create_personalized_itinerary(preferences: TravelPreferences):
     """Create detailed itinerary - simplified to match frontend"""
     try:
-        logging.info(f"Creating itinerary with preferences: {preferences.dict()}")
+        logging.info(f"Creating itinerary with preferences: {to_document(preferences)}")
         
         itinerary_data = await create_smart_itinerary(preferences)
         
@@ -965,19 +1684,140 @@ async def create_personalized_itinerary(preferences: TravelPreferences):
             estimated_cost=itinerary_data.get("estimated_costs", {})
         )
         
-        await db.travel_recommendations.insert_one(recommendation.dict())
+        await db.travel_recommendations.insert_one(to_document(recommendation))
+        await update_rollups(insight_rollups.record_recommendation())
         
-        return {
+        return FastJSONResponse({
             "success": True,
-            "preferences": preferences.dict(),
+            "preferences": to_document(preferences),
             "itinerary": itinerary_data
-        }
+        })
         
     except Exception as e:
         logging.error(f"Itinerary creation error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Itinerary creation failed: {str(e)}")
 
-@api_router.get("/duration-recommendation", response_model=Dict[str, Any])
+@api_router.post("/smart-itinerary/stream")
+async def stream_personalized_itinerary(preferences: TravelPreferences, format: str = "sse"):
+    """Stream itinerary sections as server-sent events (or NDJSON) while Claude generates them.
+
+    Trips longer than ITINERARY_CHUNK_DAYS are generated in concurrent day ranges, as /smart-itinerary
+    does, and each range's days are sent as soon as it finishes. Shorter trips are parsed incrementally
+    from the model's token stream; if the chat client has no streaming API, the reply arrives as one
+    chunk and its sections are all sent together when it completes.
+    """
+    if format not in ("sse", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be 'sse' or 'ndjson'")
+
+    def encode(event: str, data: Any) -> str:
+        if format == "ndjson":
+            return dumps_str({"event": event, "data": data}) + "\n"
+        return f"event: {event}\ndata: {dumps_str(data)}\n\n"
+
+    async def event_stream():
+        yield encode("start", {"preferences": to_document(preferences)})
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        sections: Dict[str, Any] = {}
+        itinerary = None
+
+        if preferences.duration > ITINERARY_CHUNK_DAYS:
+            finished: asyncio.Queue = asyncio.Queue()
+            job = asyncio.create_task(create_long_smart_itinerary(preferences, on_chunk=finished.put_nowait))
+            job.add_done_callback(lambda _: finished.put_nowait(None))
+            try:
+                while True:
+                    days = await finished.get()
+                    if days is None:
+                        break
+                    if not sections:
+                        tracker("smart_itinerary_first_section").record(loop.time() - started)
+                    sections.setdefault("daily_itinerary", {}).update(days)
+                    for day, plan in days.items():
+                        yield encode("day", {"day": day, "plan": plan})
+                itinerary = job.result()
+                for key, value in itinerary.items():
+                    if key != "daily_itinerary":
+                        sections[key] = value
+                        yield encode(key, value)
+            except Exception as e:
+                logging.warning(f"Chunked itinerary stream error: {str(e)}, completing with fallback sections")
+            finally:
+                job.cancel()
+        else:
+            deadline = started + 20.0
+            parser = IncrementalJSONParser(expand=["daily_itinerary"])
+            chunks = stream_prompt(claude_chat, build_itinerary_prompt(preferences))
+
+            try:
+                while not parser.complete:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining)
+                    except StopAsyncIteration:
+                        break
+
+                    for path, value in parser.feed(chunk):
+                        if not sections:
+                            tracker("smart_itinerary_first_section").record(loop.time() - started)
+                        if path[0] == "daily_itinerary":
+                            sections.setdefault("daily_itinerary", {})[path[1]] = value
+                            yield encode("day", {"day": path[1], "plan": value})
+                        else:
+                            sections[path[0]] = value
+                            yield encode(path[0], value)
+            except asyncio.TimeoutError:
+                logging.warning("Claude AI stream timed out, completing with fallback sections")
+            except Exception as e:
+                logging.warning(f"Claude AI stream error: {str(e)}, completing with fallback sections")
+            finally:
+                await chunks.aclose()
+
+            try:
+                itinerary = parser.document()
+            except Exception as e:
+                logging.warning(f"Claude AI stream returned an unparseable itinerary: {str(e)}")
+
+        if itinerary is None:
+            # Fill whatever the model did not deliver from the deterministic fallback
+            fallback = build_fallback_itinerary(preferences)
+            days = sections.get("daily_itinerary", {})
+            for day, plan in fallback["daily_itinerary"].items():
+                if day not in days:
+                    days[day] = plan
+                    yield encode("day", {"day": day, "plan": plan})
+            sections["daily_itinerary"] = days
+            for key, value in fallback.items():
+                if key not in sections:
+                    sections[key] = value
+                    yield encode(key, value)
+            itinerary = sections
+
+        try:
+            recommendation = TravelRecommendation(
+                user_preferences=preferences,
+                destinations=[],
+                itinerary=itinerary,
+                estimated_cost=itinerary.get("estimated_costs", {})
+            )
+            await db.travel_recommendations.insert_one(to_document(recommendation))
+            await update_rollups(insight_rollups.record_recommendation())
+        except Exception as e:
+            logging.error(f"Saving streamed itinerary failed: {str(e)}")
+
+        yield encode("complete", {"success": True, "itinerary": itinerary})
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/event-stream"
+    return StreamingResponse(
+        event_stream(),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@api_router.get("/duration-recommendation")
 async def get_duration_recommendation(
     destination: str, 
     destination_type: str = "city", 
@@ -1015,19 +1855,15 @@ async def get_duration_recommendation(
         }}
         """
         
-        message = UserMessage(text=prompt)
-        response = await openai_chat.send_message(message)
-        
         try:
-            response_text = str(response)
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                recommendation = json.loads(json_match.group())
-                return {
+            response_text = await send_prompt(openai_chat, prompt)
+            recommendation = extract_json(response_text, "object")
+            if recommendation is not None:
+                return FastJSONResponse({
                     "success": True,
                     "destination": destination,
                     "recommendation": recommendation
-                }
+                })
         except:
             pass
         
@@ -1042,7 +1878,7 @@ async def get_duration_recommendation(
         
         duration = fallback_durations.get(destination_type, fallback_durations["city"])
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "destination": destination,
             "recommendation": {
@@ -1058,14 +1894,14 @@ async def get_duration_recommendation(
                     f"Up to {duration['maximum']} days if you want deep immersion"
                 ]
             }
-        }
+        })
         
     except Exception as e:
         logging.error(f"Duration recommendation error: {str(e)}")
-        return {
+        return FastJSONResponse({
             "success": False,
             "error": str(e)
-        }
+        })
 
 def is_valid_destination(destination: str) -> bool:
     """Check if destination appears to be a valid place name"""
@@ -1099,7 +1935,61 @@ def is_valid_destination(destination: str) -> bool:
     # For now, accept anything that has letters and basic punctuation
     return True
 
-@api_router.get("/destination-reviews", response_model=Dict[str, Any])
+# Simulated review data keyed by canonical place - in production, integrate with TripAdvisor/Google Places API
+SAMPLE_REVIEWS = {
+    "tokyo": [
+        "Amazing city! Very clean and safe. Public transport is excellent. Language barrier can be challenging but people are helpful.",
+        "Incredible experience in Tokyo. The food is outstanding, streets are spotless, and I felt completely safe even at night. Highly recommend!",
+        "Beautiful city with rich culture. Sometimes crowded but well-organized. Clean facilities everywhere and very safe for solo travelers.",
+        "Tokyo exceeded expectations! Super clean, efficient, and safe. The subway system is confusing at first but very reliable."
+    ],
+    "bangkok": [
+        "Vibrant city with amazing street food! Can be chaotic and hot. Some areas are cleaner than others. Generally safe in tourist areas.",
+        "Love Bangkok! Great food, friendly people. Traffic is crazy. Some areas need improvement in cleanliness but overall good experience.",
+        "Fascinating city with incredible temples and food. Weather is very hot and humid. Stay in good areas for safety and cleanliness.",
+        "Bangkok is amazing for food and culture. Some pollution and noise but that's part of the experience. Generally safe for tourists."
+    ],
+    "paris": [
+        "Beautiful city with amazing architecture and food. Some areas are cleaner than others. Generally safe but watch for pickpockets.",
+        "Paris is magical! Great museums, cafes, and culture. Metro can be crowded. Some tourist areas need better maintenance.",
+        "Lovely city with rich history. Food scene is incredible. Some parts are very clean, others less so. Stay alert in tourist areas.",
+        "Paris never disappoints! Beautiful sights, excellent cuisine. Public areas vary in cleanliness. Generally safe during daytime."
+    ]
+}
+
+async def destination_reviews_from_stats(destination: str, destination_key: str, stats: Dict[str, Any]) -> Dict[str, Any]:
+    """/destination-reviews response from stored stats and the latest stored analyses"""
+    aggregates = stats["aggregated_scores"]
+    summary_task = None
+    if REVIEW_SUMMARY_MODE == "llm":
+        summary_task = asyncio.create_task(generate_review_summary(destination, aggregates))
+
+    recent = await db.review_analyses.find(
+        {"destination": destination_key}, {"_id": 0}
+    ).sort("created_at", -1).limit(3).to_list(3)
+    analyses = [
+        {
+            "review": record["review_text"],
+            "analysis": {
+                field: record.get(field)
+                for field in ("overall_sentiment", "sentiment_confidence", "safety_score", "cleanliness_score", "key_insights")
+            }
+        }
+        for record in recent
+    ]
+
+    summary = await summary_task if summary_task is not None else build_review_summary(destination, aggregates)
+    return {
+        "success": True,
+        "destination": destination,
+        "review_count": stats["review_count"],
+        "aggregated_scores": aggregates,
+        "summary": summary,
+        "detailed_analyses": analyses,
+        "source": "Aggregated from multiple travel platforms"
+    }
+
+@api_router.get("/destination-reviews")
 async def get_destination_reviews(destination: str, review_type: str = "all"):
     """Get aggregated reviews and analysis for a destination"""
     try:
@@ -1110,36 +2000,15 @@ async def get_destination_reviews(destination: str, review_type: str = "all"):
                 detail=f"'{destination}' does not appear to be a valid destination. Please enter a real city, country, or place name."
             )
         
-        # Simulated review data - in production, integrate with TripAdvisor/Google Places API
-        sample_reviews = {
-            "tokyo": [
-                "Amazing city! Very clean and safe. Public transport is excellent. Language barrier can be challenging but people are helpful.",
-                "Incredible experience in Tokyo. The food is outstanding, streets are spotless, and I felt completely safe even at night. Highly recommend!",
-                "Beautiful city with rich culture. Sometimes crowded but well-organized. Clean facilities everywhere and very safe for solo travelers.",
-                "Tokyo exceeded expectations! Super clean, efficient, and safe. The subway system is confusing at first but very reliable."
-            ],
-            "bangkok": [
-                "Vibrant city with amazing street food! Can be chaotic and hot. Some areas are cleaner than others. Generally safe in tourist areas.",
-                "Love Bangkok! Great food, friendly people. Traffic is crazy. Some areas need improvement in cleanliness but overall good experience.",
-                "Fascinating city with incredible temples and food. Weather is very hot and humid. Stay in good areas for safety and cleanliness.",
-                "Bangkok is amazing for food and culture. Some pollution and noise but that's part of the experience. Generally safe for tourists."
-            ],
-            "paris": [
-                "Beautiful city with amazing architecture and food. Some areas are cleaner than others. Generally safe but watch for pickpockets.",
-                "Paris is magical! Great museums, cafes, and culture. Metro can be crowded. Some tourist areas need better maintenance.",
-                "Lovely city with rich history. Food scene is incredible. Some parts are very clean, others less so. Stay alert in tourist areas.",
-                "Paris never disappoints! Beautiful sights, excellent cuisine. Public areas vary in cleanliness. Generally safe during daytime."
-            ]
-        }
-        
-        destination_lower = destination.lower()
-        reviews = []
-        
-        # Find matching reviews
-        for place, place_reviews in sample_reviews.items():
-            if place in destination_lower or destination_lower in place:
-                reviews = place_reviews
-                break
+        # Known destinations are served from their running stats: one point read instead of re-analysis
+        destination_key = canonical_destination(destination)
+        stats = await review_stats.get(destination_key)
+        if stats is not None:
+            trending.record("destinations", destination_key)
+            return FastJSONResponse(await destination_reviews_from_stats(destination, destination_key, stats))
+
+        place = destination_matcher.resolve(destination)
+        reviews = SAMPLE_REVIEWS.get(place.key, []) if place else []
         
         if not reviews:
             # For unknown destinations, check if it's a reasonable place name first
@@ -1158,9 +2027,7 @@ async def get_destination_reviews(destination: str, review_type: str = "all"):
                 try:
                     prompt = f"""Is "{destination}" a real place that exists? If yes, generate 4 realistic travel reviews mentioning safety, cleanliness, and experience. If no, respond with "INVALID_DESTINATION"."""
                     
-                    message = UserMessage(text=prompt)
-                    response = await openai_chat.send_message(message)
-                    response_text = str(response)
+                    response_text = await send_prompt(openai_chat, prompt)
                     
                     if "INVALID_DESTINATION" in response_text.upper() or "not a real" in response_text.lower():
                         raise HTTPException(
@@ -1187,62 +2054,59 @@ async def get_destination_reviews(destination: str, review_type: str = "all"):
                     status_code=404, 
                     detail=f"No travel information available for '{destination}'. Please enter a valid city, region, or destination name."
                 )
+
+        # Only destinations that resolved (catalogue samples or LLM-confirmed) count towards trending
+        trending.record("destinations", destination_key)
         
-        # Analyze each review
-        analyses = []
-        total_safety = 0
-        total_cleanliness = 0
-        sentiment_counts = {"positive": 0, "neutral": 0, "negative": 0}
-        
-        for review in reviews:
-            analysis = await analyze_review_sentiment(review)
-            analyses.append({
-                "review": review,
-                "analysis": analysis
-            })
-            
-            total_safety += analysis.get("safety_score", 5.0)
-            total_cleanliness += analysis.get("cleanliness_score", 5.0)
-            sentiment = analysis.get("overall_sentiment", "neutral")
-            sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
-        
-        # Calculate aggregated scores
-        avg_safety = round(total_safety / len(reviews), 1)
-        avg_cleanliness = round(total_cleanliness / len(reviews), 1)
-        dominant_sentiment = max(sentiment_counts, key=sentiment_counts.get)
-        
-        # Generate overall summary
-        summary_prompt = f"""Based on these travel reviews for {destination}, provide a concise summary of:
-        1. Overall safety impression
-        2. Cleanliness standards
-        3. Key recommendations for travelers
-        
-        Reviews summary: Average safety {avg_safety}/10, cleanliness {avg_cleanliness}/10, mostly {dominant_sentiment} reviews."""
-        
-        message = UserMessage(text=summary_prompt)
-        summary_response = await openai_chat.send_message(message)
-        
-        return {
+        # Analyze all reviews concurrently (bounded by REVIEW_ANALYSIS_CONCURRENCY); the LLM summary
+        # starts as soon as enough scores are in
+        async def summarize(partial):
+            return await generate_review_summary(destination, aggregate_review_analyses(partial))
+
+        results, summary_task = await analyze_reviews_concurrently(
+            reviews,
+            analyze_review_bounded,
+            min(REVIEW_SUMMARY_MIN_SCORES, len(reviews)),
+            summarize if REVIEW_SUMMARY_MODE == "llm" else None
+        )
+
+        analyses = [{"review": review, "analysis": results[i]} for i, review in enumerate(reviews)]
+        aggregates = aggregate_review_analyses(results)
+
+        # The first fully analysed request for a catalogue place stores its sample analyses, which starts
+        # its stats; placeholder reviews for places without samples are never stored
+        fully_analysed = not any(result.get("fallback") for result in results)
+        if place is not None and place.key in SAMPLE_REVIEWS and fully_analysed and await review_stats.claim_seed(place.key):
+            try:
+                await store_review_analyses(
+                    [review_analysis_record(review, results[i], place.key) for i, review in enumerate(reviews)],
+                    place.key
+                )
+            except Exception as e:
+                logging.warning(f"Seeding review stats for {place.key} failed: {str(e)}")
+                await review_stats.release_seed(place.key)
+
+        if summary_task is not None:
+            summary = await summary_task
+        else:
+            summary = build_review_summary(destination, aggregates)
+
+        return FastJSONResponse({
             "success": True,
             "destination": destination,
             "review_count": len(reviews),
-            "aggregated_scores": {
-                "average_safety": avg_safety,
-                "average_cleanliness": avg_cleanliness,
-                "sentiment_distribution": sentiment_counts,
-                "dominant_sentiment": dominant_sentiment
-            },
-            "summary": str(summary_response),
+            "aggregated_scores": aggregates,
+            "summary": summary,
             "detailed_analyses": analyses[:3],  # Return top 3 detailed analyses
             "source": "Aggregated from multiple travel platforms"
-        }
+        })
         
     except Exception as e:
         logging.error(f"Destination reviews error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get destination reviews: {str(e)}")
 
-@api_router.post("/analyze-review", response_model=Dict[str, Any])
-async def analyze_travel_review(review_text: str):
+@api_router.post("/analyze-review")
+async def analyze_travel_review(review_text: str, destination: Optional[str] = None):
     """Analyze individual travel review for sentiment, safety, and cleanliness insights"""
     try:
         if len(review_text.strip()) < 10:
@@ -1250,23 +2114,16 @@ async def analyze_travel_review(review_text: str):
             
         analysis_result = await analyze_review_sentiment(review_text)
         
-        # Save analysis
-        review_analysis = ReviewAnalysis(
-            review_text=review_text,
-            overall_sentiment=analysis_result.get("overall_sentiment", "neutral"),
-            safety_score=analysis_result.get("safety_score", 5.0),
-            cleanliness_score=analysis_result.get("cleanliness_score", 5.0),
-            sentiment_confidence=analysis_result.get("sentiment_confidence", 0.5),
-            key_insights=analysis_result.get("key_insights", [])
-        )
-        
-        await db.review_analyses.insert_one(review_analysis.dict())
+        # Save analysis (fallbacks are only returned, not stored)
+        if not analysis_result.get("fallback"):
+            destination_key = canonical_destination(destination)
+            await store_review_analyses([review_analysis_record(review_text, analysis_result, destination_key)], destination_key)
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "review_text": review_text,
             "analysis": analysis_result
-        }
+        })
         
     except HTTPException:
         raise
@@ -1274,157 +2131,220 @@ async def analyze_travel_review(review_text: str):
         logging.error(f"Review analysis error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Review analysis failed: {str(e)}")
 
-@api_router.get("/convert-currency", response_model=Dict[str, Any])
+@api_router.post("/analyze-reviews")
+async def analyze_travel_reviews(request: ReviewBatchRequest):
+    """Analyze many reviews at once, streaming one NDJSON line per review as results arrive"""
+    reviews = request.reviews
+    if not reviews:
+        raise HTTPException(status_code=400, detail="No reviews provided")
+    if len(reviews) > REVIEW_BATCH_MAX_REVIEWS:
+        raise HTTPException(status_code=400, detail=f"At most {REVIEW_BATCH_MAX_REVIEWS} reviews per request")
+
+    destination_key = canonical_destination(request.destination)
+
+    def encode(event: str, data: Any) -> str:
+        return dumps_str({"event": event, "data": data}) + "\n"
+
+    async def result_stream():
+        records: List[Dict[str, Any]] = []
+        counts = {"local": 0, "cached": 0, "llm": 0, "fallback": 0, "rejected": 0}
+
+        def emit(index: int, analysis: Dict[str, Any], source: str) -> str:
+            counts[source] += 1
+            # Fallbacks are returned but never stored, so they cannot drag stats and rollups towards 5.0
+            if not analysis.get("fallback"):
+                records.append(review_analysis_record(reviews[index], analysis, destination_key))
+            return encode("result", {"index": index, "source": source, "analysis": analysis})
+
+        # Local scoring is one vectorized pass; only unsure reviews go on to the cache and the LLM
+        valid = [(i, text) for i, text in enumerate(reviews) if len(text.strip()) >= 10]
+        for i in sorted(set(range(len(reviews))) - {i for i, _ in valid}):
+            counts["rejected"] += 1
+            yield encode("error", {"index": i, "detail": "Review text too short"})
+
+        pending = []
+        local_results = local_sentiment.score([text for _, text in valid]) if valid else []
+        for (i, text), local in zip(valid, local_results):
+            if local["sentiment_confidence"] >= LOCAL_SENTIMENT_THRESHOLD:
+                sentiment_paths["local"] += 1
+                yield emit(i, local, "local")
+            else:
+                sentiment_paths["escalated"] += 1
+                pending.append((i, text))
+
+        cached = await asyncio.gather(*(sentiment_cache.get(text) for _, text in pending))
+        misses = []
+        for (i, text), analysis in zip(pending, cached):
+            if analysis is not None:
+                yield emit(i, analysis, "cached")
+            else:
+                misses.append((i, text))
+
+        semaphore = asyncio.Semaphore(REVIEW_BATCH_CONCURRENCY)
+
+        async def run_batch(batch: List[tuple]) -> List[tuple]:
+            async with semaphore:
+                try:
+                    async with tracker("review_batch_prompt").time():
+                        analyses = await analyze_review_batch_llm(
+                            [text for _, text in batch], timeout=REVIEW_BATCH_TIMEOUT
+                        )
+                except asyncio.TimeoutError:
+                    logging.warning(f"Batch review analysis of {len(batch)} reviews timed out")
+                    analyses = [None] * len(batch)
+                except Exception as e:
+                    logging.warning(f"Batch review analysis error: {str(e)}")
+                    analyses = [None] * len(batch)
+            return list(zip(batch, analyses))
+
+        batches = pack_review_batches(misses, REVIEW_BATCH_PROMPT_REVIEWS, REVIEW_BATCH_PROMPT_CHARS)
+        for finished in asyncio.as_completed([run_batch(batch) for batch in batches]):
+            for (i, text), analysis in await finished:
+                if analysis is None:
+                    yield emit(i, neutral_review_analysis(), "fallback")
+                else:
+                    await sentiment_cache.put(text, analysis)
+                    yield emit(i, analysis, "llm")
+
+        saved = 0
+        if records:
+            try:
+                await store_review_analyses(records, destination_key)
+                saved = len(records)
+            except Exception as e:
+                logging.error(f"Saving batch review analyses failed: {str(e)}")
+
+        yield encode("complete", {
+            "success": True,
+            "total": len(reviews),
+            "saved": saved,
+            "llm_prompts": len(batches),
+            "sources": counts
+        })
+
+    return StreamingResponse(
+        result_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@api_router.get("/convert-currency")
 async def convert_currency(amount: float, from_currency: str = "USD", to_currency: str = "USD"):
     """Convert currency using exchange rates"""
     try:
-        # Simplified currency conversion - in production, use a real API like exchangerate.host
-        exchange_rates = {
-            "USD": 1.0,
-            "EUR": 0.85,
-            "GBP": 0.73,
-            "JPY": 110.0,
-            "AUD": 1.35,
-            "CAD": 1.25,
-            "CHF": 0.92,
-            "CNY": 6.45,
-            "INR": 74.5,
-            "THB": 31.0,
-            "MXN": 20.0,
-            "BRL": 5.2,
-            "KRW": 1180.0,
-            "SGD": 1.35,
-            "HKD": 7.8,
-            "NOK": 8.5,
-            "SEK": 8.8,
-            "DKK": 6.3,
-            "PLN": 3.9,
-            "CZK": 21.5,
-            "HUF": 295.0,
-            "RUB": 73.0,
-            "TRY": 8.5,
-            "ZAR": 14.2,
-            "EGP": 15.7,
-            "AED": 3.67,
-            "SAR": 3.75,
-        }
-        
-        if from_currency not in exchange_rates or to_currency not in exchange_rates:
-            return {
+        try:
+            rate = exchange_rates.rate(from_currency.upper(), to_currency.upper())
+        except UnsupportedCurrency:
+            return FastJSONResponse({
                 "success": False,
                 "error": f"Currency {from_currency} or {to_currency} not supported"
-            }
-        
-        # Convert to USD first, then to target currency
-        usd_amount = amount / exchange_rates[from_currency]
-        converted_amount = usd_amount * exchange_rates[to_currency]
+            })
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "original_amount": amount,
             "from_currency": from_currency,
             "to_currency": to_currency,
-            "converted_amount": round(converted_amount, 2),
-            "exchange_rate": round(exchange_rates[to_currency] / exchange_rates[from_currency], 4)
-        }
+            "converted_amount": round(amount * rate, 2),
+            "exchange_rate": round(rate, 4)
+        })
         
     except Exception as e:
         logging.error(f"Currency conversion error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Currency conversion failed: {str(e)}")
 
-@api_router.get("/destination-currency", response_model=Dict[str, Any])
+@api_router.post("/convert-currency/bulk")
+async def convert_currency_bulk(request: BulkCurrencyConversionRequest):
+    """Convert arrays of amounts for many currency pairs in one call"""
+    total = sum(len(item.amounts) for item in request.conversions)
+    if total > CURRENCY_BULK_MAX_AMOUNTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {CURRENCY_BULK_MAX_AMOUNTS} amounts per request"
+        )
+    try:
+        pairs = [(item.from_currency.upper(), item.to_currency.upper()) for item in request.conversions]
+        rates, converted = exchange_rates.convert_batches(
+            [(item.amounts, source, target) for item, (source, target) in zip(request.conversions, pairs)]
+        )
+        results = []
+        for (source, target), rate, amounts in zip(pairs, rates.tolist(), converted):
+            if rate != rate:  # NaN marks an unsupported pair
+                results.append({
+                    "success": False,
+                    "from_currency": source,
+                    "to_currency": target,
+                    "error": f"Currency {source} or {target} not supported"
+                })
+                continue
+            results.append({
+                "success": True,
+                "from_currency": source,
+                "to_currency": target,
+                "exchange_rate": round(rate, 4),
+                "converted_amounts": amounts.round(2).tolist()
+            })
+
+        return FastJSONResponse({
+            "success": True,
+            "results": results,
+            "rates_source": exchange_rates.table.source,
+            "rates_updated_at": datetime.utcfromtimestamp(exchange_rates.table.loaded_at)
+        })
+
+    except Exception as e:
+        logging.error(f"Bulk currency conversion error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Currency conversion failed: {str(e)}")
+
+@api_router.get("/destination-currency")
 async def get_destination_currency(destination: str):
     """Get local currency for a destination"""
     try:
-        # Destination to currency mapping
-        destination_currencies = {
-            "japan": "JPY", "tokyo": "JPY", "kyoto": "JPY", "osaka": "JPY",
-            "thailand": "THB", "bangkok": "THB", "phuket": "THB", "chiang mai": "THB",
-            "india": "INR", "mumbai": "INR", "delhi": "INR", "goa": "INR", "kerala": "INR",
-            "france": "EUR", "paris": "EUR", "nice": "EUR", "lyon": "EUR",
-            "germany": "EUR", "berlin": "EUR", "munich": "EUR", "hamburg": "EUR",
-            "italy": "EUR", "rome": "EUR", "florence": "EUR", "venice": "EUR",
-            "spain": "EUR", "madrid": "EUR", "barcelona": "EUR", "seville": "EUR",
-            "uk": "GBP", "london": "GBP", "edinburgh": "GBP", "manchester": "GBP",
-            "australia": "AUD", "sydney": "AUD", "melbourne": "AUD", "brisbane": "AUD",
-            "canada": "CAD", "toronto": "CAD", "vancouver": "CAD", "montreal": "CAD",
-            "mexico": "MXN", "mexico city": "MXN", "cancun": "MXN", "tulum": "MXN",
-            "brazil": "BRL", "rio": "BRL", "sao paulo": "BRL", "salvador": "BRL",
-            "south korea": "KRW", "seoul": "KRW", "busan": "KRW",
-            "singapore": "SGD",
-            "hong kong": "HKD",
-            "norway": "NOK", "oslo": "NOK", "bergen": "NOK",
-            "sweden": "SEK", "stockholm": "SEK", "gothenburg": "SEK",
-            "denmark": "DKK", "copenhagen": "DKK",
-            "switzerland": "CHF", "zurich": "CHF", "geneva": "CHF",
-            "china": "CNY", "beijing": "CNY", "shanghai": "CNY",
-            "uae": "AED", "dubai": "AED", "abu dhabi": "AED",
-            "saudi arabia": "SAR", "riyadh": "SAR", "jeddah": "SAR",
-            "south africa": "ZAR", "cape town": "ZAR", "johannesburg": "ZAR",
-            "egypt": "EGP", "cairo": "EGP", "alexandria": "EGP",
-            "turkey": "TRY", "istanbul": "TRY", "ankara": "TRY",
-        }
+        place = destination_matcher.resolve(destination)
+        currency = place.currency if place else "USD"  # Default
         
-        destination_lower = destination.lower()
-        currency = "USD"  # Default
-        
-        for place, curr in destination_currencies.items():
-            if place in destination_lower:
-                currency = curr
-                break
-        
-        return {
+        return FastJSONResponse({
             "success": True,
             "destination": destination,
-            "currency": currency
-        }
+            "currency": currency,
+            "matched_place": place.name if place else None
+        })
         
     except Exception as e:
         logging.error(f"Destination currency error: {str(e)}")
-        return {
+        return FastJSONResponse({
             "success": True,
             "destination": destination,
             "currency": "USD"
-        }
+        })
 
-@api_router.get("/travel-insights", response_model=Dict[str, Any])
-async def get_travel_insights():
-    """Get aggregated travel insights and statistics"""
+@api_router.get("/travel-insights")
+async def get_travel_insights(window: str = "7d"):
+    """Get aggregated travel insights and statistics for a time window (e.g. 24h, 7d, 30d)"""
     try:
-        # Get recent analyses
-        recent_reviews = await db.review_analyses.find().sort("created_at", -1).limit(10).to_list(10)
-        recent_recommendations = await db.travel_recommendations.find().sort("created_at", -1).limit(5).to_list(5)
-        recent_vibes = await db.vibe_destinations.find().sort("created_at", -1).limit(5).to_list(5)
-        
-        # Calculate averages
-        if recent_reviews:
-            avg_safety = sum(r.get("safety_score", 0) for r in recent_reviews) / len(recent_reviews)
-            avg_cleanliness = sum(r.get("cleanliness_score", 0) for r in recent_reviews) / len(recent_reviews)
-            sentiment_distribution = {}
-            for review in recent_reviews:
-                sentiment = review.get("overall_sentiment", "neutral")
-                sentiment_distribution[sentiment] = sentiment_distribution.get(sentiment, 0) + 1
-        else:
-            avg_safety = 0
-            avg_cleanliness = 0
-            sentiment_distribution = {}
+        # Computed from at most one rollup document per hour/day in the window, whatever the collection sizes
+        insights = await insight_rollups.insights(window)
+        # Trending is all-time with decay, read from memory rather than the window's rollups
+        insights["trending"] = trending_snapshot()
         
-        return {
+        return FastJSONResponse({
             "success": True,
-            "insights": {
-                "total_reviews_analyzed": len(recent_reviews),
-                "average_safety_score": round(avg_safety, 2),
-                "average_cleanliness_score": round(avg_cleanliness, 2),
-                "sentiment_distribution": sentiment_distribution,
-                "recent_recommendations": len(recent_recommendations),
-                "popular_vibes": [v.get("vibe_query", "") for v in recent_vibes[:3]]
-            }
-        }
+            "insights": insights
+        })
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error(f"Insights error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get insights: {str(e)}")
 
+@api_router.get("/trending")
+async def get_trending(limit: int = TRENDING_LIMIT):
+    """Most requested vibes and destinations (approximate counts with a guaranteed lower bound)"""
+    if not 1 <= limit <= 50:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 50")
+    return FastJSONResponse({"success": True, "trending": trending_snapshot(limit), "stats": trending.stats()})
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -1445,9 +2365,33 @@ logger = logging.getLogger(__name__)
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if trending.task:
+        trending.task.cancel()
+    try:
+        await trending.checkpoint()
+    except Exception as e:
+        logging.warning(f"Final trending checkpoint failed: {str(e)}")
     client.close()
+    await close_shared_http_client()
+    password_hasher.executor.shutdown(wait=False)
+
+# Result of the startup index pass, exposed through /api/metrics
+index_report: Dict[str, Any] = {}
 
 @app.on_event("startup")  
 async def startup_event():
     logger.info("WanderWise AI Travel Platform starting up...")
-    logger.info("AI models initialized successfully")
\ No newline at end of file
+    configure_shared_http_client()
+    logger.info("AI models initialized successfully")
+    if await exchange_rates.refresh():
+        logger.info(f"Loaded {len(exchange_rates.table.currencies)} exchange rates from {exchange_rates.table.source}")
+    index_report.update(await ensure_indexes(db, index_registry(review_sentiment_ttl=sentiment_cache.ttl_seconds)))
+    logger.info(
+        f"Ensured {len(index_report['indexes'])} indexes; "
+        f"{len(index_report['uncovered'])} queries without full index coverage"
+    )
+    loaded = await vibe_cache.warm(db.vibe_destinations)
+    logger.info(f"Vibe cache warmed with {loaded} stored results")
+    restored = await trending.restore()
+    trending.task = asyncio.create_task(trending.run())
+    logger.info(f"Trending counters restored from {restored} checkpoints")
\ No newline at end of file
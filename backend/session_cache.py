@@ -0,0 +1,134 @@
+"""In-process cache of authenticated sessions in front of the sessions and users collections"""
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Set
+
+from cachetools import TTLCache
+
+# Fields of the user document that authenticated endpoints need
+USER_PROJECTION = {"_id": 0, "id": 1, "email": 1, "name": 1, "preferences": 1}
+
+# generate_session_token() produces URL-safe base64; anything else can be rejected without a lookup
+_TOKEN_SHAPE = re.compile(r"[A-Za-z0-9_\-]{20,128}")
+
+
+class SessionError(Exception):
+    """The token does not resolve to a live session; str(e) is the client-facing detail"""
+
+
+@dataclass
+class AuthenticatedSession:
+    token: str
+    user_id: str
+    expires_at: datetime
+    user: Dict[str, Any]
+
+
+class SessionCache:
+    """token -> AuthenticatedSession with a TTL, plus a short-lived negative cache for invalid tokens.
+
+    Entries live for at most ttl_seconds, so changes made by other processes show up within that
+    window; changes made here should call invalidate_user / invalidate_token.
+    """
+
+    def __init__(
+        self,
+        sessions,
+        users,
+        maxsize: int = 10000,
+        ttl_seconds: int = 300,
+        negative_maxsize: int = 50000,
+        negative_ttl_seconds: int = 60
+    ):
+        self.sessions = sessions
+        self.users = users
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self.invalid = TTLCache(maxsize=negative_maxsize, ttl=negative_ttl_seconds)
+        self.tokens_by_user: Dict[str, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.malformed = 0
+        self.invalidations = 0
+
+    def remember(self, token: str, user: Dict[str, Any], expires_at: datetime) -> AuthenticatedSession:
+        """Cache a session known to be valid (e.g. just created by login)"""
+        session = AuthenticatedSession(
+            token=token,
+            user_id=user["id"],
+            expires_at=expires_at,
+            user={key: user[key] for key in ("id", "email", "name", "preferences") if key in user}
+        )
+        self.invalid.pop(token, None)
+        self.memory[token] = session
+        # Tokens the TTL cache has since expired are pruned here rather than tracked individually
+        tokens = {t for t in self.tokens_by_user.get(session.user_id, ()) if t in self.memory}
+        tokens.add(token)
+        self.tokens_by_user[session.user_id] = tokens
+        return session
+
+    def _reject(self, token: str, detail: str) -> SessionError:
+        self.invalid[token] = detail
+        return SessionError(detail)
+
+    async def resolve(self, token: str) -> AuthenticatedSession:
+        """Return the session for token or raise SessionError"""
+        if not token or not _TOKEN_SHAPE.fullmatch(token):
+            self.malformed += 1
+            raise SessionError("Invalid session")
+
+        detail = self.invalid.get(token)
+        if detail is not None:
+            self.negative_hits += 1
+            raise SessionError(detail)
+
+        session = self.memory.get(token)
+        if session is not None:
+            if datetime.utcnow() > session.expires_at:
+                self.invalidate_token(token)
+                raise self._reject(token, "Session expired")
+            self.hits += 1
+            return session
+
+        self.misses += 1
+        doc = await self.sessions.find_one({"token": token}, {"_id": 0, "user_id": 1, "expires_at": 1})
+        if not doc:
+            raise self._reject(token, "Invalid session")
+        # The TTL index deletes expired sessions, but only on its own (roughly minute-long) cycle
+        if datetime.utcnow() > doc["expires_at"]:
+            raise self._reject(token, "Session expired")
+
+        user = await self.users.find_one({"id": doc["user_id"]}, USER_PROJECTION)
+        if not user:
+            raise self._reject(token, "User not found")
+        return self.remember(token, user, doc["expires_at"])
+
+    def invalidate_token(self, token: str) -> None:
+        session = self.memory.pop(token, None)
+        if session is not None:
+            self.invalidations += 1
+            tokens = self.tokens_by_user.get(session.user_id)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self.tokens_by_user[session.user_id]
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop every cached session of a user, e.g. after their profile or preferences change"""
+        for token in self.tokens_by_user.pop(user_id, set()):
+            if self.memory.pop(token, None) is not None:
+                self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "malformed": self.malformed,
+            "invalidations": self.invalidations,
+            "entries": len(self.memory),
+            "negative_entries": len(self.invalid),
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
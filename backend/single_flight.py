@@ -0,0 +1,43 @@
+"""Single-flight coalescing: concurrent identical calls share one in-flight future"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls onto one in-flight future"""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            self.leaders += 1
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done, key=key: self._finish(key, done))
+
+        # Shield so one caller being cancelled doesn't cancel the call for every waiter
+        return await asyncio.shield(future)
+
+    def _finish(self, key: str, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled() and future.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.leaders + self.coalesced
+        return {
+            "calls": total,
+            "llm_calls": self.leaders,
+            "calls_saved": self.coalesced,
+            "errors": self.errors,
+            "in_flight": len(self._inflight),
+            "saved_ratio": round(self.coalesced / total, 3) if total else 0.0,
+        }
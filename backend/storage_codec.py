@@ -0,0 +1,85 @@
+"""Optional compressed storage for large saved-itinerary payloads"""
+import zlib
+from typing import Any, Dict, Optional
+
+import orjson
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; zlib is always available
+    zstandard = None
+
+CODECS = ("none", "zlib", "zstd")
+BLOB_FIELD = "itinerary_blob"
+CODEC_FIELD = "itinerary_codec"
+
+
+class ItineraryCodec:
+    """Moves itinerary_data into a compressed binary field and back.
+
+    Only itinerary_data is compressed: destination and preferences are small and the
+    /itineraries/my summaries read them, so they stay queryable as plain fields.
+    """
+
+    def __init__(self, codec: str = "none", level: Optional[int] = None, min_size: int = 1024):
+        if codec not in CODECS:
+            raise ValueError(f"Unsupported itinerary codec {codec!r}, expected one of {CODECS}")
+        if codec == "zstd" and zstandard is None:
+            raise ValueError("Itinerary codec 'zstd' requires the zstandard package")
+        self.codec = codec
+        self.level = level
+        self.min_size = min_size
+        self.encoded = 0
+        self.decoded = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    def compress(self, payload: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            return zstandard.ZstdCompressor(level=self.level or 3).compress(payload)
+        return zlib.compress(payload, 6 if self.level is None else self.level)
+
+    @staticmethod
+    def decompress(blob: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            if zstandard is None:
+                raise ValueError("Stored itinerary uses zstd but the zstandard package is not installed")
+            return zstandard.ZstdDecompressor().decompress(blob)
+        if codec == "zlib":
+            return zlib.decompress(blob)
+        raise ValueError(f"Unknown itinerary codec {codec!r}")
+
+    def encode(self, doc: Dict[str, Any], codec: Optional[str] = None) -> Dict[str, Any]:
+        """Document ready for storage; small payloads (and codec "none") are left as they are"""
+        codec = codec or self.codec
+        if codec == "none" or "itinerary_data" not in doc:
+            return doc
+        payload = orjson.dumps(doc["itinerary_data"])
+        if len(payload) < self.min_size:
+            return doc
+
+        blob = self.compress(payload, codec)
+        self.encoded += 1
+        self.raw_bytes += len(payload)
+        self.stored_bytes += len(blob)
+        stored = {key: value for key, value in doc.items() if key != "itinerary_data"}
+        stored[BLOB_FIELD] = blob
+        stored[CODEC_FIELD] = codec
+        return stored
+
+    def decode(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Inverse of encode; documents without a blob pass through unchanged"""
+        if BLOB_FIELD not in doc:
+            return doc
+        self.decoded += 1
+        decoded = {key: value for key, value in doc.items() if key not in (BLOB_FIELD, CODEC_FIELD)}
+        decoded["itinerary_data"] = orjson.loads(self.decompress(bytes(doc[BLOB_FIELD]), doc.get(CODEC_FIELD, "zlib")))
+        return decoded
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "codec": self.codec,
+            "encoded": self.encoded,
+            "decoded": self.decoded,
+            "compression_ratio": round(self.raw_bytes / self.stored_bytes, 2) if self.stored_bytes else 0.0,
+        }
@@ -0,0 +1,171 @@
+"""Semantic response cache for vibe matching backed by hashed n-gram vectors"""
+import logging
+import re
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from datetime import timezone
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "with", "for", "to", "of", "in", "on", "at", "some", "somewhere",
+    "i", "im", "want", "wanna", "would", "like", "looking", "place", "places", "trip", "travel", "me", "my",
+    "really", "very", "super", "lots", "lot", "great", "good",
+}
+
+# Small canonicalization map so common paraphrases land on the same tokens
+SYNONYMS = {
+    "chill": "relax", "chilled": "relax", "chilling": "relax", "relaxing": "relax", "relaxed": "relax",
+    "relaxation": "relax", "calm": "relax", "peaceful": "relax", "quiet": "relax", "laid": "relax",
+    "vibes": "vibe", "beaches": "beach", "seaside": "beach", "coastal": "beach",
+    "mountains": "mountain", "hiking": "hike", "hikes": "hike",
+    "partying": "party", "parties": "party", "nightlife": "party",
+    "romance": "romantic", "cheap": "budget", "affordable": "budget", "luxurious": "luxury",
+}
+
+
+def normalize_vibe_query(vibe_query: str) -> str:
+    """Lowercase, strip punctuation, drop filler words and canonicalize common synonyms"""
+    words = re.findall(r"[a-z0-9]+", vibe_query.lower())
+    tokens = [SYNONYMS.get(word, word) for word in words if word not in STOPWORDS]
+    return " ".join(tokens)
+
+
+def vectorize(text: str, dim: int) -> np.ndarray:
+    """L2-normalized hashed vector of word unigrams and character trigrams"""
+    vector = np.zeros(dim, dtype=np.float32)
+    for word in text.split():
+        vector[zlib.crc32(f"w:{word}".encode()) % dim] += 2.0
+        padded = f"^{word}$"
+        for i in range(len(padded) - 2):
+            vector[zlib.crc32(padded[i:i + 3].encode()) % dim] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SemanticVibeCache:
+    """Near-duplicate lookup of vibe-match results partitioned by preferences"""
+
+    def __init__(self, threshold: float = 0.82, max_entries: int = 2000, ttl_seconds: int = 7 * 24 * 3600, dim: int = 1024):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.dim = dim
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._keys = []
+        self._partitions = np.zeros(0, dtype=object)
+        self._created = np.zeros(0, dtype=np.float64)
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def partition_for(preferences: Dict[str, Any]) -> str:
+        destination_type = str(preferences.get("destination_type") or "any").lower()
+        budget = str(preferences.get("budget") or "mid-range").lower()
+        return f"{destination_type}|{budget}"
+
+    def _rebuild(self) -> None:
+        self._keys = list(self._entries.keys())
+        entries = list(self._entries.values())
+        if entries:
+            self._matrix = np.vstack([entry["vector"] for entry in entries])
+        else:
+            self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+        self._partitions = np.array([entry["partition"] for entry in entries], dtype=object)
+        self._created = np.array([entry["created_at"] for entry in entries], dtype=np.float64)
+        self._dirty = False
+
+    def _expire(self, now: float) -> None:
+        expired = [key for key, entry in self._entries.items() if now - entry["created_at"] > self.ttl_seconds]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            self.expirations += len(expired)
+            self._dirty = True
+
+    def lookup(self, vibe_query: str, preferences: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Return (stored result, similarity) for the closest cached query above the threshold"""
+        now = time.time()
+        if self._dirty:
+            self._rebuild()
+
+        if self._keys:
+            query_vector = vectorize(normalize_vibe_query(vibe_query), self.dim)
+            similarities = self._matrix @ query_vector
+            valid = (self._partitions == self.partition_for(preferences)) & (now - self._created <= self.ttl_seconds)
+            similarities = np.where(valid, similarities, -1.0)
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+
+            if similarity >= self.threshold:
+                key = self._keys[best]
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]["result"], similarity
+
+        self.misses += 1
+        self._expire(now)
+        return None
+
+    def add(self, vibe_query: str, preferences: Dict[str, Any], result: Dict[str, Any], created_at: Optional[float] = None) -> None:
+        normalized = normalize_vibe_query(vibe_query)
+        if not normalized:
+            return
+        self._entries[uuid.uuid4().hex] = {
+            "query": normalized,
+            "partition": self.partition_for(preferences),
+            "vector": vectorize(normalized, self.dim),
+            "result": result,
+            "created_at": created_at if created_at is not None else time.time(),
+        }
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        self._dirty = True
+
+    async def warm(self, collection, limit: int = 1000) -> int:
+        """Load recent stored vibe matches so the cache survives restarts"""
+        cutoff = time.time() - self.ttl_seconds
+        loaded = 0
+        try:
+            docs = await collection.find(
+                {"preferences": {"$exists": True}, "fallback": False, "cache_hit": False},
+                {"_id": 0, "vibe_query": 1, "preferences": 1, "matched_destinations": 1,
+                 "vibe_score": 1, "reasoning": 1, "created_at": 1}
+            ).sort("created_at", -1).limit(limit).to_list(limit)
+        except Exception as e:
+            logging.warning(f"Vibe cache warm-up failed: {str(e)}")
+            return 0
+
+        for doc in reversed(docs):
+            created_at = doc["created_at"].replace(tzinfo=timezone.utc).timestamp() if doc.get("created_at") else time.time()
+            if created_at < cutoff or not doc.get("matched_destinations"):
+                continue
+            self.add(doc["vibe_query"], doc.get("preferences", {}), {
+                "matched_destinations": doc["matched_destinations"],
+                "vibe_score": doc.get("vibe_score", 0.5),
+                "reasoning": doc.get("reasoning", "")
+            }, created_at=created_at)
+            loaded += 1
+        return loaded
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "threshold": self.threshold,
+            "ttl_seconds": self.ttl_seconds,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -116,13 +116,14 @@ export const AuthProvider = ({ children }) => {
     try {
       const params = new URLSearchParams();
       params.append('session_token', sessionToken);
-      params.append('title', title);
-      params.append('destination', JSON.stringify(destination));
-      params.append('itinerary_data', JSON.stringify(itineraryData));
-      params.append('travel_dates', JSON.stringify(travelDates));
-      params.append('preferences', JSON.stringify(preferences));
       
-      const response = await axios.post(`${API}/itineraries/save?${params.toString()}`);
+      const response = await axios.post(`${API}/itineraries?${params.toString()}`, {
+        title,
+        destination,
+        itinerary_data: itineraryData,
+        travel_dates: travelDates,
+        preferences
+      });
       return response.data;
     } catch (error) {
       console.error('Save itinerary failed:', error);
@@ -130,7 +131,7 @@ export const AuthProvider = ({ children }) => {
     }
   };
 
-  const getSavedItineraries = async () => {
+  const getSavedItineraries = async (cursor = null) => {
     if (!sessionToken) {
       throw new Error('Must be logged in to get saved itineraries');
     }
@@ -138,15 +139,38 @@ export const AuthProvider = ({ children }) => {
     try {
       const params = new URLSearchParams();
       params.append('session_token', sessionToken);
+      if (cursor) {
+        params.append('cursor', cursor);
+      }
       
       const response = await axios.get(`${API}/itineraries/my?${params.toString()}`);
-      return response.data.itineraries;
+      return {
+        itineraries: response.data.itineraries,
+        nextCursor: response.data.next_cursor
+      };
     } catch (error) {
       console.error('Get saved itineraries failed:', error);
       throw error;
     }
   };
 
+  const getItinerary = async (itineraryId) => {
+    if (!sessionToken) {
+      throw new Error('Must be logged in to view saved itineraries');
+    }
+
+    try {
+      const params = new URLSearchParams();
+      params.append('session_token', sessionToken);
+      
+      const response = await axios.get(`${API}/itineraries/${itineraryId}?${params.toString()}`);
+      return response.data.itinerary;
+    } catch (error) {
+      console.error('Get itinerary failed:', error);
+      throw error;
+    }
+  };
+
   const deleteItinerary = async (itineraryId) => {
     if (!sessionToken) {
       throw new Error('Must be logged in to delete itinerary');
@@ -230,6 +254,7 @@ export const AuthProvider = ({ children }) => {
     clearTripData,
     saveItinerary,
     getSavedItineraries,
+    getItinerary,
     deleteItinerary,
     getUserPreferences,
     updateUserPreferences,
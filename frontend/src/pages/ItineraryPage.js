@@ -70,6 +70,7 @@ const ItineraryPage = () => {
     try {
       const costs = itineraryData.itinerary.estimated_costs;
       const converted = {};
+      const ranges = [];
       
       for (const [category, cost] of Object.entries(costs)) {
         // Extract numeric values from cost strings like "$120-250 per night"
@@ -77,27 +78,40 @@ const ItineraryPage = () => {
         if (matches) {
           const minAmount = parseInt(matches[1]);
           const maxAmount = matches[2] ? parseInt(matches[2]) : minAmount;
-          
-          const minResponse = await axios.get(`${API}/convert-currency?amount=${minAmount}&from_currency=USD&to_currency=${targetCurrency}`);
-          const maxResponse = await axios.get(`${API}/convert-currency?amount=${maxAmount}&from_currency=USD&to_currency=${targetCurrency}`);
-          
-          if (minResponse.data.success && maxResponse.data.success) {
-            const minConverted = Math.round(minResponse.data.converted_amount);
-            const maxConverted = Math.round(maxResponse.data.converted_amount);
-            
-            if (minAmount === maxAmount) {
-              converted[category] = `${minConverted} ${targetCurrency}${cost.includes('per') ? cost.substring(cost.indexOf(' per')) : ''}`;
-            } else {
-              converted[category] = `${minConverted}-${maxConverted} ${targetCurrency}${cost.includes('per') ? cost.substring(cost.indexOf(' per')) : ''}`;
-            }
-          } else {
-            converted[category] = cost; // Keep original if conversion fails
-          }
+          ranges.push({ category, cost, minAmount, maxAmount });
         } else {
           converted[category] = cost; // Keep original if no numeric value found
         }
       }
       
+      if (ranges.length > 0) {
+        // One request converts every min/max amount
+        const response = await axios.post(`${API}/convert-currency/bulk`, {
+          conversions: [{
+            amounts: ranges.flatMap(({ minAmount, maxAmount }) => [minAmount, maxAmount]),
+            from_currency: "USD",
+            to_currency: targetCurrency
+          }]
+        });
+        const result = response.data.results[0];
+        
+        ranges.forEach(({ category, cost, minAmount, maxAmount }, i) => {
+          if (!result.success) {
+            converted[category] = cost; // Keep original if conversion fails
+            return;
+          }
+          const minConverted = Math.round(result.converted_amounts[2 * i]);
+          const maxConverted = Math.round(result.converted_amounts[2 * i + 1]);
+          const suffix = cost.includes('per') ? cost.substring(cost.indexOf(' per')) : '';
+          
+          if (minAmount === maxAmount) {
+            converted[category] = `${minConverted} ${targetCurrency}${suffix}`;
+          } else {
+            converted[category] = `${minConverted}-${maxConverted} ${targetCurrency}${suffix}`;
+          }
+        });
+      }
+      
       setConvertedCosts(converted);
       toast.success(`Costs converted to ${targetCurrency}!`);
     } catch (error) {
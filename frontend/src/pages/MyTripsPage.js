@@ -9,9 +9,12 @@ import { toast } from "sonner";
 
 const MyTripsPage = () => {
   const navigate = useNavigate();
-  const { user, getSavedItineraries, deleteItinerary, isAuthenticated } = useAuth();
+  const { user, getSavedItineraries, getItinerary, deleteItinerary, isAuthenticated } = useAuth();
   const [trips, setTrips] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [opening, setOpening] = useState({});
   const [deleting, setDeleting] = useState({});
 
   useEffect(() => {
@@ -26,8 +29,9 @@ const MyTripsPage = () => {
   const loadTrips = async () => {
     try {
       setLoading(true);
-      const savedTrips = await getSavedItineraries();
-      setTrips(savedTrips);
+      const page = await getSavedItineraries();
+      setTrips(page.itineraries);
+      setNextCursor(page.nextCursor);
     } catch (error) {
       console.error('Failed to load trips:', error);
       toast.error("Failed to load your trips");
@@ -36,6 +40,20 @@ const MyTripsPage = () => {
     }
   };
 
+  const loadMoreTrips = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await getSavedItineraries(nextCursor);
+      setTrips(prev => [...prev, ...page.itineraries]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error('Failed to load more trips:', error);
+      toast.error("Failed to load more trips");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleDeleteTrip = async (tripId, tripTitle) => {
     if (!window.confirm(`Are you sure you want to delete "${tripTitle}"?`)) {
       return;
@@ -55,19 +73,31 @@ const MyTripsPage = () => {
     }
   };
 
-  const handleViewTrip = (trip) => {
-    // Load the trip data into localStorage and navigate to itinerary page
-    localStorage.setItem('generatedItinerary', JSON.stringify({
-      destination: trip.destination,
-      itinerary: trip.itinerary_data,
-      travelDates: trip.travel_dates,
-      preferences: trip.preferences,
-      travelers: trip.preferences?.travelers || "2",
-      savedTripId: trip.id,
-      title: trip.title
-    }));
-    
-    navigate('/itinerary');
+  const handleViewTrip = async (summary) => {
+    setOpening(prev => ({ ...prev, [summary.id]: true }));
+
+    try {
+      // The list only carries summaries; fetch the full itinerary before opening it
+      const trip = await getItinerary(summary.id);
+
+      // Load the trip data into localStorage and navigate to itinerary page
+      localStorage.setItem('generatedItinerary', JSON.stringify({
+        destination: trip.destination,
+        itinerary: trip.itinerary_data,
+        travelDates: trip.travel_dates,
+        preferences: trip.preferences,
+        travelers: trip.preferences?.travelers || "2",
+        savedTripId: trip.id,
+        title: trip.title
+      }));
+      
+      navigate('/itinerary');
+    } catch (error) {
+      console.error('Failed to open trip:', error);
+      toast.error("Failed to open trip");
+    } finally {
+      setOpening(prev => ({ ...prev, [summary.id]: false }));
+    }
   };
 
   const formatDate = (dateString) => {
@@ -237,6 +267,7 @@ const MyTripsPage = () => {
                       <div className="flex gap-2 pt-2">
                         <Button 
                           onClick={() => handleViewTrip(trip)}
+                          disabled={opening[trip.id]}
                           className="flex-1 bg-gradient-to-r from-emerald-600 to-teal-600 hover:from-emerald-700 hover:to-teal-700 text-white"
                         >
                           <Eye className="w-4 h-4 mr-2" />
@@ -257,6 +288,19 @@ const MyTripsPage = () => {
               ))}
             </div>
           )}
+
+          {/* Pagination */}
+          {!loading && nextCursor && (
+            <div className="text-center mt-8">
+              <Button 
+                variant="outline"
+                onClick={loadMoreTrips}
+                disabled={loadingMore}
+              >
+                {loadingMore ? 'Loading...' : 'Load More Trips'}
+              </Button>
+            </div>
+          )}
         </div>
 
         {/* Quick Actions */}
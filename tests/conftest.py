@@ -0,0 +1,123 @@
+import copy
+import sys
+import uuid
+from pathlib import Path
+
+# Backend modules are imported the way uvicorn loads them (from the backend directory)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from pymongo.errors import DuplicateKeyError  # noqa: E402
+
+
+class FakeCursor:
+    """The cursor calls the backend makes: async iteration and to_list"""
+
+    def __init__(self, docs):
+        self.docs = list(docs)
+
+    def __aiter__(self):
+        self._iter = iter(self.docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def to_list(self, length):
+        return self.docs[:length] if length else self.docs
+
+
+class FakeCollection:
+    """In-memory stand-in for the Motor collection methods the backend modules call.
+
+    Documents are kept by _id. bulk_write requests and aggregate pipelines are recorded as
+    received; aggregate does not evaluate pipelines and returns `aggregate_results` instead.
+    """
+
+    def __init__(self, aggregate_results=()):
+        self.docs = {}
+        self.writes = []
+        self.pipelines = []
+        self.aggregate_results = list(aggregate_results)
+        self.reads = 0
+
+    @staticmethod
+    def matches(doc, query):
+        for key, condition in query.items():
+            if isinstance(condition, dict) and "$ne" in condition:
+                if doc.get(key) == condition["$ne"]:
+                    return False
+            elif isinstance(condition, dict) and "$exists" in condition:
+                if (key in doc) != condition["$exists"]:
+                    return False
+            elif isinstance(condition, dict) and "$in" in condition:
+                if doc.get(key) not in condition["$in"]:
+                    return False
+            elif doc.get(key) != condition:
+                return False
+        return True
+
+    def _matching(self, query):
+        return [doc for doc in self.docs.values() if self.matches(doc, query or {})]
+
+    @staticmethod
+    def _apply(doc, update):
+        for path, amount in update.get("$inc", {}).items():
+            target = doc
+            *parents, leaf = path.split(".")
+            for part in parents:
+                target = target.setdefault(part, {})
+            target[leaf] = target.get(leaf, 0) + amount
+        doc.update(update.get("$set", {}))
+        for field in update.get("$unset", {}):
+            doc.pop(field, None)
+
+    async def find_one(self, query, projection=None):
+        self.reads += 1
+        found = self._matching(query)
+        return copy.deepcopy(found[0]) if found else None
+
+    def find(self, query=None, projection=None):
+        return FakeCursor(copy.deepcopy(self._matching(query)))
+
+    async def update_one(self, query, update, upsert=False):
+        found = self._matching(query)
+        if found:
+            self._apply(found[0], update)
+            return
+        if not upsert:
+            return
+        if "_id" in query and query["_id"] in self.docs:
+            # The filter's other conditions failed, so the upsert collides with the existing _id
+            raise DuplicateKeyError("E11000 duplicate key")
+        doc = {key: value for key, value in query.items() if not isinstance(value, dict)}
+        doc.setdefault("_id", uuid.uuid4().hex)
+        doc.update(update.get("$setOnInsert", {}))
+        self._apply(doc, update)
+        self.docs[doc["_id"]] = doc
+
+    async def insert_one(self, doc):
+        doc.setdefault("_id", uuid.uuid4().hex)
+        if doc["_id"] in self.docs:
+            raise DuplicateKeyError("E11000 duplicate key")
+        self.docs[doc["_id"]] = copy.deepcopy(doc)
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = {"_id": query["_id"], **doc}
+
+    async def delete_one(self, query):
+        found = self._matching(query)
+        if found:
+            del self.docs[found[0]["_id"]]
+
+    async def bulk_write(self, requests, ordered=True):
+        self.writes.extend(requests)
+        for request in requests:
+            await self.update_one(request._filter, request._doc, upsert=request._upsert)
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return FakeCursor(self.aggregate_results)
+
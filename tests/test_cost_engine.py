@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from cost_engine import (
+    BUDGET_TIERS,
+    CATEGORIES,
+    CostEngine,
+    normalize_tier,
+    parse_cost_range,
+    parse_cost_unit,
+)
+
+engine = CostEngine()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$80-150 per night", (80, 150)),
+    ("$3,000 - $4,500", (3000, 4500)),
+    ("$12.50", (12.5, 12.5)),
+    ("$200 to $100", (100, 200)),
+    (45, (45, 45)),
+    ("Free", None),
+    (None, None),
+])
+def test_parse_cost_range(text, expected):
+    assert parse_cost_range(text) == expected
+
+
+@pytest.mark.parametrize("text, unit", [
+    ("$80-150 per night", "night"),
+    ("$30/day", "day"),
+    ("$200 total", "trip"),
+    ("$40 per person", "person"),
+    ("Spa day from $50", None),
+])
+def test_parse_cost_unit(text, unit):
+    assert parse_cost_unit(text) == unit
+
+
+def test_normalize_tier():
+    assert normalize_tier("Luxury") == "luxury"
+    assert normalize_tier("mid range") == "mid-range"
+    assert normalize_tier(None) == "mid-range"
+    assert normalize_tier("unknown") == "mid-range"
+
+
+def test_model_estimate_scales_by_index_and_quantities():
+    cost = engine.estimate("Bangkok", "budget", days=5, travelers=3).to_dict()
+    index = np.array([0.5, 0.4, 0.55, 0.4])
+    expected_rates = BUDGET_TIERS["budget"] * index[:, None]
+    units = {"accommodation": 2 * 4, "meals": 15, "activities": 15, "transportation": 3}
+
+    assert cost["matched_place"] == "Bangkok"
+    for i, name in enumerate(CATEGORIES):
+        category = cost["categories"][name]
+        assert category["units"] == units[name]
+        assert category["min"] == pytest.approx(expected_rates[i, 0] * units[name])
+        assert category["max"] == pytest.approx(expected_rates[i, 1] * units[name])
+        assert category["source"] == "model"
+    assert cost["total"]["min"] == pytest.approx(sum(c["min"] for c in cost["categories"].values()))
+
+
+def test_city_falls_back_to_country_index_then_default():
+    kyoto, _ = engine.cost_index("Kyoto")
+    osaka, place = engine.cost_index("Osaka, Japan")
+    unknown, none = engine.cost_index("Reykjavik")
+    assert place.key == "osaka" and osaka.tolist() == engine.index["japan"].tolist()
+    assert kyoto.tolist() == engine.index["kyoto"].tolist()
+    assert none is None and unknown.tolist() == [1.0] * 4
+
+
+def test_itinerary_figures_override_model_and_convert_in_one_pass():
+    itinerary = {
+        "estimated_costs": {
+            "accommodation": "$100-200 per night",
+            "meals": "$40 per day",
+            "transportation": "$300 total",
+            "activities": "varies",
+        },
+        "daily_itinerary": {
+            "day_1": {"morning": {"cost": "$20-40"}, "evening": {"cost": "Free"}},
+            "day_2": {"afternoon": {"cost": "$30"}},
+        },
+    }
+    usd = engine.estimate("Paris", "luxury", days=2, travelers=2, itinerary=itinerary).to_dict()
+    eur = engine.estimate("Paris", "luxury", days=2, travelers=2, itinerary=itinerary, rate=0.5, currency="EUR").to_dict()
+
+    categories = usd["categories"]
+    assert categories["accommodation"] == {**categories["accommodation"], "min": 100, "max": 200, "units": 1}
+    assert categories["meals"]["min"] == categories["meals"]["max"] == 40 * 2 * 2
+    assert categories["transportation"]["min"] == 600
+    assert (categories["activities"]["min"], categories["activities"]["max"]) == (100, 140)
+    assert categories["activities"]["source"] == "daily_itinerary"
+    assert eur["currency"] == "EUR"
+    assert eur["total"]["min"] == pytest.approx(usd["total"]["min"] / 2)
+    assert eur["total"]["max"] == pytest.approx(usd["total"]["max"] / 2)
+
+
+def test_estimated_costs_strings_match_tiers():
+    costs = engine.estimated_costs(None, "mid-range")
+    assert costs == {
+        "accommodation": "$120-180 per night",
+        "meals": "$50-80 per day",
+        "activities": "$60-100 per day",
+        "transportation": "$150-250 total",
+    }
+    assert parse_cost_range(engine.estimated_costs("Zurich", "luxury")["meals"]) == (150, 240)
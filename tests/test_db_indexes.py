@@ -0,0 +1,55 @@
+import asyncio
+
+from db_indexes import QUERY_SHAPES, QueryShape, coverage, ensure_indexes, index_registry
+
+
+class FakeCollection:
+    def __init__(self):
+        self.indexes = {"_id_": {"key": [("_id", 1)]}}
+
+    async def create_index(self, keys, **options):
+        name = "_".join(f"{field}_{direction}" for field, direction in keys)
+        self.indexes[name] = {"key": list(keys), **options}
+        return name
+
+    async def index_information(self):
+        return self.indexes
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+
+def test_registry_covers_every_query_shape():
+    db = FakeDatabase()
+    report = asyncio.run(ensure_indexes(db, index_registry(review_sentiment_ttl=3600)))
+    assert report["failed"] == [] and report["uncovered"] == []
+    assert db["sessions"].indexes["expires_at_1"]["expireAfterSeconds"] == 0
+    assert db["users"].indexes["email_1"]["unique"] is True
+
+
+def test_ensure_indexes_is_idempotent():
+    db = FakeDatabase()
+    specs = index_registry(review_sentiment_ttl=3600)
+    asyncio.run(ensure_indexes(db, specs))
+    before = {name: dict(c.indexes) for name, c in db.items()}
+    asyncio.run(ensure_indexes(db, specs))
+    assert {name: dict(c.indexes) for name, c in db.items()} == before
+
+
+def test_missing_indexes_are_reported():
+    report = asyncio.run(ensure_indexes(FakeDatabase(), [], QUERY_SHAPES))
+    assert set(report["uncovered"]) == {shape.name for shape in QUERY_SHAPES}
+
+
+def test_coverage_rules():
+    shape = QueryShape("list", "c", equality=("user_id",), sort=(("created_at", -1),))
+    assert coverage(shape, [(("user_id", 1), ("created_at", -1))]) == "covered"
+    assert coverage(shape, [(("user_id", -1), ("created_at", 1))]) == "covered"
+    assert coverage(shape, [(("user_id", 1),)]) == "partial"
+    assert coverage(shape, [(("created_at", -1),)]) == "missing"
+    delete = QueryShape("del", "c", equality=("id", "user_id"))
+    assert coverage(delete, [(("id", 1),)]) == "partial"
+    assert coverage(delete, [(("id", 1),)], unique=[(("id", 1),)]) == "covered"
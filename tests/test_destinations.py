@@ -0,0 +1,85 @@
+import pytest
+
+from destinations import CATALOGUE, DestinationMatcher, Place, catalogue_places, destination_matcher, fold, normalize_tokens
+
+
+@pytest.mark.parametrize("text, key", [
+    ("Venice, Italy", "venice"),
+    ("Nice", "nice"),
+    ("Tokyo, Japan", "tokyo"),
+    ("London, United Kingdom", "london"),
+    ("Mexico City", "mexico city"),
+    ("Weekend in mexico", "mexico"),
+    ("El Salvador", "el salvador"),
+    ("Salvador, Brazil", "salvador"),
+    ("SÃO PAULO!", "sao paulo"),
+    ("rio", "rio de janeiro"),
+])
+def test_resolves_most_specific_place(text, key):
+    assert destination_matcher.resolve(text).key == key
+
+
+@pytest.mark.parametrize("text", ["Fukuoka", "Rioja", "Pariss", "Goat Island", "nicely done", ""])
+def test_no_match_inside_other_words(text):
+    assert destination_matcher.resolve(text) is None
+
+
+def test_currency_lookup():
+    assert destination_matcher.currency_for("Venice") == "EUR"
+    assert destination_matcher.currency_for("Dubai, UAE") == "AED"
+    assert destination_matcher.currency_for("Reykjavik") == "USD"
+    assert destination_matcher.currency_for("Reykjavik", default="Local currency") == "Local currency"
+
+
+def test_find_all_is_leftmost_longest_and_non_overlapping():
+    matches = destination_matcher.find_all("From New York to Rio de Janeiro via Mexico City")
+    assert [(m.alias, m.start, m.end) for m in matches] == [
+        ("new york", 5, 13), ("rio de janeiro", 17, 31), ("mexico city", 36, 47)
+    ]
+
+
+def test_every_catalogue_name_resolves_to_itself():
+    for alias, place in catalogue_places():
+        assert destination_matcher.resolve(alias) == place
+    assert {place.country for place in destination_matcher.places.values()} == set(CATALOGUE)
+
+
+def test_custom_entries():
+    harbour = Place("harbour", "Harbour", "Testland", "TST", "city")
+    matcher = DestinationMatcher([("Harbour", harbour), ("Old Harbour Town", harbour), ("!!", harbour)])
+    assert matcher.aliases == 2
+    assert matcher.find_all("old harbour town")[0].alias == "old harbour town"
+    assert normalize_tokens("Old-Harbour  Town") == ["old", "harbour", "town"]
+
+
+def test_punctuation_between_alias_words():
+    assert destination_matcher.resolve("Mexico-City").key == "mexico city"
+    assert destination_matcher.find_all("NEW   YORK")[0].alias == "new york"
+
+
+def scan_resolve(matcher, text):
+    """resolve() without the exact-alias fast path"""
+    best, best_rank = None, None
+    for m in matcher.pattern.finditer(fold(text)):
+        place = matcher.by_alias[matcher._alias(m.group())]
+        rank = (place.kind != "city", m.start() - m.end(), m.start())
+        if best_rank is None or rank < best_rank:
+            best, best_rank = place, rank
+    return best
+
+
+@pytest.mark.parametrize("text", [
+    "Tokyo, Japan", "Japan, Tokyo", "Nice, Paris", "Paris, Nice", "  Venice ,  Italy ", "El Salvador",
+    "Salvador, El Salvador", "rio, de janeiro", "Rio, Brazil", "New York, New York", "tokyo,", ",tokyo",
+    "Mexico, City", "Mexico City, Mexico", "Tokyo_Japan", "São Paulo, Brazil", "Fukuoka, Japan",
+])
+def test_exact_alias_fast_path_agrees_with_the_scan(text):
+    assert destination_matcher.resolve(text) == scan_resolve(destination_matcher, text)
+
+
+def test_exact_alias_fast_path_defers_when_parts_could_join():
+    matcher = DestinationMatcher([("Rio de Janeiro", Place("rio de janeiro", "Rio", "Brazil", "BRL", "city")),
+                                  ("Rio", Place("rio", "Rio", "Brazil", "BRL", "city")),
+                                  ("de Janeiro", Place("janeiro", "Janeiro", "Brazil", "BRL", "city"))])
+    assert matcher._exact_parts("rio, de janeiro") is None
+    assert matcher.resolve("Rio, de Janeiro").key == "rio de janeiro"
@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from exchange_rates import (
+    DEFAULT_RATES,
+    ExchangeRateService,
+    FileRateSource,
+    RateTable,
+    StaticRateSource,
+    UnsupportedCurrency,
+    parse_rates,
+)
+
+
+class FailingSource:
+    name = "broken"
+
+    async def fetch(self):
+        raise ConnectionError("rates service down")
+
+
+def test_cross_rate_matrix_is_consistent():
+    table = RateTable.build("USD", DEFAULT_RATES, "static")
+    matrix = table.matrix
+    assert np.allclose(np.diag(matrix), 1.0)
+    assert np.allclose(matrix * matrix.T, 1.0)
+    i, j, k = (table.index[code] for code in ("EUR", "JPY", "GBP"))
+    assert matrix[i, k] == pytest.approx(matrix[i, j] * matrix[j, k])
+    assert matrix[table.index["USD"], j] == pytest.approx(110.0)
+
+
+def test_base_currency_does_not_change_cross_rates():
+    eur_based = {code: rate / DEFAULT_RATES["EUR"] for code, rate in DEFAULT_RATES.items()}
+    a = RateTable.build("USD", DEFAULT_RATES, "a")
+    b = RateTable.build("EUR", eur_based, "b")
+    assert np.allclose(a.matrix, b.matrix)
+
+
+def test_parse_rates_rejects_bad_values():
+    assert parse_rates({"base": "eur", "rates": {"usd": 1.1}}) == ("EUR", {"USD": 1.1, "EUR": 1.0})
+    with pytest.raises(ValueError):
+        parse_rates({"base": "USD", "rates": {"EUR": 0}})
+
+
+def test_convert_batches_matches_pairwise_rates():
+    async def main():
+        service = ExchangeRateService(StaticRateSource())
+        await service.refresh()
+        return service, service.convert_batches([
+            ([100, 250.5], "USD", "EUR"),
+            ([], "GBP", "JPY"),
+            ([1000], "JPY", "INR"),
+            ([5], "USD", "XXX"),
+        ])
+
+    service, (rates, converted) = asyncio.run(main())
+    assert converted[0].tolist() == pytest.approx([85.0, 212.925])
+    assert converted[1].size == 0
+    assert converted[2][0] == pytest.approx(1000 / 110.0 * 74.5)
+    assert np.isnan(rates[3]) and np.isnan(converted[3]).all()
+    assert rates[2] == pytest.approx(asyncio.run(_rate(service, "JPY", "INR")))
+
+
+async def _rate(service, source, target):
+    return service.rate(source, target)
+
+
+def test_rate_rejects_unknown_currency():
+    service = ExchangeRateService(StaticRateSource())
+    with pytest.raises(UnsupportedCurrency) as excinfo:
+        asyncio.run(_rate(service, "USD", "ABC"))
+    assert excinfo.value.codes == ["ABC"]
+
+
+def test_file_source_and_failed_refresh_keeps_last_table(tmp_path):
+    path = tmp_path / "rates.json"
+    path.write_text(json.dumps({"base": "USD", "rates": {"EUR": 0.5, "GBP": 0.25}}))
+
+    async def main():
+        service = ExchangeRateService(FileRateSource(str(path)))
+        assert await service.refresh()
+        loaded = service.table
+        service.source = FailingSource()
+        assert not await service.refresh()
+        return service, loaded
+
+    service, loaded = asyncio.run(main())
+    assert service.table is loaded
+    assert loaded.currencies == ("EUR", "GBP", "USD")
+    assert service.stats()["failures"] == 1
+    assert "rates service down" in service.stats()["last_error"]
+
+
+def test_stale_table_refreshes_in_background():
+    class CountingSource(StaticRateSource):
+        calls = 0
+
+        async def fetch(self):
+            CountingSource.calls += 1
+            return await super().fetch()
+
+    async def main():
+        service = ExchangeRateService(CountingSource(), refresh_seconds=3600)
+        service.current()
+        service.current()  # the refresh already scheduled is not duplicated
+        await service.refreshing
+        service.current()  # fresh now
+        await asyncio.sleep(0)
+        return service
+
+    service = asyncio.run(main())
+    assert CountingSource.calls == 1
+    assert service.table.source == "static"
@@ -0,0 +1,117 @@
+import asyncio
+import tracemalloc
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from heavy_hitters import SpaceSaving, TrendingTracker
+from tests.conftest import FakeCollection
+
+
+def zipf_stream(size, universe=5000, seed=7):
+    rng = np.random.default_rng(seed)
+    ranks = rng.zipf(1.3, size=size * 2)
+    return [f"item-{rank}" for rank in ranks[ranks <= universe][:size]]
+
+
+def check_invariants(summary):
+    assert len(summary) <= summary.capacity
+    assert sum(summary.counts.values()) == summary.total
+    assert summary.min_count == min(summary.counts.values())
+    for count, items in summary.buckets.items():
+        assert items and all(summary.counts[item] == count for item in items)
+
+
+def test_space_saving_finds_the_true_top_k_of_a_zipf_stream():
+    stream = zipf_stream(50_000)
+    summary = SpaceSaving(capacity=200)
+    for item in stream:
+        summary.add(item)
+    check_invariants(summary)
+
+    truth = Counter(stream)
+    top = summary.top(10)
+    assert [item for item, _, _ in top] == [item for item, _ in truth.most_common(10)]
+    for item, count, error in summary.top(200):
+        # Counts never underestimate and overestimate by at most the recorded error, which is <= N / capacity
+        assert count - error <= truth[item] <= count
+        assert error <= len(stream) / summary.capacity
+
+
+def test_every_item_above_the_frequency_threshold_is_tracked():
+    stream = zipf_stream(20_000, seed=11)
+    summary = SpaceSaving(capacity=50)
+    for item in stream:
+        summary.add(item)
+    threshold = len(stream) / summary.capacity
+    frequent = {item for item, count in Counter(stream).items() if count > threshold}
+    assert frequent and frequent <= set(summary.counts)
+
+
+def test_small_streams_are_counted_exactly():
+    summary = SpaceSaving(capacity=10)
+    for item in "abracadabra":
+        summary.add(item)
+    assert summary.top(3) == [("a", 5, 0), ("b", 2, 0), ("r", 2, 0)]
+    assert summary.top(1) is not summary.top(1)  # slices of the cached ranking
+
+
+def test_memory_is_bounded_by_capacity_not_stream_size():
+    def footprint(distinct):
+        summary = SpaceSaving(capacity=100)
+        tracemalloc.start()
+        for i in range(distinct):
+            summary.add(f"vibe {i % distinct}")
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        check_invariants(summary)
+        return current
+
+    small, large = footprint(2_000), footprint(50_000)
+    assert large < small * 1.5
+
+
+def test_decay_halves_counts_and_drops_faded_items():
+    summary = SpaceSaving(capacity=10)
+    for item in ["a"] * 6 + ["b"] * 3 + ["c"]:
+        summary.add(item)
+    summary.decay()
+    assert summary.top(5) == [("a", 3, 0), ("b", 1, 0)]
+    assert summary.min_count == 1
+    summary.add("c")
+    check_invariants(summary)
+
+
+def test_invalid_capacity_is_rejected():
+    with pytest.raises(ValueError):
+        SpaceSaving(capacity=0)
+
+
+def test_tracker_checkpoints_only_changed_summaries_and_restores_them():
+    collection = FakeCollection()
+    tracker = TrendingTracker(collection, ("vibes", "destinations"), capacity=5, checkpoint_seconds=0.01)
+    for vibe in ["beach", "beach", "mountains", None, ""]:
+        tracker.record("vibes", vibe)
+
+    assert asyncio.run(tracker.checkpoint()) == 1
+    assert asyncio.run(tracker.checkpoint()) == 0
+    assert collection.docs["vibes"]["total"] == 3
+
+    restored = TrendingTracker(collection, ("vibes", "destinations"), capacity=5)
+    assert asyncio.run(restored.restore()) == 1
+    assert restored.trending("vibes") == [
+        {"item": "beach", "count": 2, "guaranteed": 2},
+        {"item": "mountains", "count": 1, "guaranteed": 1},
+    ]
+    assert asyncio.run(restored.checkpoint()) == 0
+
+
+def test_tracker_decays_once_per_half_life():
+    tracker = TrendingTracker(FakeCollection(), ("vibes",), half_life_seconds=100)
+    for _ in range(4):
+        tracker.record("vibes", "city lights")
+    start = tracker.last_decay
+    assert not tracker.maybe_decay(start + 50)
+    assert tracker.maybe_decay(start + 100)
+    assert tracker.trending("vibes") == [{"item": "city lights", "count": 2, "guaranteed": 2}]
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from incremental_json import IncrementalJSONParser
+
+ITINERARY = {
+    "destination_recommendations": [{"name": "Lisbon, Portugal"}],
+    "daily_itinerary": {
+        "day_1": {"morning": "Tram 28 {scenic}", "evening": "Fado"},
+        "day_2": {"morning": "Sintra", "evening": "Say \"obrigado\""},
+    },
+    "estimated_costs": {"accommodation": "$80-150 per night"},
+    "local_tips": ["Wear comfy shoes"],
+}
+DOC = json.dumps(ITINERARY, indent=2)
+
+
+def feed_all(text, size):
+    parser = IncrementalJSONParser(expand=["daily_itinerary"])
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i:i + size]))
+    return parser, events
+
+
+def expected_events():
+    events = []
+    for key, value in ITINERARY.items():
+        if key == "daily_itinerary":
+            events.extend(((key, day), plan) for day, plan in value.items())
+        else:
+            events.append(((key,), value))
+    return events
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(DOC)])
+def test_members_are_emitted_in_order_whatever_the_chunk_boundaries(size):
+    parser, events = feed_all(DOC, size)
+    assert parser.complete
+    assert events == expected_events()
+    assert parser.document() == ITINERARY
+
+
+@pytest.mark.parametrize("text", [
+    f"```json\n{DOC}\n```",
+    f"Sure! Here is your {{itinerary}}: {DOC}\nEnjoy {{:)}}",
+    f"Prices are in {{USD}} and {{local currency}}.\n{DOC}",
+])
+def test_code_fences_and_braces_in_prose_are_skipped(text):
+    parser, events = feed_all(text, 5)
+    assert parser.complete
+    assert events == expected_events()
+    assert parser.document() == ITINERARY
+
+
+def test_a_balanced_span_that_is_not_json_is_discarded():
+    parser, events = feed_all('{"summary": "Great", "tips": ["a",],} then {"summary": "Fixed"}', 4)
+    assert parser.complete
+    assert parser.document() == {"summary": "Fixed"}
+    assert (("summary",), "Fixed") in events
+
+
+def test_keyless_values_in_prose_are_not_emitted():
+    parser, events = feed_all('Rated {42} out of {"a"}: {"summary": "ok"}', 1)
+    assert events == [(("summary",), "ok")]
+    assert parser.document() == {"summary": "ok"}
+
+
+def test_trailing_comma_reply_has_no_document():
+    parser, events = feed_all('{"summary": "Great", "local_tips": ["a"],}', 3)
+    assert not parser.complete
+    assert parser.document() is None
+    # Members completed before the bad close were still streamed
+    assert events == [(("summary",), "Great"), (("local_tips",), ["a"])]
+
+
+def test_truncated_reply_streams_finished_members_only():
+    text = DOC[:DOC.index('"day_2"') + 20]
+    parser, events = feed_all(text, 6)
+    assert not parser.complete
+    assert parser.document() is None
+    assert events == [
+        (("destination_recommendations",), ITINERARY["destination_recommendations"]),
+        (("daily_itinerary", "day_1"), ITINERARY["daily_itinerary"]["day_1"]),
+    ]
+
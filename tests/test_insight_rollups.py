@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from insight_rollups import (
+    POPULAR_VIBES,
+    InsightRollups,
+    bucket_start,
+    parse_window,
+    rollup_updates,
+    vibe_key,
+    window_pipelines,
+)
+from tests.conftest import FakeCollection
+
+NOW = datetime(2025, 5, 20, 15, 42, 7)
+
+
+@pytest.mark.parametrize("window, expected", [("24h", ("hour", 24)), ("7d", ("day", 7)), (" 30D ", ("day", 30))])
+def test_parse_window(window, expected):
+    assert parse_window(window) == expected
+
+
+@pytest.mark.parametrize("window", ["", "7w", "0d", "500d", "200h", "-1h"])
+def test_parse_window_rejects(window):
+    with pytest.raises(ValueError):
+        parse_window(window)
+
+
+def test_bucket_start_and_vibe_key():
+    assert bucket_start(NOW, "hour") == datetime(2025, 5, 20, 15)
+    assert bucket_start(NOW, "day") == datetime(2025, 5, 20)
+    assert vibe_key("  Cozy   Mountain.Cabin $vibes ") == "cozy mountain.cabin $vibes"
+    assert vibe_key("   ") is None
+
+
+def test_each_write_updates_one_hourly_and_one_daily_rollup():
+    updates = rollup_updates({"recommendations": 1}, NOW)
+    assert [u._filter["_id"] for u in updates] == ["hour:2025-05-20T15:00:00", "day:2025-05-20T00:00:00"]
+    assert updates[0]._doc["$setOnInsert"]["expires_at"] == datetime(2025, 5, 28, 15)
+
+
+def test_vibe_searches_keep_the_totals_document_a_fixed_size():
+    rollups, vibes = FakeCollection(), FakeCollection()
+    asyncio.run(InsightRollups(rollups, vibes).record_vibe_search("  Cozy Cabin ", now=NOW))
+
+    assert [u._doc["$inc"] for u in rollups.writes] == [{"vibe_searches": 1}] * 2
+    assert [u._filter["_id"] for u in vibes.writes] == [
+        "hour:2025-05-20T15:00:00:cozy cabin", "day:2025-05-20T00:00:00:cozy cabin"
+    ]
+    update = vibes.writes[1]._doc
+    assert update["$inc"] == {"count": 1}
+    assert update["$set"] == {"query": "Cozy Cabin"}
+    assert update["$setOnInsert"]["vibe"] == "cozy cabin"
+    assert update["$setOnInsert"]["expires_at"] == datetime(2026, 6, 24)
+
+
+def test_blank_vibe_only_counts_the_search():
+    rollups, vibes = FakeCollection(), FakeCollection()
+    asyncio.run(InsightRollups(rollups, vibes).record_vibe_search("   ", now=NOW))
+    assert len(rollups.writes) == 2 and vibes.writes == []
+
+
+def test_window_pipelines_match_their_buckets_and_group_vibes_by_key():
+    start = datetime(2025, 5, 14)
+    totals, vibes = window_pipelines("day", start)
+    match = {"$match": {"granularity": "day", "bucket": {"$gte": start}}}
+    assert totals[0] == match and vibes[0] == match
+
+    group = totals[1]["$group"]
+    assert group["_id"] is None
+    assert group["review_count"] == {"$sum": "$reviews.review_count"}
+    assert group["negative"] == {"$sum": "$reviews.sentiment.negative"}
+    assert group["vibe_searches"] == {"$sum": "$vibe_searches"}
+
+    assert vibes[1] == {"$sort": {"bucket": 1}}
+    assert vibes[2] == {"$group": {"_id": "$vibe", "count": {"$sum": "$count"}, "query": {"$last": "$query"}}}
+    assert vibes[3:] == [{"$sort": {"count": -1, "_id": 1}}, {"$limit": POPULAR_VIBES}]
+
+
+def test_insights_run_the_window_pipelines_and_derive_averages():
+    rollups = FakeCollection([{
+        "buckets": 4, "review_count": 4, "safety_total": 28.0, "cleanliness_total": 24.0,
+        "positive": 2, "neutral": 1, "negative": 1, "recommendations": 3, "vibe_searches": 9,
+    }])
+    vibes = FakeCollection([{"_id": "beach", "count": 5, "query": "Beach"}, {"_id": "ski", "count": 2}])
+    insights = asyncio.run(InsightRollups(rollups, vibes).insights("24h", now=NOW))
+
+    start = datetime(2025, 5, 19, 16)
+    assert (rollups.pipelines[0], vibes.pipelines[0]) == window_pipelines("hour", start)
+    assert insights["window_start"] == start
+    assert insights["average_safety_score"] == 7.0 and insights["average_cleanliness_score"] == 6.0
+    assert insights["sentiment_distribution"] == {"positive": 2, "neutral": 1, "negative": 1}
+    assert insights["recent_recommendations"] == 3 and insights["vibe_searches"] == 9
+    assert insights["popular_vibes"] == ["Beach", "ski"]
+
+
+def test_empty_window():
+    insights = asyncio.run(InsightRollups(FakeCollection(), FakeCollection()).insights("24h", now=NOW))
+    assert insights["total_reviews_analyzed"] == 0 and insights["average_safety_score"] == 0
+    assert insights["popular_vibes"] == []
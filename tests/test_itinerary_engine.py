@@ -0,0 +1,89 @@
+import asyncio
+
+from itinerary_engine import day_ranges, generate_days_in_chunks
+
+
+def fallback_day(day):
+    return {"theme": f"Fallback day {day}"}
+
+
+def plan(start, end, skip=()):
+    return {f"day_{day}": {"theme": f"Day {day}"} for day in range(start, end + 1) if day not in skip}
+
+
+def test_day_ranges_cover_every_day_once():
+    assert day_ranges(10, 4) == [(1, 4), (5, 8), (9, 10)]
+    assert day_ranges(3, 0) == [(1, 1), (2, 2), (3, 3)]
+
+
+def test_chunks_are_merged_in_day_order():
+    async def generate(start, end):
+        await asyncio.sleep(0.001 * (10 - start))  # later ranges finish first
+        return plan(start, end)
+
+    days, stats = asyncio.run(generate_days_in_chunks(9, generate, fallback_day, chunk_days=3))
+    assert list(days) == [f"day_{day}" for day in range(1, 10)]
+    assert days["day_7"] == {"theme": "Day 7"}
+    assert stats == {"chunks": 3, "retries": 0, "fallback_days": 0}
+
+
+def test_a_retry_only_fills_the_days_still_missing():
+    attempts = []
+
+    async def generate(start, end):
+        attempts.append((start, end))
+        if len(attempts) == 1:
+            return {**plan(start, end, skip={2}), "day_9": {"theme": "outside the range"}}
+        return {"day_1": {"theme": "retried"}, "day_2": {"theme": "Day 2"}}
+
+    days, stats = asyncio.run(generate_days_in_chunks(3, generate, fallback_day, chunk_days=3, retries=1))
+    assert attempts == [(1, 3), (1, 3)]
+    assert days == {"day_1": {"theme": "retried"}, "day_2": {"theme": "Day 2"}, "day_3": {"theme": "Day 3"}}
+    assert stats["retries"] == 1 and stats["fallback_days"] == 0
+
+
+def test_days_still_missing_after_retries_come_from_the_fallback():
+    async def generate(start, end):
+        if start == 1:
+            raise asyncio.TimeoutError()
+        if start == 3:
+            raise ValueError("unparseable reply")
+        return plan(start, end, skip={6})
+
+    days, stats = asyncio.run(generate_days_in_chunks(6, generate, fallback_day, chunk_days=2, retries=2))
+    assert days["day_1"] == fallback_day(1) and days["day_2"] == fallback_day(2)
+    assert days["day_4"] == fallback_day(4)
+    assert days["day_5"] == {"theme": "Day 5"} and days["day_6"] == fallback_day(6)
+    assert stats == {"chunks": 3, "retries": 6, "fallback_days": 5}
+
+
+def test_concurrency_is_bounded():
+    running, peak = 0, 0
+
+    async def generate(start, end):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.005)
+        running -= 1
+        return plan(start, end)
+
+    asyncio.run(generate_days_in_chunks(20, generate, fallback_day, chunk_days=2, concurrency=3))
+    assert peak == 3
+
+
+def test_each_chunk_is_reported_as_soon_as_it_is_done():
+    reported = []
+
+    async def generate(start, end):
+        await asyncio.sleep(0.001 * (10 - start))  # later ranges finish first
+        return plan(start, end, skip={5})
+
+    async def main():
+        return await generate_days_in_chunks(
+            7, generate, fallback_day, chunk_days=3, retries=0, on_chunk=lambda days: reported.append(list(days))
+        )
+
+    days, _ = asyncio.run(main())
+    assert reported == [["day_7"], ["day_4", "day_5", "day_6"], ["day_1", "day_2", "day_3"]]
+    assert days["day_5"] == fallback_day(5)
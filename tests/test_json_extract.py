@@ -0,0 +1,92 @@
+import json
+import re
+
+import pytest
+
+from json_extract import extract_json
+
+ITINERARY = {
+    "destination_recommendations": [{"name": "Lisbon, Portugal", "highlights": ["Alfama", "Belém"]}],
+    "daily_itinerary": {"day_1": {"morning": "Tram 28 {scenic}", "afternoon": "Pastéis", "evening": "Fado"}},
+    "estimated_costs": {"accommodation": "$80-150 per night"},
+    "local_tips": ["Wear comfy shoes", "Say \"obrigado\""],
+}
+DOC = json.dumps(ITINERARY, indent=2, ensure_ascii=False)
+SUGGESTIONS = json.dumps([{"name": "Kyoto, Japan"}, {"name": "Hoi An, Vietnam"}])
+_FULL_TRIP = json.dumps({
+    "destination_recommendations": [{"name": "Bali", "description": "x", "highlights": ["a"]}],
+    "daily_itinerary": {f"day_{i}": {"morning": "m", "evening": "e"} for i in range(1, 6)},
+})
+CUT_ITINERARY = _FULL_TRIP[:_FULL_TRIP.index('"day_5"') + len('"day_5": {"morning": "m", "eve')]
+
+# (response text, kind, expected value) — shapes seen in real model replies
+CORPUS = [
+    (DOC, "object", ITINERARY),
+    (f"Here is your itinerary:\n{DOC}\nEnjoy!", "object", ITINERARY),
+    (f"```json\n{DOC}\n```", "object", ITINERARY),
+    (f"Sure! ```json\n{DOC}\n``` Let me know {{if}} you want changes.", "object", ITINERARY),
+    (f"I kept {{your}} preferences in mind:\n{DOC}\nHappy travels {{:)}}", "object", ITINERARY),
+    (f"Use this {{format:\n{DOC}", "object", ITINERARY),
+    (f"{DOC}\n\nNote: prices in {{USD}}.", "object", ITINERARY),
+    (f"Top picks: {SUGGESTIONS} (prices vary [a lot])", "array", json.loads(SUGGESTIONS)),
+    (f"```\n{SUGGESTIONS}\n```", "array", json.loads(SUGGESTIONS)),
+    ('{"review": "They said \\"clean}\\" rooms", "score": 8}', "object", {"review": 'They said "clean}" rooms', "score": 8}),
+]
+
+# Truncated replies that should be repaired rather than trigger a fallback
+TRUNCATED = [
+    ('{"local_tips": ["a", "b"', "object", {"local_tips": ["a", "b"]}),
+    ('{"daily_itinerary": {"day_1": {"morning": "Hike", "after', "object", {"daily_itinerary": {"day_1": {"morning": "Hike"}}}),
+    ('{"summary": "Great food and', "object", {"summary": "Great food and"}),
+    ('```json\n[{"name": "Rome"}, {"name": "Flor', "array", [{"name": "Rome"}, {"name": "Flor"}]),
+    ('{"a": 1, "b": [1, 2,', "object", {"a": 1, "b": [1, 2]}),
+    # Complete inner containers before the cut must not be returned in place of the document
+    (CUT_ITINERARY, "object", {
+        "destination_recommendations": [{"name": "Bali", "description": "x", "highlights": ["a"]}],
+        "daily_itinerary": {**{f"day_{i}": {"morning": "m", "evening": "e"} for i in range(1, 5)}, "day_5": {"morning": "m"}},
+    }),
+    ('{"days": {"day_1": {"m": "x"}, "day_2": {"m": "y', "object", {"days": {"day_1": {"m": "x"}, "day_2": {"m": "y"}}}),
+    ('[{"index": 0, "tags": ["a"]}, {"index": 1, "tags": ["b"]}, {"index": 2, "ta', "array",
+     [{"index": 0, "tags": ["a"]}, {"index": 1, "tags": ["b"]}, {"index": 2}]),
+]
+
+
+def legacy_extract(text, kind):
+    pattern = r'\{.*\}' if kind == "object" else r'\[.*\]'
+    match = re.search(pattern, text, re.DOTALL)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group())
+    except ValueError:
+        return None
+
+
+@pytest.mark.parametrize("text,kind,expected", CORPUS + TRUNCATED)
+def test_extracts_expected_value(text, kind, expected):
+    assert extract_json(text, kind) == expected
+
+
+def test_parse_failure_rate_beats_legacy_regex():
+    cases = CORPUS + TRUNCATED
+    failures = sum(extract_json(text, kind) != expected for text, kind, expected in cases)
+    legacy_failures = sum(legacy_extract(text, kind) != expected for text, kind, expected in cases)
+    assert failures == 0
+    assert legacy_failures >= 8
+
+
+def test_returns_none_without_json():
+    assert extract_json("No itinerary available right now.", "object") is None
+    assert extract_json("", "object") is None
+    assert extract_json("{not json} and {also not}", "object") is None
+
+
+def test_kind_filters_container_type_without_returning_nested_values():
+    assert extract_json(SUGGESTIONS, "object") is None
+    assert extract_json('{"a": [1]}', "array") is None
+    assert extract_json('[{"index": 0}, {"index": 1, "s', "object") is None
+    assert extract_json(f"Ranked {SUGGESTIONS}, details: {DOC}", "object") == ITINERARY
+
+
+def test_repair_can_be_disabled():
+    assert extract_json('{"a": [1, 2', "object", repair=False) is None
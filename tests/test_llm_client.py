@@ -0,0 +1,123 @@
+import asyncio
+import importlib
+import sys
+import types
+
+import pytest
+
+
+class StubLlmChat:
+    """Records what each handle is sent; history lives on the instance like the real client's session"""
+
+    def __init__(self, api_key, session_id, system_message):
+        if not api_key:
+            raise ValueError("api_key is required")
+        self.api_key = api_key
+        self.session_id = session_id
+        self.system_message = system_message
+        self.history = []
+
+    def with_model(self, provider, model):
+        self.provider, self.model = provider, model
+        return self
+
+    async def send_message(self, message):
+        if message == "fail":
+            raise ConnectionError("provider unavailable")
+        self.history.append(message)
+        return f"{self.model}: {message} ({len(self.history)} in session)"
+
+
+@pytest.fixture
+def llm_client(monkeypatch):
+    """llm_client with LlmChat replaced; the SDK modules are stubbed when it isn't installed"""
+    stubbed = "emergentintegrations.llm.chat" not in sys.modules and importlib.util.find_spec("emergentintegrations") is None
+    if stubbed:
+        chat = types.ModuleType("emergentintegrations.llm.chat")
+        chat.LlmChat = StubLlmChat
+        for name, module in (
+            ("emergentintegrations", types.ModuleType("emergentintegrations")),
+            ("emergentintegrations.llm", types.ModuleType("emergentintegrations.llm")),
+            ("emergentintegrations.llm.chat", chat),
+        ):
+            monkeypatch.setitem(sys.modules, name, module)
+    module = importlib.import_module("llm_client")
+    monkeypatch.setattr(module, "LlmChat", StubLlmChat)
+    yield module
+    if stubbed:
+        sys.modules.pop("llm_client", None)
+
+
+def make_factory(llm_client, api_key="key"):
+    return llm_client.ChatFactory("travel", api_key, "You are a travel expert.", "openai", "gpt-4o")
+
+
+def test_each_acquire_returns_an_isolated_handle(llm_client):
+    factory = make_factory(llm_client)
+
+    async def main():
+        first, second = factory.acquire(), factory.acquire()
+        return first, second, [await first.send_message("Lisbon?"), await second.send_message("Porto?")]
+
+    first, second, replies = asyncio.run(main())
+    assert first is not second
+    assert first.session_id != second.session_id and first.session_id.startswith("travel-")
+    # Neither handle sees the other's prompt, so no reply is built on a growing shared history
+    assert first.history == ["Lisbon?"] and second.history == ["Porto?"]
+    assert replies == ["gpt-4o: Lisbon? (1 in session)", "gpt-4o: Porto? (1 in session)"]
+    assert factory.stats() == {"model": "openai/gpt-4o", "handles_created": 2}
+
+
+def test_handles_reuse_the_factory_configuration(llm_client):
+    factory = make_factory(llm_client)
+    handles = [factory.acquire() for _ in range(3)]
+    assert {(h.api_key, h.system_message, h.provider, h.model) for h in handles} == {
+        ("key", "You are a travel expert.", "openai", "gpt-4o")
+    }
+    assert len({h.session_id for h in handles}) == 3
+
+
+def test_errors_propagate_to_the_caller(llm_client):
+    factory = make_factory(llm_client)
+    with pytest.raises(ConnectionError):
+        asyncio.run(factory.acquire().send_message("fail"))
+
+    broken = make_factory(llm_client, api_key=None)
+    with pytest.raises(ValueError):
+        broken.acquire()
+
+
+def test_streaming_support_follows_the_client(llm_client, monkeypatch):
+    factory = make_factory(llm_client)
+    assert not factory.supports_streaming
+
+    async def stream_message(self, message):
+        yield message
+
+    monkeypatch.setattr(StubLlmChat, "stream_message", stream_message, raising=False)
+    assert factory.supports_streaming
+
+
+def test_shared_http_client_is_created_once_and_reused(llm_client, monkeypatch):
+    pytest.importorskip("httpx")
+    litellm = types.ModuleType("litellm")
+    monkeypatch.setitem(sys.modules, "litellm", litellm)
+    monkeypatch.setattr(llm_client, "_shared_http_client", None)
+
+    llm_client.configure_shared_http_client(max_connections=10, keepalive=5)
+    client = litellm.aclient_session
+    llm_client.configure_shared_http_client()
+    assert litellm.aclient_session is client and llm_client._shared_http_client is client
+
+    asyncio.run(llm_client.close_shared_http_client())
+    assert client.is_closed and llm_client._shared_http_client is None
+
+
+def test_prompt_fingerprint_ignores_indentation_but_not_model(llm_client):
+    prompt = "Plan a trip\n    to Kyoto\n"
+    assert llm_client.prompt_fingerprint("openai/gpt-4o", prompt) == llm_client.prompt_fingerprint(
+        "openai/gpt-4o", "  Plan a trip\nto Kyoto"
+    )
+    assert llm_client.prompt_fingerprint("openai/gpt-4o", prompt) != llm_client.prompt_fingerprint(
+        "openai/gpt-4o-mini", prompt
+    )
@@ -0,0 +1,40 @@
+from local_sentiment import LexiconSentimentScorer
+
+LLM_FIELDS = {
+    "overall_sentiment", "sentiment_confidence", "safety_score", "cleanliness_score",
+    "key_insights", "safety_mentions", "cleanliness_mentions", "recommendation",
+}
+
+scorer = LexiconSentimentScorer()
+
+
+def test_returns_llm_fields():
+    (result,) = scorer.score(["Amazing city! Very clean and safe. Public transport is excellent."])
+    assert LLM_FIELDS <= set(result)
+    assert result["overall_sentiment"] == "positive"
+    assert result["safety_score"] > 7 and result["cleanliness_score"] > 7
+    assert result["safety_mentions"] == ["Very clean and safe."]
+
+
+def test_negative_aspects():
+    (result,) = scorer.score(["The hotel was dirty and I got robbed near the station. Terrible experience, avoid."])
+    assert result["overall_sentiment"] == "negative"
+    assert result["safety_score"] < 3 and result["cleanliness_score"] < 3
+
+
+def test_negation_flips_within_sentence_only():
+    negated, across = scorer.score(["The room was not clean.", "Paris never disappoints! Beautiful sights."])
+    assert negated["cleanliness_score"] < 5
+    assert across["overall_sentiment"] == "positive"
+
+
+def test_bland_review_is_not_confident():
+    (result,) = scorer.score(["It was ok, we stayed three nights."])
+    assert result["overall_sentiment"] == "neutral"
+    assert result["sentiment_confidence"] < 0.6
+
+
+def test_batch_matches_single_scoring():
+    texts = ["Spotless rooms and friendly staff.", "Sketchy area, felt unsafe.", "Fine."]
+    assert scorer.score(texts) == [scorer.score([text])[0] for text in texts]
+    assert scorer.score([]) == []
@@ -0,0 +1,77 @@
+import asyncio
+import copy
+
+from manage import migrate_itineraries
+from storage_codec import BLOB_FIELD, CODEC_FIELD, ItineraryCodec
+from tests.conftest import FakeCollection
+
+LONG_TRIP = {f"day_{i}": {"morning": "Temple walk " * 20, "evening": "Izakaya"} for i in range(1, 15)}
+
+
+def seeded_collection():
+    collection = FakeCollection()
+    collection.docs = {
+        "big": {"_id": "big", "id": "big", "title": "Kyoto", "itinerary_data": LONG_TRIP},
+        "small": {"_id": "small", "id": "small", "title": "Day trip", "itinerary_data": {"day_1": {"morning": "Nara"}}},
+    }
+    already = ItineraryCodec("zlib", min_size=0).encode(
+        {"_id": "done", "id": "done", "title": "Osaka", "itinerary_data": LONG_TRIP}
+    )
+    collection.docs["done"] = already
+    return collection
+
+
+def migrate(collection, compress, **kwargs):
+    codec = ItineraryCodec("zlib" if compress else "none", min_size=1024)
+    return asyncio.run(migrate_itineraries(collection, codec, compress, **kwargs))
+
+
+def test_compress_skips_small_and_already_compressed_documents():
+    collection = seeded_collection()
+    done_before = copy.deepcopy(collection.docs["done"])
+
+    assert migrate(collection, compress=True) == (2, 1)
+
+    big = collection.docs["big"]
+    assert "itinerary_data" not in big and big[CODEC_FIELD] == "zlib"
+    assert collection.docs["small"]["itinerary_data"] == {"day_1": {"morning": "Nara"}}
+    assert collection.docs["done"] == done_before
+
+
+def test_decompress_restores_the_original_documents():
+    collection = seeded_collection()
+    original = copy.deepcopy(collection.docs)
+    migrate(collection, compress=True)
+
+    assert migrate(collection, compress=False) == (2, 2)
+
+    for key in ("big", "small"):
+        assert collection.docs[key] == original[key]
+    assert collection.docs["done"]["itinerary_data"] == LONG_TRIP
+    assert not any(BLOB_FIELD in doc or CODEC_FIELD in doc for doc in collection.docs.values())
+
+
+def test_rerunning_a_migration_is_a_no_op():
+    collection = seeded_collection()
+    migrate(collection, compress=True)
+    compressed = copy.deepcopy(collection.docs)
+    writes = len(collection.writes)
+
+    assert migrate(collection, compress=True) == (1, 0)
+    assert collection.docs == compressed and len(collection.writes) == writes
+
+    migrate(collection, compress=False)
+    decompressed = copy.deepcopy(collection.docs)
+    assert migrate(collection, compress=False) == (0, 0)
+    assert collection.docs == decompressed
+
+
+def test_dry_run_and_batching():
+    collection = seeded_collection()
+    before = copy.deepcopy(collection.docs)
+    assert migrate(collection, compress=False, dry_run=True) == (1, 1)
+    assert collection.docs == before and collection.writes == []
+
+    migrate(collection, compress=True)
+    assert migrate(collection, compress=False, batch_size=1) == (2, 2)
+    assert len(collection.writes) == 1 + 2
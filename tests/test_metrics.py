@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from metrics import LatencyTracker, latency_snapshot, tracker
+
+
+def test_percentiles_use_nearest_rank_over_the_window():
+    latencies = LatencyTracker("llm", window=4)
+    for seconds in (9.0, 0.1, 0.4, 0.2, 0.3):
+        latencies.record(seconds)
+    # The first sample fell out of the window; calls still counts it
+    assert latencies.calls == 5
+    assert latencies.percentile(50) == 0.2
+    assert latencies.percentile(95) == 0.4
+    assert LatencyTracker("empty").percentile(90) == 0.0
+
+
+def test_timed_blocks_count_timeouts_and_errors_separately():
+    latencies = LatencyTracker("review_sentiment")
+
+    async def main():
+        async with latencies.time():
+            await asyncio.sleep(0)
+        with pytest.raises(asyncio.TimeoutError):
+            async with latencies.time():
+                raise asyncio.TimeoutError()
+        with pytest.raises(ValueError):
+            async with latencies.time():
+                raise ValueError("bad reply")
+
+    asyncio.run(main())
+    snapshot = latencies.snapshot()
+    assert (snapshot["calls"], snapshot["timeouts"], snapshot["errors"]) == (3, 1, 1)
+    assert snapshot["cancelled"] == 0
+
+
+def test_named_trackers_are_shared():
+    assert tracker("test_metrics_shared") is tracker("test_metrics_shared")
+    tracker("test_metrics_shared").record(0.25)
+    assert latency_snapshot()["test_metrics_shared"]["p50_ms"] == 250.0
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from micro_batch import MicroBatcher
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_items_share_one_batch():
+    calls = []
+
+    async def process(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    async def main():
+        batcher = MicroBatcher("test", process, window_ms=5, max_batch_size=16)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+        return batcher, results
+
+    batcher, results = run(main())
+    assert results == [0, 2, 4, 6, 8]
+    assert calls == [[0, 1, 2, 3, 4]]
+    assert batcher.stats()["batch_size_histogram"]["<=8"] == 1
+
+
+def test_full_batch_dispatches_without_waiting_for_window():
+    sizes = []
+
+    async def process(items):
+        sizes.append(len(items))
+        return items
+
+    async def main():
+        batcher = MicroBatcher("test", process, window_ms=10_000, max_batch_size=3)
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(6))), timeout=1)
+
+    assert run(main()) == list(range(6))
+    assert sizes == [3, 3]
+
+
+def test_batch_error_reaches_every_caller():
+    async def process(items):
+        raise RuntimeError("provider down")
+
+    async def main():
+        batcher = MicroBatcher("test", process, window_ms=1)
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    results = run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_cancelled_caller_is_dropped_from_batch():
+    seen = []
+
+    async def process(items):
+        seen.extend(items)
+        return items
+
+    async def main():
+        batcher = MicroBatcher("test", process, window_ms=20)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(batcher.submit("gone"), timeout=0.001)
+        return await batcher.submit("kept")
+
+    assert run(main()) == "kept"
+    assert seen == ["kept"]
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from pagination import decode_cursor, encode_cursor, keyset_filter, split_page
+
+BASE = datetime(2025, 1, 1, 12, 0, 0, 123000)
+
+
+def make_docs(n):
+    # Pairs of documents share a created_at so the id tie-breaker matters
+    return [{"id": f"id-{i:03d}", "created_at": BASE - timedelta(seconds=i // 2)} for i in range(n)]
+
+
+def matches(doc, query):
+    """Evaluate the subset of Mongo query syntax keyset_filter produces"""
+    def field_ok(value, condition):
+        if isinstance(condition, dict):
+            return value < condition["$lt"]
+        return value == condition
+
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(doc, branch) for branch in condition):
+                return False
+        elif not field_ok(doc[key], condition):
+            return False
+    return True
+
+
+def test_cursor_round_trip():
+    doc = make_docs(1)[0]
+    assert decode_cursor(encode_cursor(doc)) == (doc["created_at"], doc["id"])
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", encode_cursor({"id": "x", "created_at": BASE})[:-3]])
+def test_bad_cursors_are_rejected(cursor):
+    if cursor == "":
+        assert keyset_filter({"user_id": "u"}, cursor) == {"user_id": "u"}
+    else:
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+def test_pages_cover_every_document_once():
+    docs = sorted(make_docs(23), key=lambda d: (d["created_at"], d["id"]), reverse=True)
+    seen, cursor = [], None
+    while True:
+        query = keyset_filter({}, cursor)
+        remaining = [d for d in docs if matches(d, query)]
+        page, cursor = split_page(remaining[:6], 5)
+        seen.extend(d["id"] for d in page)
+        if cursor is None:
+            break
+    assert seen == [d["id"] for d in docs]
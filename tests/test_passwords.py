@@ -0,0 +1,48 @@
+import asyncio
+import hashlib
+
+import pytest
+
+from passwords import PasswordHasher
+
+FAST_SCRYPT = dict(scrypt_n=2 ** 10, pbkdf2_iterations=1000, workers=2)
+
+
+def test_scrypt_round_trip():
+    hasher = PasswordHasher(**FAST_SCRYPT)
+    stored = asyncio.run(hasher.hash("s3cret"))
+    assert stored.startswith("scrypt$1024$8$1$")
+    assert asyncio.run(hasher.verify("s3cret", stored)) == (True, False)
+    assert asyncio.run(hasher.verify("wrong", stored)) == (False, False)
+
+
+def test_hashes_are_salted():
+    hasher = PasswordHasher(**FAST_SCRYPT)
+    assert hasher.hash_sync("same") != hasher.hash_sync("same")
+
+
+def test_legacy_sha256_verifies_and_needs_rehash():
+    hasher = PasswordHasher(**FAST_SCRYPT)
+    legacy = hashlib.sha256(b"s3cret").hexdigest()
+    assert hasher.verify_sync("s3cret", legacy) == (True, True)
+    assert hasher.verify_sync("wrong", legacy) == (False, True)
+
+
+def test_scheme_or_parameter_change_needs_rehash():
+    pbkdf2 = PasswordHasher(scheme="pbkdf2_sha256", **FAST_SCRYPT)
+    stored = pbkdf2.hash_sync("s3cret")
+    assert stored.startswith("pbkdf2_sha256$1000$")
+    assert PasswordHasher(**FAST_SCRYPT).verify_sync("s3cret", stored) == (True, True)
+    stronger = PasswordHasher(scheme="pbkdf2_sha256", scrypt_n=2 ** 10, pbkdf2_iterations=2000)
+    assert stronger.verify_sync("s3cret", stored) == (True, True)
+
+
+def test_malformed_hashes_do_not_verify():
+    hasher = PasswordHasher(**FAST_SCRYPT)
+    for stored in ("", "scrypt$x$8$1$aa$bb", "pbkdf2_sha256$1000$only", "plaintext"):
+        assert hasher.verify_sync("anything", stored) == (False, False)
+
+
+def test_unknown_scheme_is_rejected():
+    with pytest.raises(ValueError):
+        PasswordHasher(scheme="md5")
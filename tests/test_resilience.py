@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from resilience import CircuitBreaker, HedgeStats, run_hedged
+
+
+def open_breaker(threshold=2, reset_timeout=30.0):
+    breaker = CircuitBreaker("claude", failure_threshold=threshold, reset_timeout=reset_timeout)
+    for _ in range(threshold):
+        breaker.record_failure()
+    return breaker
+
+
+def elapse(breaker, seconds):
+    breaker.opened_at -= seconds
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("claude", failure_threshold=3)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+    breaker = open_breaker(threshold=2)
+    assert breaker.state == "open" and not breaker.allow()
+    assert breaker.snapshot()["trips"] == 1 and breaker.short_circuits == 1
+
+
+def test_half_open_allows_a_single_trial_that_closes_on_success():
+    breaker = open_breaker()
+    elapse(breaker, 31)
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial at a time
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_failed_trial_reopens_for_a_full_timeout():
+    breaker = open_breaker()
+    elapse(breaker, 31)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.trips == 2
+    assert not breaker.allow()
+
+
+def test_released_trial_lets_the_next_caller_try():
+    breaker = open_breaker()
+    elapse(breaker, 31)
+    assert breaker.allow()
+    breaker.release_trial()
+    assert breaker.allow()
+
+
+def after(seconds, value=None, error=None):
+    async def call():
+        await asyncio.sleep(seconds)
+        if error is not None:
+            raise error
+        return value
+    return call
+
+
+def test_fast_primary_never_starts_the_hedge():
+    stats = HedgeStats()
+    hedge_started = []
+
+    async def hedge():
+        hedge_started.append(1)
+        return "hedge"
+
+    assert asyncio.run(run_hedged(after(0, "primary"), hedge, 0.05, stats)) == ("primary", "primary")
+    assert hedge_started == [] and stats.hedged == 0
+
+
+def test_slow_primary_loses_to_the_hedge_and_is_cancelled():
+    stats = HedgeStats()
+    cancelled = []
+
+    async def primary():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def main():
+        outcome = await run_hedged(primary, after(0.01, "hedge"), 0.01, stats)
+        await asyncio.sleep(0)
+        return outcome
+
+    assert asyncio.run(main()) == ("hedge", "hedge")
+    assert cancelled == [1]
+    assert stats.snapshot()["hedge_win_rate"] == 1.0
+
+
+def test_a_failed_hedge_waits_for_the_primary():
+    stats = HedgeStats()
+    outcome = asyncio.run(run_hedged(after(0.03, "primary"), after(0, error=RuntimeError("hedge")), 0.01, stats))
+    assert outcome == ("primary", "primary")
+    assert stats.primary_wins_after_hedge == 1
+
+
+def test_primary_error_is_raised_when_both_fail():
+    stats = HedgeStats()
+    with pytest.raises(ValueError, match="primary"):
+        asyncio.run(run_hedged(
+            after(0.02, error=ValueError("primary")), after(0, error=RuntimeError("hedge")), 0.01, stats
+        ))
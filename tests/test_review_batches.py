@@ -0,0 +1,54 @@
+import json
+
+from review_batches import batch_prompt, map_batch_results, pack_review_batches
+
+
+def analysis(index=None, sentiment="positive"):
+    item = {"overall_sentiment": sentiment, "safety_score": 8}
+    if index is not None:
+        item["index"] = index
+    return item
+
+
+def test_batches_respect_the_review_and_character_limits():
+    items = [(i, "x" * length) for i, length in enumerate([40, 40, 40, 10, 100, 5])]
+    batches = pack_review_batches(items, max_reviews=3, max_chars=90)
+    assert [[i for i, _ in batch] for batch in batches] == [[0, 1], [2, 3], [4], [5]]
+    # A single review longer than the limit still gets its own batch
+    assert pack_review_batches([(0, "y" * 500)], 10, 90) == [[(0, "y" * 500)]]
+    assert pack_review_batches([], 10, 90) == []
+
+
+def test_prompt_numbers_the_reviews():
+    prompt = batch_prompt(['Say "hola"', "Café"])
+    numbered = prompt.split("Reviews: ", 1)[1].split("\n", 1)[0]
+    assert json.loads(numbered) == [{"index": 0, "review": 'Say "hola"'}, {"index": 1, "review": "Café"}]
+
+
+def test_out_of_order_replies_are_mapped_by_index():
+    reply = [analysis(2, "negative"), analysis(0), analysis(1, "neutral")]
+    results = map_batch_results(reply, 3)
+    assert [r["overall_sentiment"] for r in results] == ["positive", "neutral", "negative"]
+    assert all("index" not in r for r in results)
+    assert reply[0]["index"] == 2  # the parsed reply is left untouched
+
+
+def test_missing_duplicate_and_out_of_range_indexes_leave_gaps():
+    reply = [analysis(0), analysis(0, "negative"), analysis(7), "not an object", analysis(3)]
+    results = map_batch_results(reply, 4)
+    assert results[0]["overall_sentiment"] == "positive"
+    assert results[1] is None and results[2] is None
+    assert results[3] is not None
+
+
+def test_unindexed_items_map_by_position_only_when_the_reply_is_complete():
+    assert [r["overall_sentiment"] for r in map_batch_results([analysis(), analysis(sentiment="negative")], 2)] == [
+        "positive", "negative"
+    ]
+    assert map_batch_results([analysis()], 2) == [None, None]
+    assert map_batch_results([analysis(True), analysis()], 2)[1] is not None
+
+
+def test_unparseable_reply_yields_no_results():
+    assert map_batch_results(None, 2) == [None, None]
+    assert map_batch_results({"index": 0}, 1) == [None]
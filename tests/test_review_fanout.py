@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from review_fanout import analyze_reviews_concurrently
+
+REVIEWS = ["slow", "fast", "medium", "instant"]
+DELAYS = {"slow": 0.05, "fast": 0.01, "medium": 0.03, "instant": 0}
+
+
+def make_analyze(events, running):
+    async def analyze(index, review):
+        running.add(index)
+        events.append(("start", index, len(running)))
+        await asyncio.sleep(DELAYS[review])
+        running.discard(index)
+        events.append(("done", index))
+        return index, {"review": review}
+
+    return analyze
+
+
+def test_analyses_overlap_and_keep_review_order():
+    events, running = [], set()
+
+    async def main():
+        started = asyncio.get_running_loop().time()
+        results, early = await analyze_reviews_concurrently(REVIEWS, make_analyze(events, running))
+        return results, early, asyncio.get_running_loop().time() - started
+
+    results, early, elapsed = asyncio.run(main())
+
+    assert results == [{"review": review} for review in REVIEWS]
+    assert early is None
+    # Every analysis starts before the first one finishes, and the whole fan-out takes about the slowest one
+    assert [event[0] for event in events[:len(REVIEWS)]] == ["start"] * len(REVIEWS)
+    assert max(event[2] for event in events if event[0] == "start") == len(REVIEWS)
+    assert elapsed < sum(DELAYS.values())
+    assert [event[1] for event in events if event[0] == "done"] == [3, 1, 2, 0]
+
+
+def test_early_work_starts_before_the_slowest_review_finishes():
+    events, running = [], set()
+    seen = []
+
+    async def summarize(partial):
+        seen.append(len(running))
+        return [analysis["review"] for analysis in partial]
+
+    async def main():
+        results, early = await analyze_reviews_concurrently(REVIEWS, make_analyze(events, running), 2, summarize)
+        return results, await early
+
+    results, partial = asyncio.run(main())
+
+    assert results == [{"review": review} for review in REVIEWS]
+    # The summary got the first two finished analyses (in review order) while the other two still ran
+    assert partial == ["fast", "instant"]
+    assert seen == [2]
+
+
+def test_a_failed_analysis_cancels_the_rest():
+    cancelled = []
+
+    async def analyze(index, review):
+        try:
+            if review == "boom":
+                raise RuntimeError("analysis failed")
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return index, {}
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await analyze_reviews_concurrently(["a", "boom", "c"], analyze)
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert sorted(cancelled) == [0, 2]
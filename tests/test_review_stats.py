@@ -0,0 +1,91 @@
+import asyncio
+
+from review_stats import (
+    ReviewStatsStore,
+    aggregates_from_stats,
+    rebuild_pipeline,
+    stats_increment,
+)
+from tests.conftest import FakeCollection
+
+RECORDS = [
+    {"overall_sentiment": "positive", "safety_score": 9.0, "cleanliness_score": 8.0},
+    {"overall_sentiment": "negative", "safety_score": 4.0, "cleanliness_score": 3.0},
+    {"overall_sentiment": "positive", "safety_score": 8.0, "cleanliness_score": 9.5},
+    {"overall_sentiment": "mixed", "safety_score": 6.0, "cleanliness_score": 6.0},
+]
+
+
+def test_increment_sums_scores_and_counts_unknown_sentiment_as_neutral():
+    assert stats_increment(RECORDS) == {
+        "review_count": 4,
+        "safety_total": 27.0,
+        "cleanliness_total": 26.5,
+        "sentiment.positive": 2,
+        "sentiment.negative": 1,
+        "sentiment.neutral": 1,
+    }
+
+
+def test_incremental_updates_match_one_shot_aggregate():
+    store = ReviewStatsStore(FakeCollection())
+
+    async def main():
+        await store.record("tokyo", RECORDS[:1])
+        await store.record("tokyo", RECORDS[1:])
+        await store.record(None, RECORDS)
+        await store.record("paris", [])
+        return await store.get("tokyo"), await store.get("paris")
+
+    tokyo, paris = asyncio.run(main())
+    assert paris is None
+    assert tokyo == {
+        "review_count": 4,
+        "aggregated_scores": {
+            "average_safety": 6.8,
+            "average_cleanliness": 6.6,
+            "sentiment_distribution": {"positive": 2, "neutral": 1, "negative": 1},
+            "dominant_sentiment": "positive",
+        },
+    }
+
+
+def test_seed_is_claimed_once():
+    collection = FakeCollection()
+    store = ReviewStatsStore(collection)
+
+    async def main():
+        await store.record("tokyo", RECORDS[:1])  # stats that exist before any seeding
+        return [await store.claim_seed("tokyo"), await store.claim_seed("tokyo"), await store.claim_seed("bangkok")]
+
+    assert asyncio.run(main()) == [True, False, True]
+    assert collection.docs["tokyo"]["review_count"] == 1
+
+
+def test_released_seed_can_be_claimed_again_until_stats_exist():
+    store = ReviewStatsStore(FakeCollection())
+
+    async def main():
+        claims = [await store.claim_seed("tokyo")]
+        await store.release_seed("tokyo")
+        claims.append(await store.claim_seed("tokyo"))
+        await store.record("tokyo", RECORDS[:1])
+        await store.release_seed("tokyo")
+        claims.append(await store.claim_seed("tokyo"))
+        return claims
+
+    assert asyncio.run(main()) == [True, True, False]
+
+
+def test_aggregates_from_empty_stats():
+    assert aggregates_from_stats({})["average_safety"] == 0.0
+
+
+def test_rebuild_pipeline_writes_the_fields_increments_maintain():
+    pipeline = rebuild_pipeline("stats")
+    assert pipeline[-1] == {"$out": "stats"}
+    group, project = pipeline[1]["$group"], pipeline[2]["$project"]
+    assert group["_id"] == "$destination"
+    for field in stats_increment(RECORDS):
+        top, _, sub = field.partition(".")
+        assert top in project and (not sub or sub in project[top])
@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from saved_itineraries import (
+    SaveItineraryRequest,
+    parse_legacy_save_request,
+    parse_save_request,
+    read_json_body,
+    store_itinerary,
+)
+from storage_codec import ItineraryCodec
+from tests.conftest import FakeCollection
+
+BODY = {
+    "title": "Lisbon long weekend",
+    "destination": {"name": "Lisbon, Portugal"},
+    "itinerary_data": {"daily_itinerary": {"day_1": {"morning": "Alfama"}}},
+    "travel_dates": {"start": "2025-06-01", "end": "2025-06-04"},
+    "preferences": {"budget_range": "mid-range"},
+}
+
+
+def make_client(collection, max_bytes=4096):
+    """The POST /itineraries handler wired to a fake collection instead of the session and Mongo"""
+    app = FastAPI()
+
+    @app.post("/itineraries")
+    async def create_saved_itinerary(request: Request):
+        payload = parse_save_request(await read_json_body(request, max_bytes))
+        return await store_itinerary(collection, ItineraryCodec(), "user-1", payload)
+
+    return TestClient(app)
+
+
+def test_post_itineraries_stores_the_validated_body():
+    collection = FakeCollection()
+    response = make_client(collection).post("/itineraries", json=BODY)
+
+    assert response.status_code == 200
+    itinerary_id = response.json()["itinerary_id"]
+    [stored] = collection.docs.values()
+    assert stored["id"] == itinerary_id and stored["user_id"] == "user-1"
+    assert {key: stored[key] for key in BODY} == BODY
+
+
+def test_oversized_bodies_are_rejected_by_declared_length_and_while_streaming():
+    collection = FakeCollection()
+    client = make_client(collection, max_bytes=64)
+
+    declared = client.post("/itineraries", json=BODY)
+    streamed = client.post("/itineraries", content=(chunk for chunk in [b'{"title": "', b"x" * 100, b'"}']))
+
+    assert declared.status_code == 413 and streamed.status_code == 413
+    assert "64 bytes" in streamed.json()["detail"]
+    assert collection.docs == {}
+
+
+@pytest.mark.parametrize("content, status", [
+    (b'{"title": "Lisbon"', 400),
+    (b"[1, 2]", 422),
+    (b'{"title": "Lisbon"}', 422),
+])
+def test_invalid_bodies(content, status):
+    response = make_client(FakeCollection()).post(
+        "/itineraries", content=content, headers={"content-type": "application/json"}
+    )
+    assert response.status_code == status
+
+
+@pytest.mark.parametrize("changes", [{"title": ""}, {"title": "x" * 201}, {"destination": "Lisbon"}])
+def test_save_request_validation(changes):
+    with pytest.raises(HTTPException) as excinfo:
+        parse_save_request({**BODY, **changes})
+    assert excinfo.value.status_code == 422
+    assert excinfo.value.detail[0]["loc"][0] == next(iter(changes))
+
+
+def test_legacy_form_validates_like_the_json_body():
+    fields = {key: value for key, value in BODY.items() if key != "title"}
+    encoded = {key: json.dumps(value) for key, value in fields.items()}
+
+    payload = parse_legacy_save_request(BODY["title"], **encoded)
+    assert payload == SaveItineraryRequest(**BODY)
+
+    with pytest.raises(HTTPException) as excinfo:
+        parse_legacy_save_request("x" * 201, **encoded)
+    assert excinfo.value.status_code == 422
+
+    with pytest.raises(HTTPException) as excinfo:
+        parse_legacy_save_request(BODY["title"], **{**encoded, "preferences": "{budget"})
+    assert excinfo.value.status_code == 400 and "preferences" in excinfo.value.detail
+
+
+def test_store_itinerary_encodes_with_the_codec():
+    collection = FakeCollection()
+    codec = ItineraryCodec("zlib", min_size=0)
+    result = asyncio.run(store_itinerary(collection, codec, "user-2", SaveItineraryRequest(**BODY)))
+
+    [stored] = collection.docs.values()
+    assert result["success"] and "itinerary_data" not in stored
+    assert codec.decode(stored)["itinerary_data"] == BODY["itinerary_data"]
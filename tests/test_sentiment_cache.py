@@ -0,0 +1,88 @@
+import asyncio
+
+from cachetools import TTLCache
+
+from sentiment_cache import SentimentCache, normalize_review_text
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCacheCollection:
+    def __init__(self):
+        self.docs = {}
+        self.reads = 0
+
+    async def find_one(self, query, projection=None):
+        self.reads += 1
+        doc = self.docs.get(query["key"])
+        return {"analysis": doc["analysis"]} if doc else None
+
+    async def update_one(self, query, update, upsert=False):
+        self.docs.setdefault(query["key"], update["$setOnInsert"])
+
+
+def make_cache(collection, maxsize=2, ttl=60):
+    cache = SentimentCache(collection, prompt_version="v1", maxsize=maxsize, ttl_seconds=ttl)
+    clock = Clock()
+    cache.memory = TTLCache(maxsize=maxsize, ttl=ttl, timer=clock)
+    return cache, clock
+
+
+def test_keys_ignore_case_and_whitespace_but_not_the_prompt_version():
+    cache = SentimentCache(None, prompt_version="v1")
+    assert normalize_review_text("  Great\n  food ") == "great food"
+    assert cache.key_for("Great food") == cache.key_for("  great   FOOD")
+    assert cache.key_for("Great food") != SentimentCache(None, prompt_version="v2").key_for("Great food")
+
+
+def test_memory_entries_expire_and_fall_back_to_mongo():
+    collection = FakeCacheCollection()
+    cache, clock = make_cache(collection, ttl=60)
+
+    async def main():
+        await cache.put("Clean rooms", {"overall_sentiment": "positive"})
+        first = await cache.get("clean rooms")
+        clock.now = 61
+        second = await cache.get("clean rooms")
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first == second == {"overall_sentiment": "positive"}
+    assert (cache.memory_hits, cache.mongo_hits, collection.reads) == (1, 1, 1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    collection = FakeCacheCollection()
+    cache, _ = make_cache(collection, maxsize=2)
+
+    async def main():
+        await cache.put("a", {"n": 1})
+        await cache.put("b", {"n": 2})
+        await cache.get("a")
+        await cache.put("c", {"n": 3})
+        return [cache.key_for(text) in cache.memory for text in ("a", "b", "c")]
+
+    assert asyncio.run(main()) == [True, False, True]
+
+
+def test_returned_analyses_are_copies():
+    cache, _ = make_cache(FakeCacheCollection())
+
+    async def main():
+        await cache.put("Noisy street", {"overall_sentiment": "negative"})
+        (await cache.get("Noisy street"))["overall_sentiment"] = "changed"
+        return await cache.get("Noisy street")
+
+    assert asyncio.run(main()) == {"overall_sentiment": "negative"}
+
+
+def test_miss_is_counted_when_neither_tier_has_the_review():
+    cache, _ = make_cache(FakeCacheCollection())
+    assert asyncio.run(cache.get("Unseen review")) is None
+    assert cache.stats()["misses"] == 1 and cache.stats()["hit_rate"] == 0.0
@@ -0,0 +1,109 @@
+import ast
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List
+
+from bson import ObjectId
+from pydantic import BaseModel
+
+from serialization import FastJSONResponse, dumps, to_document
+
+SERVER = Path(__file__).resolve().parents[1] / "backend" / "server.py"
+
+
+class Stop(BaseModel):
+    name: str
+    at: datetime
+
+
+class Trip(BaseModel):
+    id: str
+    data: Dict[str, Any]
+    stops: List[Stop]
+    first: Stop
+
+
+def test_naive_datetimes_render_as_utc():
+    naive = datetime(2025, 3, 1, 9, 30)
+    aware = datetime(2025, 3, 1, 9, 30, tzinfo=timezone.utc)
+    assert json.loads(dumps({"t": naive}))["t"] == "2025-03-01T09:30:00+00:00"
+    assert dumps({"t": naive}) == dumps({"t": aware})
+
+
+def test_uuid_decimal_set_objectid_and_int_keys():
+    value = uuid.uuid4()
+    oid = ObjectId()
+    decoded = json.loads(dumps({"id": value, "price": Decimal("12.50"), "tags": {"a"}, "_id": oid, 3: "x"}))
+    assert decoded == {"id": str(value), "price": 12.5, "tags": ["a"], "_id": str(oid), "3": "x"}
+
+
+def test_response_renders_models():
+    stop = Stop(name="Shibuya", at=datetime(2025, 3, 1))
+    body = FastJSONResponse({"success": True, "stop": stop}).body
+    assert json.loads(body) == {"success": True, "stop": {"name": "Shibuya", "at": "2025-03-01T00:00:00+00:00"}}
+
+
+def test_to_document_is_shallow_for_plain_containers():
+    data = {"days": [{"day": 1, "activities": ["a", "b"]}]}
+    stop = Stop(name="Asakusa", at=datetime(2025, 3, 2))
+    trip = Trip(id="t1", data=data, stops=[stop], first=stop)
+
+    document = to_document(trip)
+
+    assert document["data"] is trip.data
+    assert document["stops"] == [{"name": "Asakusa", "at": datetime(2025, 3, 2)}]
+    assert document["first"] == {"name": "Asakusa", "at": datetime(2025, 3, 2)}
+    assert document == trip.model_dump()
+
+
+def test_direct_responses_skip_the_encoder_pass_and_keep_the_utc_offset():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    payload = {"rates_updated_at": datetime(2025, 1, 1, 1, 2, 3), "stop": Stop(name="Ueno", at=datetime(2025, 1, 2))}
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    @app.get("/encoded", response_model=Dict[str, Any])
+    async def encoded():
+        return payload
+
+    @app.get("/direct")
+    async def direct():
+        return FastJSONResponse(payload)
+
+    client = TestClient(app)
+    direct_body = client.get("/direct").content
+    encoded_body = client.get("/encoded").json()
+
+    assert direct_body == dumps(payload)
+    assert json.loads(direct_body) == {
+        "rates_updated_at": "2025-01-01T01:02:03+00:00",
+        "stop": {"name": "Ueno", "at": "2025-01-02T00:00:00+00:00"},
+    }
+    # The response_model path drops the offset, which is why server routes return responses directly
+    assert encoded_body == {"rates_updated_at": "2025-01-01T01:02:03", "stop": {"name": "Ueno", "at": "2025-01-02T00:00:00"}}
+
+
+def test_server_routes_return_responses_directly():
+    tree = ast.parse(SERVER.read_text())
+    routes = [
+        node for node in tree.body
+        if isinstance(node, ast.AsyncFunctionDef)
+        and any(isinstance(d, ast.Call) and ast.unparse(d.func).startswith("api_router.") for d in node.decorator_list)
+    ]
+    assert len(routes) > 25
+    for route in routes:
+        for decorator in route.decorator_list:
+            assert all(keyword.arg != "response_model" for keyword in decorator.keywords), route.name
+        returns = [node for node in ast.walk(route) if isinstance(node, ast.Return) and node.value is not None]
+        nested = {
+            id(node) for inner in ast.walk(route) if inner is not route and isinstance(inner, (ast.FunctionDef, ast.AsyncFunctionDef))
+            for node in ast.walk(inner)
+        }
+        for node in returns:
+            if id(node) not in nested:
+                assert isinstance(node.value, ast.Call), (route.name, ast.unparse(node))
+                assert ast.unparse(node.value.func) in ("FastJSONResponse", "StreamingResponse"), (route.name, ast.unparse(node))
@@ -0,0 +1,85 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from session_cache import SessionCache, SessionError
+
+TOKEN = "a" * 43
+
+
+class FakeCollection:
+    """Minimal stand-in for a Motor collection that counts find_one calls"""
+
+    def __init__(self, docs, key):
+        self.docs = {doc[key]: doc for doc in docs}
+        self.key = key
+        self.finds = 0
+
+    async def find_one(self, query, projection=None):
+        self.finds += 1
+        doc = self.docs.get(query[self.key])
+        return dict(doc) if doc else None
+
+
+def make_cache(expires_at=None):
+    sessions = FakeCollection(
+        [{"token": TOKEN, "user_id": "u1", "expires_at": expires_at or datetime.utcnow() + timedelta(days=1)}],
+        "token"
+    )
+    users = FakeCollection([{"id": "u1", "email": "a@b.c", "name": "A", "preferences": {"travel_style": "relaxed"}}], "id")
+    return SessionCache(sessions, users), sessions, users
+
+
+def test_valid_session_is_served_from_memory():
+    cache, sessions, users = make_cache()
+
+    async def main():
+        for _ in range(5):
+            session = await cache.resolve(TOKEN)
+        return session
+
+    session = asyncio.run(main())
+    assert session.user_id == "u1" and session.user["email"] == "a@b.c"
+    assert sessions.finds == 1 and users.finds == 1
+    assert cache.stats()["hits"] == 4
+
+
+def test_invalid_tokens_hit_mongo_once():
+    cache, sessions, _ = make_cache()
+
+    async def main():
+        for _ in range(10):
+            with pytest.raises(SessionError, match="Invalid session"):
+                await cache.resolve("b" * 43)
+        with pytest.raises(SessionError):
+            await cache.resolve("not a token!")
+
+    asyncio.run(main())
+    assert sessions.finds == 1
+    assert cache.stats()["negative_hits"] == 9 and cache.stats()["malformed"] == 1
+
+
+def test_expired_session_is_rejected_before_ttl_cleanup():
+    cache, sessions, _ = make_cache(expires_at=datetime.utcnow() - timedelta(seconds=1))
+
+    async def main():
+        for _ in range(3):
+            with pytest.raises(SessionError, match="Session expired"):
+                await cache.resolve(TOKEN)
+
+    asyncio.run(main())
+    assert sessions.finds == 1
+
+
+def test_invalidate_user_forces_reload():
+    cache, _, users = make_cache()
+
+    async def main():
+        await cache.resolve(TOKEN)
+        users.docs["u1"]["preferences"] = {"travel_style": "adventure"}
+        cache.invalidate_user("u1")
+        return await cache.resolve(TOKEN)
+
+    assert asyncio.run(main()).user["preferences"] == {"travel_style": "adventure"}
+    assert users.finds == 2
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"answer": 42}
+
+    async def main():
+        return await asyncio.gather(*(flight.do("prompt", fetch) for _ in range(5)), flight.do("other", fetch))
+
+    results = asyncio.run(main())
+    assert results == [{"answer": 42}] * 6
+    assert len(calls) == 2
+    assert flight.stats()["calls_saved"] == 4 and flight.stats()["in_flight"] == 0
+
+
+def test_errors_reach_every_waiter_and_the_key_is_freed():
+    flight = SingleFlight()
+    attempts = []
+
+    async def failing():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    async def main():
+        outcomes = await asyncio.gather(*(flight.do("prompt", failing) for _ in range(3)), return_exceptions=True)
+        # A later call starts afresh instead of reusing the failed future
+        retry = await asyncio.gather(flight.do("prompt", failing), return_exceptions=True)
+        return outcomes + retry
+
+    outcomes = asyncio.run(main())
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert len(attempts) == 2
+    assert flight.stats()["errors"] == 2
+
+
+def test_a_cancelled_waiter_does_not_cancel_the_shared_call():
+    flight = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        impatient = asyncio.ensure_future(flight.do("prompt", slow))
+        patient = asyncio.ensure_future(flight.do("prompt", slow))
+        await asyncio.sleep(0.005)
+        impatient.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await impatient
+        return await patient
+
+    assert asyncio.run(main()) == "done"
@@ -0,0 +1,45 @@
+import pytest
+
+from storage_codec import BLOB_FIELD, CODEC_FIELD, ItineraryCodec, zstandard
+
+DOC = {
+    "id": "trip-1",
+    "user_id": "u1",
+    "destination": {"name": "Lisbon, Portugal"},
+    "preferences": {"travel_style": "relaxed"},
+    "itinerary_data": {
+        "daily_itinerary": {f"day_{i}": {"morning": "Walk the old town " * 5, "evening": "Fado"} for i in range(1, 15)},
+        "local_tips": ["Carry cash", "Say \"obrigado\""],
+    },
+}
+
+
+@pytest.mark.parametrize("name", ["zlib"] + (["zstd"] if zstandard is not None else []))
+def test_round_trip_keeps_summary_fields_plain(name):
+    codec = ItineraryCodec(codec=name)
+    stored = codec.encode(DOC)
+    assert "itinerary_data" not in stored and stored[CODEC_FIELD] == name
+    assert stored["destination"] == DOC["destination"] and stored["preferences"] == DOC["preferences"]
+    assert len(stored[BLOB_FIELD]) < 1024
+    assert codec.decode(stored) == DOC
+    assert codec.stats()["compression_ratio"] > 2
+
+
+def test_none_codec_and_small_payloads_are_stored_plain():
+    assert ItineraryCodec(codec="none").encode(DOC) is DOC
+    small = {**DOC, "itinerary_data": {"day_1": "Beach"}}
+    assert ItineraryCodec(codec="zlib").encode(small) is small
+
+
+def test_plain_documents_decode_unchanged():
+    assert ItineraryCodec(codec="zlib").decode(DOC) is DOC
+
+
+def test_documents_stored_by_another_codec_still_decode():
+    stored = ItineraryCodec(codec="zlib").encode(DOC)
+    assert ItineraryCodec(codec="none").decode(stored) == DOC
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        ItineraryCodec(codec="lz4")
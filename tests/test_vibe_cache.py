@@ -0,0 +1,59 @@
+import time
+
+import numpy as np
+
+from vibe_cache import SemanticVibeCache, normalize_vibe_query, vectorize
+
+BEACH = {"destination_type": "beach", "budget": "mid-range"}
+CITY = {"destination_type": "city", "budget": "luxury"}
+
+
+def result(name):
+    return {"matched_destinations": [{"name": name}], "vibe_score": 0.9}
+
+
+def test_paraphrases_normalize_to_the_same_tokens():
+    assert normalize_vibe_query("I want a chill, relaxing trip to the beaches!") == "relax relax beach"
+    assert normalize_vibe_query("Peaceful seaside vibes") == "relax beach vibe"
+    vector = vectorize("relax beach", 256)
+    assert np.isclose(np.linalg.norm(vector), 1.0)
+
+
+def test_near_duplicate_queries_hit_within_their_partition_only():
+    cache = SemanticVibeCache(threshold=0.8)
+    cache.add("chill beach vibes", BEACH, result("Bali"))
+
+    hit = cache.lookup("relaxing beaches", BEACH)
+    assert hit is not None and hit[0] == result("Bali") and hit[1] >= 0.8
+    assert cache.lookup("relaxing beaches", CITY) is None
+    assert cache.lookup("neon nightlife", BEACH) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_entries_expire_after_their_ttl():
+    cache = SemanticVibeCache(ttl_seconds=60)
+    cache.add("mountain hiking", BEACH, result("Banff"), created_at=time.time() - 61)
+    cache.add("quiet beach", BEACH, result("Tulum"))
+
+    assert cache.lookup("mountain hikes", BEACH) is None
+    assert cache.expirations == 1 and cache.stats()["entries"] == 1
+    assert cache.lookup("calm beach", BEACH)[0] == result("Tulum")
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SemanticVibeCache(max_entries=2)
+    cache.add("quiet beach", BEACH, result("Tulum"))
+    cache.add("mountain hiking", BEACH, result("Banff"))
+    assert cache.lookup("calm beach", BEACH) is not None  # refreshes the beach entry
+    cache.add("party nightlife", BEACH, result("Ibiza"))
+
+    assert cache.evictions == 1
+    assert cache.lookup("mountain hikes", BEACH) is None
+    assert cache.lookup("calm beach", BEACH)[0] == result("Tulum")
+    assert cache.lookup("nightlife parties", BEACH)[0] == result("Ibiza")
+
+
+def test_queries_without_content_words_are_not_cached():
+    cache = SemanticVibeCache()
+    cache.add("I would really like a trip", BEACH, result("Anywhere"))
+    assert cache.stats()["entries"] == 0